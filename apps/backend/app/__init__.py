@@ -4,8 +4,13 @@ from flask import Flask
 from flask_cors import CORS
 
 from app.config import config_by_name
+from app.db_pool import init_db_pool
 from app.extensions import init_extensions
 from app.blueprints import register_blueprints
+from app.commands import register_commands
+from app.request_logging import init_request_logging
+from app.services.email_outbox import init_email_outbox
+from app.services.email_templates import init_email_templates
 
 
 def create_app(config_name='development'):
@@ -21,6 +26,9 @@ def create_app(config_name='development'):
     # Load configuration
     app.config.from_object(config_by_name[config_name])
     
+    # Pool sizing must be in the config before the engine is created
+    init_db_pool(app)
+    
     # Initialize extensions
     init_extensions(app)
     # Register JWT blocklist callbacks without rebinding local `app`
@@ -39,41 +47,26 @@ def create_app(config_name='development'):
         supports_credentials=app.config.get('CORS_SUPPORTS_CREDENTIALS', True),
     )
     
-    # Add request logging
-    @app.before_request
-    def log_request():
-        from flask import request
-        print(f"REQUEST: {request.method} {request.path} - Headers: {dict(request.headers)}", flush=True)
-        
-        # Log JWT token details if present
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            print(f"JWT TOKEN PRESENT: {token[:50]}...", flush=True)
-            
-            # Try to decode the token without verification to see what's inside
-            try:
-                import jwt as pyjwt
-                decoded = pyjwt.decode(token, options={"verify_signature": False})
-                print(f"JWT PAYLOAD (unverified): {decoded}", flush=True)
-            except Exception as decode_error:
-                print(f"JWT DECODE ERROR: {decode_error}", flush=True)
+    # Sampled access logging, written off the request thread
+    init_request_logging(app)
+    
+    # Background delivery of queued email
+    init_email_outbox(app)
     
     # Register blueprints
     register_blueprints(app)
+    register_commands(app)
+    
+    # Keep compiled email templates instead of loading them on every send
+    init_email_templates(app)
     
     # Add global error handlers for debugging
     @app.errorhandler(422)
     def handle_unprocessable_entity(e):
         import logging
-        import traceback
         from flask import request
-        print(f"GLOBAL 422 ERROR HANDLER: {e}", flush=True)
-        print(f"Request: {request.method} {request.path}", flush=True)
-        print(f"Request headers: {dict(request.headers)}", flush=True)
-        print(f"Error traceback: {traceback.format_exc()}", flush=True)
         logger = logging.getLogger(__name__)
-        logger.error(f"422 Unprocessable Entity: {e}")
+        logger.error(f"422 Unprocessable Entity: {e} ({request.method} {request.path})")
         return e
     
     @app.errorhandler(Exception)
@@ -0,0 +1,128 @@
+"""Per-request team membership context for authorization checks.
+
+Routes used to re-query ``team_members`` for every permission check. The
+context loads the caller's memberships, roles and created teams in one query,
+memoizes them on ``flask.g`` for the rest of the request, and optionally keeps
+them in the shared cache for ``AUTHZ_CACHE_TTL`` seconds. Cached entries are
+dropped after any commit that inserts, updates or deletes a TeamMember.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from app.extensions import cache, db
+from app.models.team import Team, TeamMember
+
+MANAGER_ROLES = ('owner', 'admin')
+
+
+@dataclass(frozen=True)
+class MembershipContext:
+    """A user's team memberships: team id -> role, plus the teams they created."""
+
+    user_id: int
+    roles: Dict[int, str] = field(default_factory=dict)
+    created_team_ids: FrozenSet[int] = frozenset()
+
+    @property
+    def team_ids(self) -> List[int]:
+        return list(self.roles)
+
+    def is_member(self, team_id) -> bool:
+        return _team_key(team_id) in self.roles
+
+    def role_in(self, team_id):
+        return self.roles.get(_team_key(team_id))
+
+    def can_manage(self, team_id) -> bool:
+        """Owner/admin members and the team's creator can manage a team."""
+        team_id = _team_key(team_id)
+        if team_id not in self.roles:
+            return False
+        return team_id in self.created_team_ids or self.roles[team_id] in MANAGER_ROLES
+
+
+def _team_key(team_id):
+    # Team ids from JSON bodies may arrive as strings
+    try:
+        return int(team_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cache_key(user_id: int) -> str:
+    return f'authz:memberships:{user_id}'
+
+
+def _load(user_id: int) -> MembershipContext:
+    rows = db.session.query(TeamMember.team_id, TeamMember.role, Team.created_by).join(
+        Team, Team.id == TeamMember.team_id
+    ).filter(TeamMember.user_id == user_id).all()
+    return MembershipContext(
+        user_id=user_id,
+        roles={team_id: role for team_id, role, _ in rows},
+        created_team_ids=frozenset(team_id for team_id, _, creator in rows if creator == user_id),
+    )
+
+
+def get_membership_context(user_id: int) -> MembershipContext:
+    """Return the user's membership context, loading it at most once per request."""
+    contexts = g.setdefault('membership_contexts', {})
+    if user_id in contexts:
+        return contexts[user_id]
+
+    ttl = current_app.config.get('AUTHZ_CACHE_TTL', 0)
+    context = cache.get(_cache_key(user_id)) if ttl else None
+    if context is None:
+        context = _load(user_id)
+        if ttl:
+            cache.set(_cache_key(user_id), context, timeout=ttl)
+
+    contexts[user_id] = context
+    return context
+
+
+def invalidate_membership_context(*user_ids: int):
+    """Forget memoized and cached memberships for the given users."""
+    if not has_app_context():
+        return
+    contexts = g.get('membership_contexts')
+    for user_id in user_ids:
+        if contexts:
+            contexts.pop(user_id, None)
+    if current_app.config.get('AUTHZ_CACHE_TTL', 0):
+        cache.delete_many(*[_cache_key(user_id) for user_id in user_ids])
+
+
+def _membership_changed(mapper, connection, target):
+    user_ids = {target.user_id, *get_history(target, 'user_id').deleted}
+    user_ids.discard(None)
+    # Stale within this request as soon as it is flushed; the shared cache is
+    # cleared once the change is committed and visible to other requests.
+    contexts = g.get('membership_contexts') if has_app_context() else None
+    for user_id in user_ids:
+        if contexts:
+            contexts.pop(user_id, None)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('authz_changed_users', set()).update(user_ids)
+
+
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(TeamMember, _event, _membership_changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_cached_memberships(session):
+    user_ids = session.info.pop('authz_changed_users', None)
+    if user_ids:
+        invalidate_membership_context(*user_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_memberships(session):
+    session.info.pop('authz_changed_users', None)
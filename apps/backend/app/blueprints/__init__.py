@@ -22,10 +22,7 @@ def register_blueprints(app: Flask):
         from app.blueprints.analytics import analytics_bp
         from app.blueprints.templates import templates_bp
         from app.blueprints.schedules.routes import schedules_bp
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        from health import health_bp
+        from app.blueprints.health import health_bp
         print("BLUEPRINT IMPORTS: SUCCESS", flush=True)
         
         blueprints = [
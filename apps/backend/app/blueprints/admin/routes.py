@@ -11,6 +11,9 @@ from flask_jwt_extended import get_jwt_identity
 from app.models.user import User
 from app.extensions import db
 from app.services.email_service import EmailService
+from app.services.email_templates import get_registry as get_email_templates
+from app.services.pagination import InvalidCursor, paginate_from_args
+from app.services.response_cache import cache_stats
 
 from . import admin_bp
 from app.security import roles_required
@@ -117,6 +120,23 @@ def waitlist_export_url():
     return jsonify({"url": "/api/waitlist/export"})
 
 
+@admin_bp.route("/email/templates", methods=["GET"])
+@roles_required('admin')
+def email_template_stats():
+    """Compiled and missing email templates with render timings."""
+    return jsonify(get_email_templates().stats())
+
+
+@admin_bp.route("/cache/stats", methods=["GET"])
+@roles_required('admin')
+def response_cache_stats():
+    """Response cache hit/miss counters for this process."""
+    return jsonify({
+        "ttl": current_app.config.get('RESPONSE_CACHE_TTL', 0),
+        "endpoints": cache_stats(),
+    })
+
+
 @admin_bp.route('/users', methods=['GET'])
 @roles_required('admin')
 def list_users():
@@ -132,6 +152,13 @@ def list_users():
         query = query.filter(User.email.ilike(f'%{q}%'))
     if role in ('admin', 'user'):
         query = query.filter(User.role == role)
+    # Cursor mode: seek on (created_at, id) and skip the count unless asked
+    if 'cursor' in request.args:
+        try:
+            users = paginate_from_args(query, User.created_at, User.id, request.args, per_page)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify(users.to_response('items', [u.to_dict() for u in users.items]))
     users = query.order_by(User.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
     return jsonify({
         'items': [u.to_dict() for u in users.items],
@@ -181,6 +208,7 @@ def admin_resend_verification(user_id: int):
         return jsonify({'message': 'User already verified'}), 200
     try:
         EmailService.send_verification_email(user.email)
+        db.session.commit()
     except Exception as e:
         current_app.logger.warning(f'Admin resend verification failed for {user.email}: {e}')
     return jsonify({'message': 'Verification email sent (if possible)'}), 200
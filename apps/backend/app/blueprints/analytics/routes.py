@@ -2,15 +2,26 @@
 from datetime import datetime, timedelta
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case
 
 from . import analytics_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.task import Task
 from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
 from app.models.team import Team, TeamMember
 from app.models.user import User
 from app.models.task_comment import TaskComment
+from app.services.response_cache import cached_response
+from app.services.serializers import serialize_tasks, load_users, task_user_ids
+
+
+def _completion_days_expr():
+    """SQL expression for the days between a task's creation and completion."""
+    if db.engine.dialect.name == 'postgresql':
+        return func.extract('epoch', Task.completed_at - Task.created_at) / 86400.0
+    return func.julianday(Task.completed_at) - func.julianday(Task.created_at)
 
 
 @analytics_bp.route('/project/<int:project_id>', methods=['GET'])
@@ -28,19 +39,24 @@ def get_project_analytics(project_id):
     if not project:
         return jsonify({'error': 'Project not found or access denied'}), 404
     
-    # Task statistics
-    total_tasks = Task.query.filter_by(project_id=project_id).count()
-    completed_tasks = Task.query.filter_by(project_id=project_id, status='completed').count()
-    in_progress_tasks = Task.query.filter_by(project_id=project_id, status='in_progress').count()
-    pending_tasks = Task.query.filter_by(project_id=project_id, status='pending').count()
-    cancelled_tasks = Task.query.filter_by(project_id=project_id, status='cancelled').count()
+    # Task statistics from the materialized counters
+    stats = ProjectTaskStats.for_project(project_id)
     
-    # Overdue tasks
-    overdue_tasks = Task.query.filter(
-        Task.project_id == project_id,
-        Task.due_date < datetime.utcnow(),
-        Task.status != 'completed'
-    ).count()
+    # Overdue count and average completion time in one pass
+    timing = db.session.query(
+        func.count(case((and_(
+            Task.due_date < datetime.utcnow(),
+            Task.status != 'completed'
+        ), 1))).label('overdue'),
+        func.avg(case((and_(
+            Task.status == 'completed',
+            Task.completed_at.isnot(None)
+        ), _completion_days_expr()))).label('avg_completion_days')
+    ).filter(Task.project_id == project_id).one()
+    
+    total_tasks = stats.total
+    completed_tasks = stats.completed
+    avg_completion_time = float(timing.avg_completion_days) if timing.avg_completion_days is not None else None
     
     # Task completion rate over time (last 30 days)
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
@@ -52,39 +68,14 @@ def get_project_analytics(project_id):
         Task.completed_at >= thirty_days_ago
     ).group_by(func.date(Task.completed_at)).all()
     
-    # Average task completion time
-    completed_tasks_with_time = Task.query.filter_by(
-        project_id=project_id,
-        status='completed'
-    ).filter(Task.completed_at.isnot(None)).all()
-    
-    avg_completion_time = None
-    if completed_tasks_with_time:
-        total_time = sum([(t.completed_at - t.created_at).total_seconds() for t in completed_tasks_with_time])
-        avg_completion_time = total_time / len(completed_tasks_with_time) / 86400  # Convert to days
-    
-    # Task distribution by priority
-    priority_distribution = db.session.query(
-        Task.priority,
-        func.count(Task.id).label('count')
-    ).filter_by(project_id=project_id).group_by(Task.priority).all()
-    
-    # Task distribution by assignee
-    assignee_distribution = db.session.query(
-        User.username,
-        func.count(Task.id).label('count')
+    # Task distribution and completions (team productivity) by assignee
+    assignee_stats = db.session.query(
+        User.email,
+        func.count(Task.id).label('count'),
+        func.count(case((Task.status == 'completed', 1))).label('completed_count')
     ).join(Task, Task.assigned_to == User.id).filter(
         Task.project_id == project_id
-    ).group_by(User.username).all()
-    
-    # Team productivity (tasks completed per team member)
-    team_productivity = db.session.query(
-        User.username,
-        func.count(Task.id).label('completed_count')
-    ).join(Task, Task.assigned_to == User.id).filter(
-        Task.project_id == project_id,
-        Task.status == 'completed'
-    ).group_by(User.username).all()
+    ).group_by(User.id, User.email).all()
     
     # Comment activity
     total_comments = TaskComment.query.join(Task).filter(Task.project_id == project_id).count()
@@ -102,14 +93,14 @@ def get_project_analytics(project_id):
         })
     
     return jsonify({
-        'project': project.to_dict(),
+        'project': project.to_dict(task_count=total_tasks),
         'overview': {
             'total_tasks': total_tasks,
             'completed_tasks': completed_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'pending_tasks': pending_tasks,
-            'cancelled_tasks': cancelled_tasks,
-            'overdue_tasks': overdue_tasks,
+            'in_progress_tasks': stats.in_progress,
+            'pending_tasks': stats.pending,
+            'cancelled_tasks': stats.cancelled,
+            'overdue_tasks': timing.overdue,
             'completion_rate': round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1),
             'avg_completion_days': round(avg_completion_time, 1) if avg_completion_time else None,
             'total_comments': total_comments
@@ -118,13 +109,15 @@ def get_project_analytics(project_id):
             {'date': str(item.date), 'count': item.count} for item in completion_timeline
         ],
         'priority_distribution': [
-            {'priority': item.priority, 'count': item.count} for item in priority_distribution
+            {'priority': priority, 'count': count}
+            for priority, count in stats.by_priority().items() if count
         ],
         'assignee_distribution': [
-            {'assignee': item.username, 'count': item.count} for item in assignee_distribution
+            {'assignee': item.email, 'count': item.count} for item in assignee_stats
         ],
         'team_productivity': [
-            {'member': item.username, 'completed': item.completed_count} for item in team_productivity
+            {'member': item.email, 'completed': item.completed_count}
+            for item in assignee_stats if item.completed_count
         ],
         'milestones': milestone_data
     })
@@ -137,65 +130,70 @@ def get_team_analytics(team_id):
     user_id = int(get_jwt_identity())
     
     # Verify user is a team member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied to this team'}), 403
     
     # Get all team projects
     projects = Project.query.filter_by(team_id=team_id).all()
-    project_ids = [p.id for p in projects]
     
     # Overall statistics
     total_projects = len(projects)
     active_projects = len([p for p in projects if p.status == 'active'])
     
+    # Per-project task statistics in one grouped query
+    project_rows = db.session.query(
+        Task.project_id,
+        func.count(Task.id).label('total'),
+        func.count(case((Task.status == 'completed', 1))).label('completed'),
+        func.count(case((and_(
+            Task.due_date < datetime.utcnow(),
+            Task.status != 'completed'
+        ), 1))).label('overdue')
+    ).join(Project, Task.project_id == Project.id).filter(
+        Project.team_id == team_id
+    ).group_by(Task.project_id).all()
+    project_stats = {row.project_id: row for row in project_rows}
+    
     # Task statistics across all projects
-    total_tasks = Task.query.filter(Task.project_id.in_(project_ids)).count()
-    completed_tasks = Task.query.filter(
-        Task.project_id.in_(project_ids),
-        Task.status == 'completed'
-    ).count()
+    total_tasks = sum(row.total for row in project_rows)
+    completed_tasks = sum(row.completed for row in project_rows)
     
     # Team member statistics
-    team_members = TeamMember.query.filter_by(team_id=team_id).all()
-    member_stats = []
+    team_members = db.session.query(TeamMember, User).join(
+        User, User.id == TeamMember.user_id
+    ).filter(TeamMember.team_id == team_id).all()
+    
+    assignee_rows = db.session.query(
+        Task.assigned_to,
+        func.count(Task.id).label('assigned'),
+        func.count(case((Task.status == 'completed', 1))).label('completed')
+    ).join(Project, Task.project_id == Project.id).filter(
+        Project.team_id == team_id,
+        Task.assigned_to.isnot(None)
+    ).group_by(Task.assigned_to).all()
+    assignee_stats = {row.assigned_to: row for row in assignee_rows}
     
-    for member in team_members:
-        member_user = User.query.get(member.user_id)
-        if member_user:
-            assigned_count = Task.query.filter(
-                Task.project_id.in_(project_ids),
-                Task.assigned_to == member.user_id
-            ).count()
-            
-            completed_count = Task.query.filter(
-                Task.project_id.in_(project_ids),
-                Task.assigned_to == member.user_id,
-                Task.status == 'completed'
-            ).count()
-            
-            member_stats.append({
-                'username': member_user.username,
-                'role': member.role,
-                'assigned_tasks': assigned_count,
-                'completed_tasks': completed_count,
-                'completion_rate': round((completed_count / assigned_count * 100) if assigned_count > 0 else 0, 1)
-            })
+    member_stats = []
+    for member, member_user in team_members:
+        row = assignee_stats.get(member.user_id)
+        assigned_count = row.assigned if row else 0
+        completed_count = row.completed if row else 0
+        
+        member_stats.append({
+            'username': member_user.email,
+            'role': member.role,
+            'assigned_tasks': assigned_count,
+            'completed_tasks': completed_count,
+            'completion_rate': round((completed_count / assigned_count * 100) if assigned_count > 0 else 0, 1)
+        })
     
     # Project performance
     project_performance = []
     for project in projects:
-        p_total = Task.query.filter_by(project_id=project.id).count()
-        p_completed = Task.query.filter_by(project_id=project.id, status='completed').count()
-        p_overdue = Task.query.filter(
-            Task.project_id == project.id,
-            Task.due_date < datetime.utcnow(),
-            Task.status != 'completed'
-        ).count()
+        row = project_stats.get(project.id)
+        p_total = row.total if row else 0
+        p_completed = row.completed if row else 0
+        p_overdue = row.overdue if row else 0
         
         project_performance.append({
             'name': project.name,
@@ -211,9 +209,9 @@ def get_team_analytics(team_id):
     activity_timeline = db.session.query(
         func.date(Task.created_at).label('date'),
         func.count(Task.id).label('created'),
-        func.sum(func.case([(Task.status == 'completed', 1)], else_=0)).label('completed')
-    ).filter(
-        Task.project_id.in_(project_ids),
+        func.sum(case((Task.status == 'completed', 1), else_=0)).label('completed')
+    ).join(Project, Task.project_id == Project.id).filter(
+        Project.team_id == team_id,
         Task.created_at >= seven_days_ago
     ).group_by(func.date(Task.created_at)).all()
     
@@ -241,6 +239,7 @@ def get_team_analytics(team_id):
 
 @analytics_bp.route('/personal', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_personal_analytics():
     """Get personal analytics for the current user."""
     user_id = int(get_jwt_identity())
@@ -354,19 +353,11 @@ def get_daily_task_summary(user_id):
     # Users can only see their own daily summary unless they're a manager
     if requesting_user_id != user_id:
         # Check if requester is a manager of any team where target user is a member
-        shared_teams = db.session.query(TeamMember).filter(
-            TeamMember.user_id == user_id
-        ).all()
-        
-        is_manager = False
-        for team_member in shared_teams:
-            requester_membership = TeamMember.query.filter_by(
-                team_id=team_member.team_id,
-                user_id=requesting_user_id
-            ).first()
-            if requester_membership and requester_membership.role in ['owner', 'admin']:
-                is_manager = True
-                break
+        requester = get_membership_context(requesting_user_id)
+        is_manager = any(
+            requester.role_in(team_id) in ['owner', 'admin']
+            for team_id in get_membership_context(user_id).team_ids
+        )
         
         if not is_manager:
             return jsonify({'error': 'Access denied'}), 403
@@ -410,6 +401,9 @@ def get_daily_task_summary(user_id):
     ).count()
     
     user = User.query.get(user_id)
+    in_progress_preview = in_progress[:5]  # Limit to 5
+    overdue_preview = overdue[:5]  # Limit to 5
+    users = load_users(task_user_ids(completed_today + due_today + in_progress_preview + overdue_preview))
     
     return jsonify({
         'user': user.to_dict() if user else None,
@@ -422,9 +416,9 @@ def get_daily_task_summary(user_id):
             'comments_made': comments_today
         },
         'tasks': {
-            'completed_today': [task.to_dict() for task in completed_today],
-            'due_today': [task.to_dict() for task in due_today],
-            'in_progress': [task.to_dict() for task in in_progress][:5],  # Limit to 5
-            'overdue': [task.to_dict() for task in overdue][:5]  # Limit to 5
+            'completed_today': serialize_tasks(completed_today, users),
+            'due_today': serialize_tasks(due_today, users),
+            'in_progress': serialize_tasks(in_progress_preview, users),
+            'overdue': serialize_tasks(overdue_preview, users)
         }
     })
\ No newline at end of file
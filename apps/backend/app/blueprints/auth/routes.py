@@ -60,13 +60,13 @@ def register():
         role='user',
     )
     db.session.add(user)
-    db.session.commit()
 
-    # Send verification email (best effort)
+    # Queue the verification email (best effort); committed with the user
     try:
         EmailService.send_verification_email(email)
     except Exception as e:
         current_app.logger.warning(f"Failed sending verification email to {email}: {e}")
+    db.session.commit()
 
     return jsonify({
         "message": "Account created. Please check your email to verify your account.",
@@ -94,11 +94,11 @@ def verify_email():
 
     if not user.is_verified:
         user.is_verified = True
-        db.session.commit()
         try:
             EmailService.send_verified_welcome(email)
         except Exception as e:
             current_app.logger.warning(f"Failed sending verified welcome to {email}: {e}")
+        db.session.commit()
 
     # Redirect to login with a next param so user signs in and continues onboarding
     fe = current_app.config.get('FRONTEND_URL')
@@ -124,6 +124,7 @@ def resend_verification():
 
     try:
         EmailService.send_verification_email(email)
+        db.session.commit()
     except Exception as e:
         current_app.logger.warning(f"Failed resend verification to {email}: {e}")
     return jsonify({"message": "Verification email sent"}), 200
@@ -306,6 +307,7 @@ def otp_request():
     cache.set(f'otp:{email}', code, timeout=300)
     try:
         EmailService.send_login_otp(email=email, code=code)
+        db.session.commit()
     except Exception as e:
         current_app.logger.warning(f"Failed to send OTP to {email}: {e}")
     return jsonify({"message": "OTP sent if the email exists"}), 200
@@ -363,6 +365,7 @@ def password_forgot():
     if user and user.is_verified:
         try:
             EmailService.send_password_reset(email)
+            db.session.commit()
         except Exception as e:
             current_app.logger.warning(f"Failed to send reset email to {email}: {e}")
     return jsonify({"message": "If the email exists, a reset link has been sent"}), 200
@@ -12,6 +12,7 @@ from app.models.task import Task
 from app.models.team import Team, TeamMember
 from app.models.user import User
 from app.services.email_service import EmailService
+from app.services.pagination import InvalidCursor, paginate_from_args
 
 
 def extract_mentions(content):
@@ -25,22 +26,25 @@ def notify_mentioned_users(comment, mentioned_usernames):
     if not mentioned_usernames:
         return
     
-    mentioned_users = User.query.filter(User.username.in_(mentioned_usernames)).all()
+    # Users have no username; a mention matches the local part of their email
+    mentioned_users = User.query.filter(
+        or_(*[User.email.ilike(f'{name}@%') for name in mentioned_usernames])
+    ).all()
     task = comment.task
     commenter = comment.user
     
     for user in mentioned_users:
         if user.id != comment.user_id:  # Don't notify the commenter
-            EmailService.send_email(
+            EmailService.queue_email(
                 to=[user.email],
                 subject=f"You were mentioned in a task: {task.title}",
                 template='task_mention',
                 template_data={
                     'task_title': task.title,
                     'task_id': task.id,
-                    'commenter_name': commenter.username,
+                    'commenter_name': commenter.email,
                     'comment_content': comment.content[:200],
-                    'user_name': user.username
+                    'user_name': user.email
                 }
             )
     
@@ -76,6 +80,16 @@ def list_task_comments(task_id):
     if parent_only:
         query = query.filter_by(parent_comment_id=None)
     
+    # Cursor mode: seek on (created_at, id) and skip the count unless asked
+    if 'cursor' in request.args:
+        try:
+            comments = paginate_from_args(
+                query, TaskComment.created_at, TaskComment.id, request.args, per_page
+            )
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify(comments.to_response('comments', [comment.to_dict() for comment in comments.items]))
+    
     comments = query.order_by(TaskComment.created_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
@@ -126,30 +140,31 @@ def create_comment(task_id):
         parent_comment_id=data.get('parent_comment_id')
     )
     
-    # Handle mentions
-    if mentioned_usernames:
-        mentioned_user_ids = notify_mentioned_users(comment, mentioned_usernames)
-        comment.mentioned_users = mentioned_user_ids
-    
     db.session.add(comment)
     db.session.commit()
     
+    # Handle mentions once the comment is saved
+    if mentioned_usernames:
+        comment.mentioned_users = notify_mentioned_users(comment, mentioned_usernames)
+    
     # Send notification to task assignee and creator
     if task.assigned_to and task.assigned_to != user_id:
         assignee = User.query.get(task.assigned_to)
         if assignee:
-            EmailService.send_email(
+            EmailService.queue_email(
                 to=[assignee.email],
                 subject=f"New comment on task: {task.title}",
                 template='task_comment',
                 template_data={
                     'task_title': task.title,
                     'task_id': task.id,
-                    'commenter_name': comment.user.username,
+                    'commenter_name': comment.user.email,
                     'comment_content': content[:200],
-                    'user_name': assignee.username
+                    'user_name': assignee.email
                 }
             )
+    # Store the queued notifications (and mentioned users)
+    db.session.commit()
     
     return jsonify(comment.to_dict()), 201
 
@@ -1,8 +1,8 @@
 """Health check endpoints for monitoring and deployment."""
-from flask import Blueprint, jsonify
+from flask import jsonify
 import os
 
-health_bp = Blueprint('health', __name__)
+from . import health_bp
 
 @health_bp.route('/health', methods=['GET'])
 def health_check():
@@ -16,16 +16,21 @@ def health_check():
 
 @health_bp.route('/ready', methods=['GET'])
 def readiness_check():
-    """Readiness check - ensures app is ready to receive traffic."""
+    """Readiness check - ensures app is ready to receive traffic.
+
+    The database is first contacted here rather than at startup, so a slow
+    or unavailable database delays readiness, not worker boot.
+    """
     try:
-        # Add database connectivity check here if needed
+        from app.db_pool import pool_stats
         from app.extensions import db
         from sqlalchemy import text
         db.session.execute(text('SELECT 1'))
         
         return jsonify({
             'status': 'ready',
-            'database': 'connected'
+            'database': 'connected',
+            'pool': pool_stats(db.engine)
         }), 200
     except Exception as e:
         return jsonify({
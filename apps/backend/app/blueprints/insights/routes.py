@@ -6,24 +6,23 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func, and_, or_
 
 from . import insights_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.task import Task
-from app.models.team import Team, TeamMember
+from app.models.team import Team
 from app.models.user import User
 from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
+from app.services.response_cache import cached_response
+from app.services.serializers import serialize_tasks, load_users, task_user_ids
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-def _get_user_teams(user_id):
-    """Get list of team IDs where user is a member."""
-    memberships = TeamMember.query.filter_by(user_id=user_id).all()
-    return [m.team_id for m in memberships]
-
-
 @insights_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
+@cached_response
 def dashboard_metrics():
     print("DASHBOARD ROUTE: JWT_REQUIRED PASSED - ENTERING ROUTE", flush=True)
     """Get dashboard metrics for the current user."""
@@ -48,7 +47,7 @@ def dashboard_metrics():
             logger.error(f"Error looking up user: {user_lookup_error}")
             return jsonify({"error": "Database error during user lookup"}), 422
             
-        user_teams = _get_user_teams(user_id)
+        user_teams = get_membership_context(user_id).team_ids
         print(f"User teams: {user_teams}", flush=True)
         logger.info(f"User teams: {user_teams}")
         
@@ -119,6 +118,8 @@ def dashboard_metrics():
             Task.status.in_(['pending', 'in_progress'])
         ).limit(10).all()
         
+        users = load_users(task_user_ids(high_priority_tasks + medium_priority_tasks + low_priority_tasks))
+        
         logger.info("Dashboard metrics completed successfully")
         return jsonify({
             'tasks_completed': completed_count,
@@ -128,9 +129,9 @@ def dashboard_metrics():
             'medium_priority_count': medium_priority_count,
             'low_priority_count': low_priority_count,
             'tasks_by_priority': {
-                'high': [task.to_dict() for task in high_priority_tasks],
-                'medium': [task.to_dict() for task in medium_priority_tasks],
-                'low': [task.to_dict() for task in low_priority_tasks]
+                'high': serialize_tasks(high_priority_tasks, users),
+                'medium': serialize_tasks(medium_priority_tasks, users),
+                'low': serialize_tasks(low_priority_tasks, users)
             }
         })
     
@@ -150,7 +151,7 @@ def dashboard_metrics():
 def team_activity():
     """Get team activity and membership data."""
     user_id = int(get_jwt_identity())  # Convert string back to int for database queries
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     if not user_teams:
         return jsonify({
@@ -161,11 +162,12 @@ def team_activity():
     
     # Get team information
     teams = Team.query.filter(Team.id.in_(user_teams)).all()
+    counts = Team.counts(team.id for team in teams)
     team_data = []
     total_members = 0
     
     for team in teams:
-        member_count = TeamMember.query.filter_by(team_id=team.id).count()
+        member_count = counts.get(team.id, (0, 0))[0]
         total_members += member_count
         
         # Get recent tasks for this team
@@ -177,7 +179,7 @@ def team_activity():
             'id': team.id,
             'name': team.name,
             'member_count': member_count,
-            'recent_tasks': [task.to_dict() for task in recent_tasks]
+            'recent_tasks': serialize_tasks(recent_tasks)
         })
     
     # Get recent activity across all teams
@@ -188,7 +190,7 @@ def team_activity():
     return jsonify({
         'teams': team_data,
         'total_members': total_members,
-        'recent_activity': [task.to_dict() for task in recent_activity]
+        'recent_activity': serialize_tasks(recent_activity)
     })
 
 
@@ -197,7 +199,7 @@ def team_activity():
 def performance_summary():
     """Get weekly performance summary."""
     user_id = int(get_jwt_identity())  # Convert string back to int for database queries
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     # Get date range for the past week
     end_date = datetime.utcnow()
@@ -275,10 +277,11 @@ def performance_summary():
 
 @insights_bp.route('/task-stats', methods=['GET'])
 @jwt_required()
+@cached_response
 def task_statistics():
     """Get detailed task statistics."""
     user_id = int(get_jwt_identity())  # Convert string back to int for database queries
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     if not user_teams:
         return jsonify({
@@ -298,37 +301,40 @@ def task_statistics():
         )
     )
     
-    # Group by status
-    status_stats = db.session.query(
-        Task.status,
-        func.count(Task.id)
-    ).join(Task.project).join(Team).filter(
-        or_(
-            Team.id.in_(user_teams) if user_teams else False,
-            Task.assigned_to == user_id,
-            Task.created_by == user_id
-        )
-    ).group_by(Task.status).all()
+    by_status = {}
+    by_priority = {}
+    by_team = {}
+    
+    # Materialized counters for every project in the user's teams
+    team_project_stats = db.session.query(ProjectTaskStats, Team.name).join(
+        Project, Project.id == ProjectTaskStats.project_id
+    ).join(Team, Team.id == Project.team_id).filter(
+        Team.id.in_(user_teams)
+    ).all()
     
-    # Group by priority
-    priority_stats = db.session.query(
+    for stats, team_name in team_project_stats:
+        for status, count in stats.by_status().items():
+            by_status[status] = by_status.get(status, 0) + count
+        for priority, count in stats.by_priority().items():
+            by_priority[priority] = by_priority.get(priority, 0) + count
+        by_team[team_name] = by_team.get(team_name, 0) + stats.total
+    
+    # Tasks assigned to or created by the user in other teams' projects
+    outside_stats = db.session.query(
+        Task.status,
         Task.priority,
         func.count(Task.id)
-    ).join(Task.project).join(Team).filter(
+    ).join(Project, Task.project_id == Project.id).filter(
+        ~Project.team_id.in_(user_teams),
         or_(
-            Team.id.in_(user_teams) if user_teams else False,
             Task.assigned_to == user_id,
             Task.created_by == user_id
         )
-    ).group_by(Task.priority).all()
+    ).group_by(Task.status, Task.priority).all()
     
-    # Group by team
-    team_stats = db.session.query(
-        Team.name,
-        func.count(Task.id)
-    ).join(Project).join(Task).filter(
-        Team.id.in_(user_teams) if user_teams else False
-    ).group_by(Team.name).all()
+    for status, priority, count in outside_stats:
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
     
     # Overdue tasks
     overdue_count = base_query.filter(
@@ -337,8 +343,8 @@ def task_statistics():
     ).count()
     
     return jsonify({
-        'by_status': {status: count for status, count in status_stats},
-        'by_priority': {priority: count for priority, count in priority_stats},
-        'by_team': {team_name: count for team_name, count in team_stats},
+        'by_status': {status: count for status, count in by_status.items() if count},
+        'by_priority': {priority: count for priority, count in by_priority.items() if count},
+        'by_team': {team_name: count for team_name, count in by_team.items() if count},
         'overdue_count': overdue_count
     })
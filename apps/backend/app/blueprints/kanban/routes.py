@@ -1,18 +1,25 @@
 """Kanban board routes."""
+from datetime import datetime, timedelta
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import joinedload
 
 from . import kanban_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.task import Task
 from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
 from app.models.team import Team, TeamMember
 from app.models.user import User
+from app.services.response_cache import cached_response
+from app.services.serializers import serialize_tasks, task_cards
 
 
 @kanban_bp.route('/project/<int:project_id>/board', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_project_kanban_board(project_id):
     """Get Kanban board view for a project."""
     user_id = int(get_jwt_identity())
@@ -35,31 +42,27 @@ def get_project_kanban_board(project_id):
         'pending_approval': []
     }
     
-    # Query tasks
-    tasks = Task.query.filter_by(project_id=project_id).all()
+    # One query for the cards, with comment counts and overdue computed in SQL
+    cards = task_cards(Task.project_id == project_id)
     
-    for task in tasks:
-        task_dict = task.to_dict()
-        
-        # Add additional info for kanban card
-        task_dict['comments_count'] = len(task.comments.all()) if hasattr(task, 'comments') else 0
-        
+    for card in cards:
         # Determine column based on status and approval
-        if task.approval_status == 'pending_approval':
-            tasks_by_status['pending_approval'].append(task_dict)
-        elif task.status in tasks_by_status:
-            tasks_by_status[task.status].append(task_dict)
+        if card['approval_status'] == 'pending_approval':
+            tasks_by_status['pending_approval'].append(card)
+        elif card['status'] in tasks_by_status:
+            tasks_by_status[card['status']].append(card)
         else:
-            tasks_by_status['pending'].append(task_dict)
+            tasks_by_status['pending'].append(card)
     
     # Calculate statistics
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == 'completed'])
-    in_progress_tasks = len([t for t in tasks if t.status == 'in_progress'])
-    overdue_tasks = len([t for t in tasks if t.due_date and t.due_date < db.func.now() and t.status != 'completed'])
+    stats = ProjectTaskStats.for_project(project_id)
+    total_tasks = stats.total
+    completed_tasks = stats.completed
+    in_progress_tasks = stats.in_progress
+    overdue_tasks = sum(1 for card in cards if card['is_overdue'])
     
     return jsonify({
-        'project': project.to_dict(),
+        'project': project.to_dict(task_count=total_tasks),
         'columns': [
             {
                 'id': 'pending',
@@ -163,30 +166,33 @@ def move_task_on_board(task_id):
 
 @kanban_bp.route('/team/<int:team_id>/board', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_team_kanban_board(team_id):
     """Get Kanban board view for all team projects."""
     user_id = int(get_jwt_identity())
     
     # Verify user is a team member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied to this team'}), 403
     
     # Get all projects for the team
     projects = Project.query.filter_by(team_id=team_id).all()
     project_ids = [p.id for p in projects]
     
+    # One task query for every project, grouped in memory
+    cards_by_project = {}
+    if project_ids:
+        for card in task_cards(Task.project_id.in_(project_ids)):
+            cards_by_project.setdefault(card['project_id'], []).append(card)
+    stats = ProjectTaskStats.for_projects(project_ids)
+    
     # Get all tasks for team projects grouped by project and status
     boards = []
     
     for project in projects:
-        tasks = Task.query.filter_by(project_id=project.id).all()
+        cards = cards_by_project.get(project.id)
         
-        if not tasks:
+        if not cards:
             continue
         
         tasks_by_status = {
@@ -196,15 +202,15 @@ def get_team_kanban_board(team_id):
             'cancelled': []
         }
         
-        for task in tasks:
-            task_dict = task.to_dict()
-            if task.status in tasks_by_status:
-                tasks_by_status[task.status].append(task_dict)
+        for card in cards:
+            if card['status'] in tasks_by_status:
+                tasks_by_status[card['status']].append(card)
         
+        task_count = stats[project.id].total if project.id in stats else len(cards)
         boards.append({
-            'project': project.to_dict(),
+            'project': project.to_dict(task_count=task_count),
             'columns': tasks_by_status,
-            'task_count': len(tasks)
+            'task_count': task_count
         })
     
     return jsonify({
@@ -215,6 +221,7 @@ def get_team_kanban_board(team_id):
 
 @kanban_bp.route('/personal', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_personal_kanban_board():
     """Get personal Kanban board for the current user."""
     user_id = int(get_jwt_identity())
@@ -225,7 +232,7 @@ def get_personal_kanban_board():
             Task.assigned_to == user_id,
             Task.created_by == user_id
         )
-    ).all()
+    ).options(joinedload(Task.project)).all()
     
     # Group by status
     tasks_by_status = {
@@ -235,15 +242,13 @@ def get_personal_kanban_board():
         'cancelled': []
     }
     
-    for task in tasks:
-        task_dict = task.to_dict()
+    for task, task_dict in zip(tasks, serialize_tasks(tasks)):
         task_dict['project_name'] = task.project.name if task.project else 'No Project'
         
         if task.status in tasks_by_status:
             tasks_by_status[task.status].append(task_dict)
     
     # Get user's upcoming tasks
-    from datetime import datetime, timedelta
     upcoming_deadline = datetime.utcnow() + timedelta(days=7)
     upcoming_tasks = Task.query.filter(
         Task.assigned_to == user_id,
@@ -275,7 +280,7 @@ def get_personal_kanban_board():
                 'tasks': tasks_by_status['cancelled']
             }
         ],
-        'upcoming_tasks': [task.to_dict() for task in upcoming_tasks],
+        'upcoming_tasks': serialize_tasks(upcoming_tasks),
         'statistics': {
             'total': len(tasks),
             'pending': len(tasks_by_status['pending']),
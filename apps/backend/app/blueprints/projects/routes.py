@@ -3,37 +3,19 @@ from datetime import datetime
 import logging
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 from . import projects_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.project import Project
 from app.models.team import Team, TeamMember
-
-
-def _user_can_access_team(user_id, team_id):
-    """Check if user can access team."""
-    return TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first() is not None
-
-
-def _user_can_manage_team(user_id, team_id):
-    """Check if user can manage team (owner or admin)."""
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
-        return False
-    
-    team = Team.query.get(team_id)
-    return (team and team.created_by == user_id) or membership.role in ['owner', 'admin']
+from app.models.project_task_stats import ProjectTaskStats
+from app.services.csv_export import csv_response
+from app.services.serializers import serialize_projects
 
 
 @projects_bp.route('/', methods=['GET'])
@@ -65,7 +47,7 @@ def list_projects():
         logger.info(f"Found {len(projects)} projects for user")
         
         return jsonify({
-            'projects': [project.to_dict() for project in projects]
+            'projects': serialize_projects(projects)
         })
         
     except Exception as e:
@@ -94,7 +76,7 @@ def create_project():
         return jsonify({'error': 'Team ID is required'}), 400
     
     # Check if user can manage the team
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied to this team'}), 403
     
     # Create project
@@ -127,11 +109,7 @@ def get_project(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    # Include task count
-    project_dict = project.to_dict()
-    project_dict['task_count'] = len(project.tasks) if hasattr(project, 'tasks') else 0
-    
-    return jsonify(project_dict)
+    return jsonify(project.to_dict(task_count=ProjectTaskStats.for_project(project.id).total))
 
 
 @projects_bp.route('/<int:project_id>', methods=['PUT'])
@@ -149,7 +127,7 @@ def update_project(project_id):
         return jsonify({'error': 'Project not found'}), 404
     
     # Check if user can manage the team
-    if not _user_can_manage_team(user_id, project.team_id):
+    if not get_membership_context(user_id).can_manage(project.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     data = request.get_json() or {}
@@ -192,7 +170,7 @@ def delete_project(project_id):
         return jsonify({'error': 'Project not found'}), 404
     
     # Check if user can manage the team
-    if not _user_can_manage_team(user_id, project.team_id):
+    if not get_membership_context(user_id).can_manage(project.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     db.session.delete(project)
@@ -207,13 +185,13 @@ def list_team_projects(team_id):
     """List projects for a specific team."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_access_team(user_id, team_id):
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied to this team'}), 403
     
     projects = Project.query.filter_by(team_id=team_id).all()
     
     return jsonify({
-        'projects': [project.to_dict() for project in projects]
+        'projects': serialize_projects(projects)
     })
 
 
@@ -269,7 +247,7 @@ def get_project_timeline(project_id):
             'date': task.due_date.isoformat() if task.due_date else None,
             'status': task.status,
             'priority': task.priority,
-            'assignee': task.assignee.username if task.assignee else None,
+            'assignee': task.assignee.email if task.assignee else None,
             'completed_date': task.completed_at.isoformat() if task.completed_at else None
         })
     
@@ -277,8 +255,9 @@ def get_project_timeline(project_id):
     timeline_events.sort(key=lambda x: x['date'] if x['date'] else '')
     
     # Calculate project progress
-    total_tasks = Task.query.filter_by(project_id=project_id).count()
-    completed_tasks = Task.query.filter_by(project_id=project_id, status='completed').count()
+    stats = ProjectTaskStats.for_project(project_id)
+    total_tasks = stats.total
+    completed_tasks = stats.completed
     project_progress = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
     
     return jsonify({
@@ -294,6 +273,37 @@ def get_project_timeline(project_id):
     })
 
 
+@projects_bp.route('/<int:project_id>/tasks/export', methods=['GET'])
+@jwt_required()
+def export_project_tasks(project_id):
+    """Export a project's tasks as CSV, streamed row by row."""
+    user_id = int(get_jwt_identity())
+    
+    # Verify user has access to the project
+    team_id = db.session.execute(
+        select(Project.team_id).where(Project.id == project_id)
+    ).scalar_one_or_none()
+    
+    if team_id is None or not get_membership_context(user_id).is_member(team_id):
+        return jsonify({'error': 'Project not found'}), 404
+    
+    from app.models.task import Task
+    from app.models.user import User
+    statement = select(
+        Task.id, Task.title, Task.status, Task.priority, User.email,
+        Task.due_date, Task.created_at, Task.completed_at, Task.approval_status
+    ).outerjoin(User, User.id == Task.assigned_to).where(
+        Task.project_id == project_id
+    ).order_by(Task.id)
+    
+    return csv_response(
+        f'project_{project_id}_tasks.csv',
+        ['id', 'title', 'status', 'priority', 'assignee', 'due_date',
+         'created_at', 'completed_at', 'approval_status'],
+        statement
+    )
+
+
 @projects_bp.route('/<int:project_id>/milestones', methods=['GET'])
 @jwt_required()
 def list_project_milestones(project_id):
@@ -331,7 +341,7 @@ def create_project_milestone(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    if not _user_can_manage_team(user_id, project.team_id):
+    if not get_membership_context(user_id).can_manage(project.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     data = request.get_json() or {}
@@ -375,7 +385,7 @@ def update_milestone(milestone_id):
     
     # Check if user can manage the project
     project = Project.query.get(milestone.project_id)
-    if not _user_can_manage_team(user_id, project.team_id):
+    if not get_membership_context(user_id).can_manage(project.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     data = request.get_json() or {}
@@ -2,14 +2,28 @@
 from datetime import datetime, timedelta
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
 from . import recurring_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.recurring_task import RecurringTask
 from app.models.task import Task
 from app.models.team import Team, TeamMember
 from app.models.project import Project
+from app.models.upcoming_occurrence import UpcomingOccurrence
+from app.services.recurrence import RecurrenceRule
+from app.services.recurring_generation import generate_due_tasks
+from app.services.serializers import serialize_tasks
+
+
+def _rule_error(recurring_task):
+    """Return why the template's recurrence settings are invalid, if they are."""
+    try:
+        RecurrenceRule.for_template(recurring_task)
+    except (TypeError, ValueError) as e:
+        return str(e)
+    return None
 
 
 @recurring_bp.route('/', methods=['GET'])
@@ -19,8 +33,7 @@ def list_recurring_tasks():
     user_id = int(get_jwt_identity())
     
     # Get user's teams
-    user_teams = TeamMember.query.filter_by(user_id=user_id).all()
-    team_ids = [tm.team_id for tm in user_teams]
+    team_ids = get_membership_context(user_id).team_ids
     
     # Get projects from user's teams
     projects = Project.query.filter(Project.team_id.in_(team_ids)).all()
@@ -99,12 +112,65 @@ def create_recurring_task():
         is_active=True
     )
     
+    error = _rule_error(recurring_task)
+    if error:
+        return jsonify({'error': error}), 400
+    
     db.session.add(recurring_task)
     db.session.commit()
     
     return jsonify(recurring_task.to_dict()), 201
 
 
+@recurring_bp.route('/upcoming', methods=['GET'])
+@jwt_required()
+def upcoming_occurrences():
+    """List occurrences of the user's recurring tasks due in the next few days.
+    
+    Reads the upcoming_occurrences index, which covers RECURRENCE_HORIZON_DAYS.
+    """
+    user_id = int(get_jwt_identity())
+    now = datetime.utcnow()
+    horizon_end = UpcomingOccurrence.horizon_end(now)
+    
+    try:
+        days = int(request.args.get('days', 7))
+    except ValueError:
+        return jsonify({'error': 'days must be an integer'}), 400
+    end = min(now + timedelta(days=max(days, 0)), horizon_end)
+    
+    team_ids = get_membership_context(user_id).team_ids
+    project_ids = select(Project.id).where(Project.team_id.in_(team_ids))
+    
+    rows = db.session.execute(
+        select(
+            UpcomingOccurrence.recurring_task_id, UpcomingOccurrence.due_date,
+            UpcomingOccurrence.assigned_to, UpcomingOccurrence.project_id,
+            RecurringTask.title, RecurringTask.priority
+        ).join(RecurringTask, RecurringTask.id == UpcomingOccurrence.recurring_task_id).where(
+            UpcomingOccurrence.due_date <= end,
+            or_(
+                UpcomingOccurrence.project_id.in_(project_ids),
+                UpcomingOccurrence.assigned_to == user_id,
+                UpcomingOccurrence.created_by == user_id
+            )
+        ).order_by(UpcomingOccurrence.due_date, UpcomingOccurrence.recurring_task_id)
+    ).all()
+    
+    return jsonify({
+        'occurrences': [{
+            'recurring_task_id': row.recurring_task_id,
+            'title': row.title,
+            'priority': row.priority,
+            'due_date': row.due_date.isoformat(),
+            'assigned_to': row.assigned_to,
+            'project_id': row.project_id,
+        } for row in rows],
+        'until': end.isoformat(),
+        'horizon_end': horizon_end.isoformat()
+    })
+
+
 @recurring_bp.route('/<int:recurring_task_id>', methods=['GET'])
 @jwt_required()
 def get_recurring_task(recurring_task_id):
@@ -168,6 +234,13 @@ def update_recurring_task(recurring_task_id):
         recurring_task.is_active = data['is_active']
     if 'next_due_date' in data:
         recurring_task.next_due_date = datetime.fromisoformat(data['next_due_date'])
+        # A new next due date starts the series over from there
+        recurring_task.start_date = recurring_task.next_due_date
+    
+    error = _rule_error(recurring_task)
+    if error:
+        db.session.rollback()
+        return jsonify({'error': error}), 400
     
     db.session.commit()
     return jsonify(recurring_task.to_dict())
@@ -254,24 +327,13 @@ def generate_recurring_tasks():
     if not user or user.email not in ['admin@granula.com']:  # Add your admin check here
         return jsonify({'error': 'Admin access required'}), 403
     
-    # Find all active recurring tasks that are due
-    now = datetime.utcnow()
-    due_recurring_tasks = RecurringTask.query.filter(
-        RecurringTask.is_active == True,
-        RecurringTask.next_due_date <= now
-    ).all()
-    
-    generated_tasks = []
-    
-    for recurring in due_recurring_tasks:
-        task = recurring.generate_task()
-        if task:
-            db.session.add(task)
-            generated_tasks.append(task)
-    
-    db.session.commit()
+    # Back-fill every missed occurrence in set-based chunks
+    task_ids = []
+    stats = generate_due_tasks(task_ids=task_ids)
+    tasks = Task.query.filter(Task.id.in_(task_ids)).order_by(Task.id).all() if task_ids else []
     
     return jsonify({
-        'message': f'Generated {len(generated_tasks)} tasks',
-        'tasks': [task.to_dict() for task in generated_tasks]
-    })
\ No newline at end of file
+        'message': f"Generated {stats['created']} tasks",
+        'tasks': serialize_tasks(tasks),
+        'statistics': stats
+    })
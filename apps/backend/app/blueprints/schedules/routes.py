@@ -6,15 +6,29 @@ from app.extensions import db
 from app.models.schedule import Schedule, ScheduleParticipant
 from app.models.user import User
 from app.models.project import Project
-from app.models.team import Team
+from app.models.team import Team, TeamMember
+from app.authz import get_membership_context
+from app.services.freebusy import BusyIndex, find_conflicts
+from app.services.response_cache import cached_response
+from app.services.schedule_expansion import MAX_RANGE_DAYS, in_range, iter_occurrences
+from app.services.serializers import schedule_summaries
 
 schedules_bp = Blueprint('schedules', __name__, url_prefix='/api/schedules')
 
+MAX_FREEBUSY_USERS = 100
+
 
 @schedules_bp.route('', methods=['GET'])
 @jwt_required()
+@cached_response
 def get_schedules():
-    """Get user's schedules with optional filtering."""
+    """Get user's schedules with optional filtering.
+    
+    With both start_date and end_date, recurring schedules are expanded into
+    one entry per occurrence in the range; ``date`` is the occurrence date
+    and ``series_date`` the date the series started on. Entries use the
+    compact ``schedule_summaries`` projection; GET /<id> has the full detail.
+    """
     try:
         user_id = int(get_jwt_identity())
         
@@ -36,12 +50,21 @@ def get_schedules():
         ).distinct()
         
         # Apply filters
+        start_date_obj = end_date_obj = None
         if start_date:
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-            query = query.filter(Schedule.date >= start_date_obj)
             
         if end_date:
             end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+        
+        expand = start_date_obj is not None and end_date_obj is not None
+        if expand:
+            if (end_date_obj - start_date_obj).days > MAX_RANGE_DAYS:
+                return jsonify({'error': f'Date range cannot exceed {MAX_RANGE_DAYS} days'}), 400
+            query = query.filter(in_range(start_date_obj, end_date_obj))
+        elif start_date_obj:
+            query = query.filter(Schedule.date >= start_date_obj)
+        elif end_date_obj:
             query = query.filter(Schedule.date <= end_date_obj)
             
         if status:
@@ -56,9 +79,21 @@ def get_schedules():
         # Order by date and time
         schedules = query.order_by(Schedule.date, Schedule.start_time).all()
         
+        # Compact dicts with participants and users loaded in batches
+        summaries = schedule_summaries(schedules)
+        if expand:
+            # Serialize each series once and stamp its occurrence dates
+            serialized = {summary['id']: summary for summary in summaries}
+            results = [
+                dict(serialized[schedule.id], date=occurrence.isoformat(), series_date=schedule.date.isoformat())
+                for occurrence, schedule in iter_occurrences(schedules, start_date_obj, end_date_obj)
+            ]
+        else:
+            results = summaries
+        
         return jsonify({
-            'schedules': [schedule.to_dict() for schedule in schedules],
-            'total': len(schedules)
+            'schedules': results,
+            'total': len(results)
         }), 200
         
     except Exception as e:
@@ -109,6 +144,17 @@ def create_schedule():
             team_id=data.get('team_id')
         )
         
+        # Overlaps for the organizer and internal participants; only a
+        # client that asks for it gets a 409, everyone else a warning
+        participants = data.get('participants', [])
+        try:
+            attendee_ids = [user_id] + [int(p['user_id']) for p in participants if 'user_id' in p]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Participant user_id must be an integer'}), 400
+        conflicts = find_conflicts(schedule, attendee_ids)
+        if conflicts and data.get('reject_conflicts'):
+            return jsonify({'error': 'Schedule conflicts with existing events', 'conflicts': conflicts}), 409
+        
         db.session.add(schedule)
         db.session.flush()  # Get the ID
         
@@ -122,13 +168,12 @@ def create_schedule():
         db.session.add(organizer_participant)
         
         # Add other participants
-        participants = data.get('participants', [])
         for participant_data in participants:
             if 'user_id' in participant_data:
                 # Internal user
                 participant = ScheduleParticipant(
                     schedule_id=schedule.id,
-                    user_id=participant_data['user_id'],
+                    user_id=int(participant_data['user_id']),
                     response_status='pending'
                 )
             else:
@@ -145,7 +190,8 @@ def create_schedule():
         
         return jsonify({
             'message': 'Schedule created successfully',
-            'schedule': schedule.to_dict()
+            'schedule': schedule.to_dict(),
+            'conflicts': conflicts
         }), 201
         
     except Exception as e:
@@ -153,6 +199,62 @@ def create_schedule():
         return jsonify({'error': str(e)}), 500
 
 
+@schedules_bp.route('/freebusy', methods=['GET'])
+@jwt_required()
+def get_freebusy():
+    """Get busy time blocks for the caller and teammates over a date range.
+    
+    Query: user_ids (comma separated, defaults to the caller), start_date,
+    end_date. Only times are returned, never event details.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        
+        try:
+            start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date()
+        except KeyError:
+            return jsonify({'error': 'start_date and end_date are required'}), 400
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date format: {str(e)}'}), 400
+        if end_date < start_date:
+            return jsonify({'error': 'end_date must not be before start_date'}), 400
+        if (end_date - start_date).days > MAX_RANGE_DAYS:
+            return jsonify({'error': f'Date range cannot exceed {MAX_RANGE_DAYS} days'}), 400
+        
+        try:
+            user_ids = {int(i) for i in request.args.get('user_ids', str(user_id)).split(',') if i.strip()}
+        except ValueError:
+            return jsonify({'error': 'user_ids must be comma separated integers'}), 400
+        if len(user_ids) > MAX_FREEBUSY_USERS:
+            return jsonify({'error': f'At most {MAX_FREEBUSY_USERS} users per request'}), 400
+        
+        # Only the caller and people who share a team with them
+        team_ids = get_membership_context(user_id).team_ids
+        visible = {user_id} | set(db.session.execute(
+            db.select(TeamMember.user_id).where(
+                TeamMember.team_id.in_(team_ids),
+                TeamMember.user_id.in_(user_ids)
+            )
+        ).scalars())
+        if user_ids - visible:
+            return jsonify({'error': 'Access denied to some users', 'user_ids': sorted(user_ids - visible)}), 403
+        
+        index = BusyIndex.load(user_ids, start_date, end_date)
+        
+        return jsonify({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'users': [{
+                'user_id': uid,
+                'busy': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in index.busy(uid)]
+            } for uid in sorted(user_ids)]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @schedules_bp.route('/<int:schedule_id>', methods=['GET'])
 @jwt_required()
 def get_schedule(schedule_id):
@@ -238,8 +340,9 @@ def delete_schedule(schedule_id):
         if schedule.created_by != user_id:
             return jsonify({'error': 'Only the creator can delete this schedule'}), 403
         
-        # Delete participants first
-        ScheduleParticipant.query.filter_by(schedule_id=schedule_id).delete()
+        # Delete participants first, one by one so their calendars are invalidated
+        for participant in schedule.participants:
+            db.session.delete(participant)
         
         # Delete schedule
         db.session.delete(schedule)
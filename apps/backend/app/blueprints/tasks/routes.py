@@ -3,19 +3,27 @@ from datetime import datetime
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from sqlalchemy import or_, and_
+from sqlalchemy.exc import IntegrityError
 
 from . import tasks_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.task import Task
 from app.models.team import Team, TeamMember
 from app.models.user import User
 from app.models.project import Project
+from app.services.pagination import InvalidCursor, paginate_from_args
+from app.services.serializers import serialize_tasks
+from app.services.task_bulk import MAX_OPERATIONS, apply_task_operations
 
+DUPLICATE_OCCURRENCE_ERROR = 'Another task already exists for this occurrence of its recurring task'
 
-def _get_user_teams(user_id):
-    """Get list of team IDs where user is a member."""
-    memberships = TeamMember.query.filter_by(user_id=user_id).all()
-    return [m.team_id for m in memberships]
+
+def _is_duplicate_occurrence(error):
+    """Whether ``error`` violates uq_task_recurring_due (one task per occurrence)."""
+    message = str(error.orig)
+    # PostgreSQL names the index; SQLite lists its columns
+    return 'uq_task_recurring_due' in message or 'tasks.recurring_task_id, tasks.due_date' in message
 
 
 @tasks_bp.route('/', methods=['GET'])
@@ -23,7 +31,7 @@ def _get_user_teams(user_id):
 def list_tasks():
     """List tasks for the current user with filtering."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     # Query parameters
     priority = request.args.get('priority')
@@ -56,13 +64,21 @@ def list_tasks():
     if department_id:
         query = query.filter(Task.department_id == department_id)
     
+    # Cursor mode: seek on (created_at, id) and skip the count unless asked
+    if 'cursor' in request.args:
+        try:
+            tasks = paginate_from_args(query, Task.created_at, Task.id, request.args, per_page)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify(tasks.to_response('tasks', serialize_tasks(tasks.items)))
+    
     # Paginate
     tasks = query.order_by(Task.created_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
     return jsonify({
-        'tasks': [task.to_dict() for task in tasks.items],
+        'tasks': serialize_tasks(tasks.items),
         'total': tasks.total,
         'pages': tasks.pages,
         'page': page,
@@ -116,12 +132,40 @@ def create_task():
     return jsonify(task.to_dict()), 201
 
 
+@tasks_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_task_operations():
+    """Apply many create/update/status/assign/delete operations in one transaction."""
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    operations = data.get('operations')
+    
+    if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+        return jsonify({'error': 'operations must be a list of objects'}), 400
+    if len(operations) > MAX_OPERATIONS:
+        return jsonify({'error': f'At most {MAX_OPERATIONS} operations per request'}), 400
+    
+    atomic = bool(data.get('atomic', False))
+    try:
+        results, applied = apply_task_operations(user_id, operations, atomic=atomic)
+    except IntegrityError as e:
+        if not _is_duplicate_occurrence(e):
+            raise
+        return jsonify({'error': DUPLICATE_OCCURRENCE_ERROR}), 409
+    
+    summary = {'ok': 0, 'error': 0, 'skipped': 0}
+    for result in results:
+        summary[result['status']] += 1
+    status_code = 400 if atomic and summary['error'] else 200
+    return jsonify({'applied': applied, 'summary': summary, 'results': results}), status_code
+
+
 @tasks_bp.route('/<int:task_id>', methods=['GET'])
 @jwt_required()
 def get_task(task_id):
     """Get a specific task."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     task = Task.query.join(Task.project).join(Team).filter(
         Task.id == task_id,
@@ -143,7 +187,7 @@ def get_task(task_id):
 def update_task(task_id):
     """Update a task."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     task = Task.query.join(Task.project).join(Team).filter(
         Task.id == task_id,
@@ -178,7 +222,13 @@ def update_task(task_id):
     if 'due_date' in data:
         task.due_date = datetime.fromisoformat(data['due_date']) if data['due_date'] else None
     
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not _is_duplicate_occurrence(e):
+            raise
+        return jsonify({'error': DUPLICATE_OCCURRENCE_ERROR}), 409
     return jsonify(task.to_dict())
 
 
@@ -187,7 +237,7 @@ def update_task(task_id):
 def delete_task(task_id):
     """Delete a task."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     task = Task.query.join(Task.project).join(Team).filter(
         Task.id == task_id,
@@ -211,7 +261,7 @@ def delete_task(task_id):
 def assign_task(task_id):
     """Assign task to a team member."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     task = Task.query.join(Task.project).join(Team).filter(
         Task.id == task_id,
@@ -248,7 +298,7 @@ def assign_task(task_id):
 def update_task_status(task_id):
     """Update task status."""
     user_id = int(get_jwt_identity())
-    user_teams = _get_user_teams(user_id)
+    user_teams = get_membership_context(user_id).team_ids
     
     task = Task.query.join(Task.project).join(Team).filter(
         Task.id == task_id,
@@ -271,31 +321,29 @@ def update_task_status(task_id):
     # Check if task requires approval when marking as completed
     if status == 'completed' and task.requires_approval and task.approval_status != 'approved':
         task.approval_status = 'pending_approval'
-        db.session.commit()
         
-        # Notify managers for approval
+        # Notify managers for approval; the emails are committed with the task
         from app.services.email_service import EmailService
         project = task.project
         if project and project.team:
-            managers = TeamMember.query.filter(
+            managers = User.query.join(TeamMember, TeamMember.user_id == User.id).filter(
                 TeamMember.team_id == project.team.id,
                 TeamMember.role.in_(['owner', 'admin'])
             ).all()
             
-            for manager in managers:
-                manager_user = User.query.get(manager.user_id)
-                if manager_user:
-                    EmailService.send_email(
-                        to=[manager_user.email],
-                        subject=f"Task requires approval: {task.title}",
-                        template='task_approval_request',
-                        template_data={
-                            'task_title': task.title,
-                            'task_id': task.id,
-                            'requester_name': task.assignee.username if task.assignee else 'Unknown',
-                            'user_name': manager_user.username
-                        }
-                    )
+            for manager_user in managers:
+                EmailService.queue_email(
+                    to=[manager_user.email],
+                    subject=f"Task requires approval: {task.title}",
+                    template='task_approval_request',
+                    template_data={
+                        'task_title': task.title,
+                        'task_id': task.id,
+                        'requester_name': task.assignee.email if task.assignee else 'Unknown',
+                        'user_name': manager_user.email
+                    }
+                )
+        db.session.commit()
         
         return jsonify({
             'message': 'Task marked for approval',
@@ -324,12 +372,8 @@ def approve_task(task_id):
     
     # Check if user is a manager/owner of the project's team
     if task.project and task.project.team:
-        membership = TeamMember.query.filter_by(
-            user_id=user_id,
-            team_id=task.project.team.id
-        ).first()
-        
-        if not membership or membership.role not in ['owner', 'admin']:
+        role = get_membership_context(user_id).role_in(task.project.team.id)
+        if role not in ['owner', 'admin']:
             return jsonify({'error': 'Only team managers can approve tasks'}), 403
     else:
         return jsonify({'error': 'Task not associated with a project'}), 400
@@ -354,14 +398,12 @@ def approve_task(task_id):
     task.approved_at = datetime.utcnow()
     task.approval_notes = notes
     
-    db.session.commit()
-    
-    # Notify task assignee
+    # Notify task assignee; the email is committed with the approval
     if task.assigned_to:
         from app.services.email_service import EmailService
         assignee = User.query.get(task.assigned_to)
         if assignee:
-            EmailService.send_email(
+            EmailService.queue_email(
                 to=[assignee.email],
                 subject=f"Task {action}d: {task.title}",
                 template='task_approval_result',
@@ -370,10 +412,11 @@ def approve_task(task_id):
                     'task_id': task.id,
                     'action': action,
                     'notes': notes,
-                    'approver_name': User.query.get(user_id).username,
-                    'user_name': assignee.username
+                    'approver_name': User.query.get(user_id).email,
+                    'user_name': assignee.email
                 }
             )
+    db.session.commit()
     
     return jsonify({
         'message': f'Task {action}d successfully',
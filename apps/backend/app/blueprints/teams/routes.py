@@ -3,6 +3,7 @@ import logging
 from flask import jsonify, request, redirect
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
 from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
 import uuid
 
@@ -10,29 +11,17 @@ import uuid
 logger = logging.getLogger(__name__)
 
 from . import teams_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.team import Team, TeamMember
 from app.models.user import User
 from app.models.department import Department, UserDepartment
 from app.models.invitation import TeamInvitation
 from app.services.email_service import EmailService
+from app.services.serializers import serialize_departments, serialize_invitations, serialize_teams
 from app.services.token_service import generate_token
 
 
-def _user_can_manage_team(user_id, team_id):
-    """Check if user can manage team (owner or admin)."""
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
-        return False
-    
-    team = Team.query.get(team_id)
-    return (team and team.created_by == user_id) or membership.role in ['owner', 'admin']
-
-
 @teams_bp.route('/', methods=['GET'])
 @jwt_required()
 def list_teams():
@@ -60,7 +49,7 @@ def list_teams():
         ).all()
         logger.info(f"Found {len(teams)} teams for user")
         
-        return jsonify({'teams': [team.to_dict() for team in teams]})
+        return jsonify({'teams': serialize_teams(teams)})
         
     except Exception as e:
         print(f"TEAMS ERROR: {e}", flush=True)
@@ -110,22 +99,19 @@ def get_team(team_id):
     user_id = int(get_jwt_identity())
     
     # Check if user is a member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
     if not team:
         return jsonify({'error': 'Team not found'}), 404
     
-    # Include members and departments
-    team_dict = team.to_dict()
-    team_dict['members'] = [member.to_dict() for member in team.members]
-    team_dict['departments'] = [dept.to_dict() for dept in team.departments]
+    # Include members and departments; counts come from the loaded lists
+    members = TeamMember.query.filter_by(team_id=team_id).options(joinedload(TeamMember.user)).all()
+    departments = Department.query.filter_by(team_id=team_id).all()
+    team_dict = team.to_dict(member_count=len(members), department_count=len(departments))
+    team_dict['members'] = [member.to_dict() for member in members]
+    team_dict['departments'] = serialize_departments(departments)
     
     return jsonify(team_dict)
 
@@ -136,7 +122,7 @@ def update_team(team_id):
     """Update team details."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -167,7 +153,7 @@ def add_team_member(team_id):
     """
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -216,7 +202,7 @@ def remove_team_member(team_id, user_id):
     """Remove a member from the team."""
     current_user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(current_user_id, team_id):
+    if not get_membership_context(current_user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -247,7 +233,7 @@ def update_member_role(team_id, user_id):
     """Update a team member's role."""
     current_user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(current_user_id, team_id):
+    if not get_membership_context(current_user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -285,12 +271,7 @@ def list_team_members(team_id):
     user_id = int(get_jwt_identity())
     
     # Check if user is a member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -312,7 +293,7 @@ def create_department(team_id):
     """Create a department within a team."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -353,12 +334,7 @@ def list_departments(team_id):
     user_id = int(get_jwt_identity())
     
     # Check if user is a member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -368,7 +344,7 @@ def list_departments(team_id):
     departments = Department.query.filter_by(team_id=team_id).all()
     
     return jsonify({
-        'departments': [dept.to_dict() for dept in departments]
+        'departments': serialize_departments(departments)
     })
 
 
@@ -378,7 +354,7 @@ def update_department(team_id, dept_id):
     """Update a department."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     department = Department.query.filter_by(
@@ -421,7 +397,7 @@ def delete_department(team_id, dept_id):
     """Delete a department."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     department = Department.query.filter_by(
@@ -444,7 +420,7 @@ def assign_user_to_department(team_id, dept_id):
     """Assign a user to a department."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     department = Department.query.filter_by(
@@ -497,7 +473,7 @@ def remove_user_from_department(team_id, dept_id, target_user_id):
     """Remove a user from a department."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     department = Department.query.filter_by(
@@ -529,12 +505,7 @@ def list_department_members(team_id, dept_id):
     user_id = int(get_jwt_identity())
     
     # Check if user is a team member
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership:
+    if not get_membership_context(user_id).is_member(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     department = Department.query.filter_by(
@@ -560,7 +531,7 @@ def invite_to_team(team_id):
     """Send an email invitation to join a team."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -609,9 +580,8 @@ def invite_to_team(team_id):
     )
     
     db.session.add(invitation)
-    db.session.commit()
     
-    # Send invitation email
+    # Queue the invitation email; it is committed together with the invitation
     inviter = User.query.get(user_id)
     accept_url = f"{request.host_url}api/teams/invitations/{invitation_token}/accept"
     
@@ -626,10 +596,10 @@ def invite_to_team(team_id):
     )
     
     if not email_sent:
-        db.session.delete(invitation)
-        db.session.commit()
+        db.session.rollback()
         return jsonify({'error': 'Failed to send invitation email'}), 500
     
+    db.session.commit()
     return jsonify(invitation.to_dict()), 201
 
 
@@ -691,7 +661,7 @@ def list_team_invitations(team_id):
     """List pending invitations for a team."""
     user_id = int(get_jwt_identity())
     
-    if not _user_can_manage_team(user_id, team_id):
+    if not get_membership_context(user_id).can_manage(team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     team = Team.query.get(team_id)
@@ -717,7 +687,7 @@ def list_team_invitations(team_id):
     ).all()
     
     return jsonify({
-        'invitations': [inv.to_dict() for inv in pending_invitations]
+        'invitations': serialize_invitations(pending_invitations)
     })
 
 
@@ -731,7 +701,7 @@ def resend_invitation(invitation_id):
     if not invitation:
         return jsonify({'error': 'Invitation not found'}), 404
     
-    if not _user_can_manage_team(user_id, invitation.team_id):
+    if not get_membership_context(user_id).can_manage(invitation.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     if invitation.status != 'pending':
@@ -742,9 +712,7 @@ def resend_invitation(invitation_id):
     invitation.expires_at = datetime.utcnow() + timedelta(days=7)
     invitation.created_at = datetime.utcnow()
     
-    db.session.commit()
-    
-    # Send email
+    # Queue the email; it is committed together with the renewed token
     inviter = User.query.get(user_id)
     accept_url = f"{request.host_url}api/teams/invitations/{invitation.token}/accept"
     
@@ -759,8 +727,10 @@ def resend_invitation(invitation_id):
     )
     
     if not email_sent:
+        db.session.rollback()
         return jsonify({'error': 'Failed to resend invitation email'}), 500
     
+    db.session.commit()
     return jsonify(invitation.to_dict())
 
 
@@ -774,7 +744,7 @@ def revoke_invitation(invitation_id):
     if not invitation:
         return jsonify({'error': 'Invitation not found'}), 404
     
-    if not _user_can_manage_team(user_id, invitation.team_id):
+    if not get_membership_context(user_id).can_manage(invitation.team_id):
         return jsonify({'error': 'Access denied'}), 403
     
     if invitation.status != 'pending':
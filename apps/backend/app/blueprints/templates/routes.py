@@ -4,11 +4,12 @@ from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from . import templates_bp
+from app.authz import get_membership_context
 from app.extensions import db
 from app.models.project_template import ProjectTemplate, ProjectMilestone
 from app.models.project import Project
 from app.models.task import Task
-from app.models.team import Team, TeamMember
+from app.models.team import Team
 
 
 @templates_bp.route('/', methods=['GET'])
@@ -18,8 +19,7 @@ def list_templates():
     user_id = int(get_jwt_identity())
     
     # Get user's teams
-    user_teams = TeamMember.query.filter_by(user_id=user_id).all()
-    team_ids = [tm.team_id for tm in user_teams]
+    team_ids = get_membership_context(user_id).team_ids
     
     # Get public templates and team-specific templates
     templates = ProjectTemplate.query.filter(
@@ -54,12 +54,7 @@ def create_template():
     # If team_id is provided, verify user has access
     team_id = data.get('team_id')
     if team_id:
-        membership = TeamMember.query.filter_by(
-            user_id=user_id,
-            team_id=team_id
-        ).first()
-        
-        if not membership or membership.role not in ['owner', 'admin']:
+        if get_membership_context(user_id).role_in(team_id) not in ['owner', 'admin']:
             return jsonify({'error': 'Only team managers can create team templates'}), 403
     
     # Create template
@@ -94,11 +89,8 @@ def get_template(template_id):
     # Check access
     if not template.is_public:
         if template.team_id:
-            membership = TeamMember.query.filter_by(
-                user_id=user_id,
-                team_id=template.team_id
-            ).first()
-            if not membership and template.created_by != user_id:
+            is_member = get_membership_context(user_id).is_member(template.team_id)
+            if not is_member and template.created_by != user_id:
                 return jsonify({'error': 'Access denied'}), 403
         elif template.created_by != user_id:
             return jsonify({'error': 'Access denied'}), 403
@@ -121,11 +113,7 @@ def update_template(template_id):
     if template.created_by == user_id:
         can_edit = True
     elif template.team_id:
-        membership = TeamMember.query.filter_by(
-            user_id=user_id,
-            team_id=template.team_id
-        ).first()
-        if membership and membership.role in ['owner', 'admin']:
+        if get_membership_context(user_id).role_in(template.team_id) in ['owner', 'admin']:
             can_edit = True
     
     if not can_edit:
@@ -167,11 +155,7 @@ def delete_template(template_id):
     if template.created_by == user_id:
         can_delete = True
     elif template.team_id:
-        membership = TeamMember.query.filter_by(
-            user_id=user_id,
-            team_id=template.team_id
-        ).first()
-        if membership and membership.role in ['owner', 'admin']:
+        if get_membership_context(user_id).role_in(template.team_id) in ['owner', 'admin']:
             can_delete = True
     
     if not can_delete:
@@ -197,11 +181,8 @@ def use_template(template_id):
     # Check access to template
     if not template.is_public:
         if template.team_id:
-            membership = TeamMember.query.filter_by(
-                user_id=user_id,
-                team_id=template.team_id
-            ).first()
-            if not membership and template.created_by != user_id:
+            is_member = get_membership_context(user_id).is_member(template.team_id)
+            if not is_member and template.created_by != user_id:
                 return jsonify({'error': 'Access denied to template'}), 403
     
     # Validate project details
@@ -214,12 +195,7 @@ def use_template(template_id):
         return jsonify({'error': 'Team ID is required'}), 400
     
     # Verify user can create project in the team
-    membership = TeamMember.query.filter_by(
-        user_id=user_id,
-        team_id=team_id
-    ).first()
-    
-    if not membership or membership.role not in ['owner', 'admin']:
+    if get_membership_context(user_id).role_in(team_id) not in ['owner', 'admin']:
         return jsonify({'error': 'Only team managers can create projects'}), 403
     
     # Create project from template
@@ -2,11 +2,14 @@
 from flask import jsonify, request
 from datetime import datetime, timedelta
 import re
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from . import waitlist_bp
 from app.extensions import limiter, db
 from app.models.waitlist import WaitlistEntry
+from app.services.csv_export import csv_response
 from app.services.email_service import EmailService
+from app.services.pagination import InvalidCursor, paginate_from_args
 
 
 def is_valid_email(email):
@@ -131,6 +134,17 @@ def get_waitlist_entries():
         # Limit per_page to prevent abuse
         per_page = min(per_page, 100)
         
+        # Cursor mode: seek on (signed_up_at, id) and skip the count unless asked
+        if 'cursor' in request.args:
+            try:
+                entries = paginate_from_args(
+                    WaitlistEntry.query, WaitlistEntry.signed_up_at, WaitlistEntry.id,
+                    request.args, per_page
+                )
+            except InvalidCursor:
+                return jsonify({"error": "Invalid cursor"}), 400
+            return jsonify(entries.to_response("entries", [entry.to_dict() for entry in entries.items])), 200
+        
         entries = WaitlistEntry.query.order_by(
             WaitlistEntry.signed_up_at.desc()
         ).paginate(
@@ -158,18 +172,13 @@ def get_waitlist_entries():
 def export_waitlist():
     """Export waitlist as CSV (for admin)."""
     try:
-        entries = WaitlistEntry.query.order_by(WaitlistEntry.signed_up_at.desc()).all()
-        
-        # Create CSV content
-        csv_content = "email,signed_up_at,status,ip_address\n"
-        for entry in entries:
-            csv_content += f"{entry.email},{entry.signed_up_at.isoformat()},{entry.status},{entry.ip_address or ''}\n"
-        
-        from flask import Response
-        return Response(
-            csv_content,
-            mimetype="text/csv",
-            headers={"Content-disposition": "attachment; filename=waitlist_export.csv"}
+        return csv_response(
+            'waitlist_export.csv',
+            ['email', 'signed_up_at', 'status', 'ip_address'],
+            select(
+                WaitlistEntry.email, WaitlistEntry.signed_up_at,
+                WaitlistEntry.status, WaitlistEntry.ip_address
+            ).order_by(WaitlistEntry.signed_up_at.desc())
         )
         
     except Exception as e:
@@ -204,6 +213,7 @@ def test_email():
             message = f"Admin notification sent for {email}"
         else:
             return jsonify({"error": "Invalid email type. Use 'welcome' or 'admin'"}), 400
+        db.session.commit()
         
         return jsonify({
             "success": success,
@@ -0,0 +1,58 @@
+"""Flask CLI commands."""
+import click
+from flask import Flask
+
+from app.extensions import db
+
+
+def register_commands(app: Flask):
+    """Register custom ``flask`` CLI commands."""
+
+    @app.cli.command('reconcile-task-stats')
+    @click.option('--project-id', 'project_ids', type=int, multiple=True,
+                  help='Only rebuild these projects (repeatable). Defaults to all.')
+    def reconcile_task_stats(project_ids):
+        """Rebuild project_task_stats counters from the tasks table."""
+        from app.models.project_task_stats import ProjectTaskStats
+
+        ProjectTaskStats.rebuild(project_ids or None)
+        db.session.commit()
+        scope = ', '.join(str(pid) for pid in project_ids) if project_ids else 'all projects'
+        click.echo(f'Rebuilt task stats for {scope}')
+
+    @app.cli.command('send-queued-email')
+    @click.option('--once', is_flag=True, help='Deliver one batch of due emails and exit.')
+    def send_queued_email(once):
+        """Deliver emails from the outbox (runs until interrupted)."""
+        from app.services.email_outbox import OutboxSender
+
+        sender = OutboxSender(app)
+        try:
+            if once:
+                click.echo(f'Email outbox: {sender.run_once()}')
+            else:
+                click.echo('Delivering queued email, press Ctrl+C to stop')
+                sender.run_forever()
+        finally:
+            sender.shutdown()
+
+    @app.cli.command('generate-recurring-tasks')
+    @click.option('--chunk-size', default=500, show_default=True,
+                  help='Templates loaded and inserted per transaction.')
+    def generate_recurring_tasks(chunk_size):
+        """Create tasks for all missed occurrences of active recurring templates."""
+        from app.services.recurring_generation import generate_due_tasks
+
+        stats = generate_due_tasks(chunk_size=chunk_size)
+        click.echo(
+            f"Generated {stats['created']} tasks from {stats['templates']} templates "
+            f"({stats['deactivated']} deactivated)"
+        )
+
+    @app.cli.command('index-upcoming-occurrences')
+    def index_upcoming_occurrences():
+        """Extend the upcoming_occurrences index to the configured horizon."""
+        from app.models.upcoming_occurrence import UpcomingOccurrence
+
+        indexed = UpcomingOccurrence.extend()
+        click.echo(f'Indexed upcoming occurrences for {indexed} templates')
@@ -23,10 +23,25 @@ class Config:
     if database_url.startswith('postgres://'):
         database_url = database_url.replace('postgres://', 'postgresql://', 1)
     SQLALCHEMY_DATABASE_URI = database_url
+    # Connection pool per process (see app/db_pool.py)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    # Query the database while the app is created; off so workers boot without
+    # waiting on it (GET /ready reports connectivity)
+    STARTUP_DB_CHECK = os.environ.get('STARTUP_DB_CHECK', 'false').lower() == 'true'
     
     # Redis/Cache
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     USE_REDIS = os.environ.get('USE_REDIS', 'false').lower() == 'true'
+    # Seconds to cache a user's team memberships across requests (0 disables)
+    AUTHZ_CACHE_TTL = int(os.environ.get('AUTHZ_CACHE_TTL', 0))
+    # Seconds to cache dashboard/board responses (see app/services/response_cache.py);
+    # off by default without Redis since the simple cache is per process
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60 if USE_REDIS else 0))
     
     # CORS
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173,http://localhost:3000,http://localhost:3001,https://granula.netlify.app').split(',')
@@ -39,6 +54,10 @@ class Config:
     )
     RATELIMIT_HEADERS_ENABLED = True
     
+    # Access logging (see app/request_logging.py)
+    REQUEST_LOG_LEVEL = os.environ.get('REQUEST_LOG_LEVEL', 'INFO')
+    REQUEST_LOG_SAMPLE_RATE = float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', 1.0))
+    
     # Mail
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -48,6 +67,22 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'hello@granula.app')
     
+    # Email outbox (see app/services/email_outbox.py). 'thread' runs a sender in
+    # each server process; 'off' leaves delivery to `flask send-queued-email`.
+    EMAIL_OUTBOX_SENDER = os.environ.get('EMAIL_OUTBOX_SENDER', 'thread')
+    EMAIL_OUTBOX_WORKERS = int(os.environ.get('EMAIL_OUTBOX_WORKERS', 4))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 100))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+    EMAIL_OUTBOX_BACKOFF_SECONDS = float(os.environ.get('EMAIL_OUTBOX_BACKOFF_SECONDS', 30))
+    EMAIL_OUTBOX_POLL_INTERVAL = float(os.environ.get('EMAIL_OUTBOX_POLL_INTERVAL', 5))
+    # Compile every email template while the app is created instead of on first
+    # render; gunicorn.conf.py turns this on with preload_app, so the master
+    # compiles them once for all workers
+    EMAIL_TEMPLATES_PRELOAD = os.environ.get('EMAIL_TEMPLATES_PRELOAD', 'false').lower() == 'true'
+    
+    # Days of recurring task occurrences kept in the upcoming_occurrences index
+    RECURRENCE_HORIZON_DAYS = int(os.environ.get('RECURRENCE_HORIZON_DAYS', 30))
+    
     # Admin email settings
     ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'admin@granula.app')
     SUPPORT_EMAIL = os.environ.get('SUPPORT_EMAIL', 'support@granula.app')
@@ -78,7 +113,8 @@ class TestingConfig(Config):
     """Testing configuration."""
     DEBUG = False
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    EMAIL_OUTBOX_SENDER = 'off'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
     WTF_CSRF_ENABLED = False
 
 
@@ -87,6 +123,11 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     # Override with production values from environment
+    
+    # 4 workers share the Postgres connection limit, and Railway's proxy
+    # closes idle connections, so cap overflow and recycle well before that
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))
 
 
 config_by_name = {
@@ -0,0 +1,111 @@
+"""Database connection pool configuration and statistics.
+
+``init_db_pool`` turns the ``DB_*`` settings into ``SQLALCHEMY_ENGINE_OPTIONS``
+before Flask-SQLAlchemy creates the engine, so each gunicorn worker gets a
+bounded ``QueuePool`` that tests connections on checkout and replaces them
+before the server (or Railway's proxy) drops them while idle. A sync worker
+serves one request at a time next to the email outbox threads, so a handful
+of pooled connections per process covers it.
+
+In-memory SQLite (the test config) keeps SQLAlchemy's single-connection pool,
+which takes none of these options.
+
+Configuration:
+    DB_POOL_SIZE: Connections kept open per process (default 5)
+    DB_MAX_OVERFLOW: Extra connections opened under load and closed again when
+        returned (default 10, 5 in production)
+    DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE: Replace connections older than this many seconds
+        (default 1800, 300 in production)
+    DB_POOL_PRE_PING: Test each connection on checkout (default true)
+    DB_STATEMENT_TIMEOUT_MS: PostgreSQL ``statement_timeout`` for web workers,
+        0 disables (default 30000). gunicorn's ``post_worker_init`` hook calls
+        ``enable_statement_timeout``, so migrations and ``flask`` commands
+        such as ``reconcile-task-stats`` keep running without a limit.
+
+An explicit ``SQLALCHEMY_ENGINE_OPTIONS`` in the config takes precedence.
+"""
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+# Connections opened and closed by pools in this process
+_counters = {'opened': 0, 'closed': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name):
+    def listener(*args):
+        with _counters_lock:
+            _counters[name] += 1
+    return listener
+
+
+_count_opened = _count('opened')
+_count_closed = _count('closed')
+
+
+def engine_options(config) -> dict:
+    """``create_engine`` keyword arguments for the configured database."""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+    return options
+
+
+def init_db_pool(app):
+    """Set the engine options and start counting pool connections."""
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    if not event.contains(Pool, 'connect', _count_opened):
+        event.listen(Pool, 'connect', _count_opened)
+        event.listen(Pool, 'close', _count_closed)
+        event.listen(Pool, 'close_detached', _count_closed)
+
+
+def enable_statement_timeout(engine, timeout_ms):
+    """Set ``statement_timeout`` on every connection this process opens from now on.
+
+    Connections already in the pool are discarded so none escape the limit.
+    """
+    timeout_ms = int(timeout_ms)
+    if engine.dialect.name != 'postgresql' or not timeout_ms:
+        return
+
+    def set_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET statement_timeout = {timeout_ms}')
+        cursor.close()
+        # Commit so the pool's reset-on-return rollback keeps the setting
+        dbapi_connection.commit()
+
+    event.listen(engine, 'connect', set_timeout)
+    engine.dispose()
+
+
+def pool_stats(engine) -> dict:
+    """Current pool usage plus connections opened/closed by this process.
+
+    Pooled connections that stay open are reused, so ``opened`` levelling off
+    under steady load means no connection churn.
+    """
+    pool = engine.pool
+    with _counters_lock:
+        stats = {'pool': type(pool).__name__, **_counters}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    return stats
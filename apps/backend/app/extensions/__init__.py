@@ -1,4 +1,5 @@
 """Flask extensions initialization."""
+import logging
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
@@ -17,23 +18,24 @@ limiter = Limiter(key_func=get_remote_address)
 cache = Cache()
 oauth = OAuth()
 
+logger = logging.getLogger(__name__)
+
 
 def init_extensions(app):
     """Initialize Flask extensions."""
-    print(f"Initializing extensions for app: {app.name}", flush=True)
     db.init_app(app)
     migrate.init_app(app, db)
     
-    # Test database connection
-    with app.app_context():
-        try:
-            from sqlalchemy import text
-            result = db.session.execute(text('SELECT 1'))
-            print(f"DATABASE CONNECTION: SUCCESS - {result.fetchone()}", flush=True)
-        except Exception as db_error:
-            print(f"DATABASE CONNECTION FAILED: {db_error}", flush=True)
+    # Connectivity is checked by /ready; opt in to a blocking check at startup
+    if app.config.get('STARTUP_DB_CHECK'):
+        with app.app_context():
+            try:
+                from sqlalchemy import text
+                db.session.execute(text('SELECT 1'))
+                logger.info("Database connection: OK")
+            except Exception as db_error:
+                logger.error(f"Database connection failed: {db_error}")
     jwt.init_app(app)
-    print(f"JWT initialized with config: {app.config.get('JWT_SECRET_KEY', 'NOT_SET')[:10]}...", flush=True)
     
     # Add JWT error handlers with debugging
     @jwt.expired_token_loader
@@ -1,5 +1,6 @@
 """Department and UserDepartment models."""
 from datetime import datetime
+from typing import Dict, Iterable, Optional
 from app.extensions import db
 
 
@@ -24,7 +25,31 @@ class Department(db.Model):
     # Relationships
     members = db.relationship('UserDepartment', backref='department', cascade='all, delete-orphan')
     
-    def to_dict(self) -> dict:
+    @classmethod
+    def member_counts(cls, department_ids: Iterable[int]) -> Dict[int, int]:
+        """Member count per department id, from one grouped COUNT.
+
+        Departments without members are left out of the mapping.
+        """
+        department_ids = set(department_ids)
+        if not department_ids:
+            return {}
+        rows = (
+            db.session.query(UserDepartment.department_id, db.func.count(UserDepartment.id))
+            .filter(UserDepartment.department_id.in_(department_ids))
+            .group_by(UserDepartment.department_id)
+        )
+        return dict(rows.all())
+    
+    def to_dict(self, member_count: Optional[int] = None) -> dict:
+        """Serialize the department.
+
+        Args:
+            member_count: Precomputed member count (e.g. from
+                ``Department.member_counts``), used instead of a COUNT query
+        """
+        if member_count is None:
+            member_count = Department.member_counts([self.id]).get(self.id, 0) if self.id is not None else 0
         return {
             'id': self.id,
             'name': self.name,
@@ -32,7 +57,7 @@ class Department(db.Model):
             'team_id': self.team_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'member_count': len(self.members),
+            'member_count': member_count,
         }
     
     def __repr__(self):
@@ -0,0 +1,49 @@
+"""Outgoing email outbox model."""
+from datetime import datetime
+from app.extensions import db
+
+
+class EmailOutbox(db.Model):
+    """A rendered email waiting to be delivered by the outbox sender."""
+
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipients = db.Column(db.JSON, nullable=False)  # List of addresses
+    sender = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(998), nullable=False)
+    html = db.Column(db.Text, nullable=True)
+    body = db.Column(db.Text, nullable=True)
+
+    # Delivery state
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    claimed_by = db.Column(db.String(64), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('idx_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+        db.Index('idx_email_outbox_claimed_by', 'claimed_by'),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'recipients': self.recipients,
+            'subject': self.subject,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status}>'
@@ -1,5 +1,6 @@
 """Team invitation model."""
 from datetime import datetime, timedelta
+from typing import Optional
 from app.extensions import db
 
 
@@ -63,7 +64,20 @@ class TeamInvitation(db.Model):
         """Mark invitation as revoked."""
         self.status = 'revoked'
     
-    def to_dict(self) -> dict:
+    def to_dict(self, teams: Optional[dict] = None, users: Optional[dict] = None) -> dict:
+        """Serialize the invitation.
+
+        Args:
+            teams: Optional id -> serialized team mapping used instead of
+                serializing ``self.team`` (see ``serialize_invitations``)
+            users: Optional id -> User mapping used instead of lazy-loading
+                the inviter
+        """
+        if teams is None:
+            team = self.team.to_dict() if self.team else None
+        else:
+            team = teams.get(self.team_id)
+        inviter = self.inviter if users is None else users.get(self.invited_by)
         return {
             'id': self.id,
             'email': self.email,
@@ -75,8 +89,8 @@ class TeamInvitation(db.Model):
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
             'accepted_at': self.accepted_at.isoformat() if self.accepted_at else None,
             'is_expired': self.is_expired,
-            'team': self.team.to_dict() if self.team else None,
-            'inviter': self.inviter.to_dict() if self.inviter else None,
+            'team': team,
+            'inviter': inviter.to_dict() if inviter else None,
         }
     
     def __repr__(self):
@@ -1,5 +1,6 @@
 """Project model."""
 from datetime import datetime
+from typing import Optional
 from app.extensions import db
 
 
@@ -28,7 +29,16 @@ class Project(db.Model):
     # Relationships
     creator = db.relationship('User', backref='created_projects')
     
-    def to_dict(self) -> dict:
+    def to_dict(self, task_count: Optional[int] = None) -> dict:
+        """Serialize the project.
+
+        Args:
+            task_count: Precomputed task count (e.g. from ``ProjectTaskStats``).
+                When omitted the tasks are counted with a COUNT query rather
+                than by loading ``self.tasks``.
+        """
+        if task_count is None:
+            task_count = self.count_tasks()
         return {
             'id': self.id,
             'name': self.name,
@@ -40,8 +50,15 @@ class Project(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'task_count': len(self.tasks) if hasattr(self, 'tasks') else 0,
+            'task_count': task_count,
         }
     
+    def count_tasks(self) -> int:
+        """Number of tasks in the project, counted by the database."""
+        if self.id is None:
+            return 0
+        from app.models.task import Task
+        return db.session.query(db.func.count(Task.id)).filter(Task.project_id == self.id).scalar()
+    
     def __repr__(self):
         return f'<Project {self.name}>'
\ No newline at end of file
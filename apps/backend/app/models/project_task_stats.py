@@ -0,0 +1,206 @@
+"""Materialized per-project task counters."""
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm.attributes import get_history
+
+from app.extensions import db
+from app.models.project import Project
+from app.models.task import Task
+
+STATUS_BUCKETS = ('pending', 'in_progress', 'completed', 'cancelled')
+PRIORITY_BUCKETS = ('high', 'medium', 'low')
+COUNTER_COLUMNS = ('total',) + STATUS_BUCKETS + PRIORITY_BUCKETS
+
+
+class ProjectTaskStats(db.Model):
+    """Task counts per project, kept in sync by Task mapper events.
+
+    Dashboards read these counters instead of recounting the tasks table.
+    Writes that bypass the ORM unit of work (bulk mappings, ``Query.update``)
+    must call ``ProjectTaskStats.rebuild`` for the affected projects, and the
+    ``flask reconcile-task-stats`` command rebuilds every row.
+    """
+
+    __tablename__ = 'project_task_stats'
+
+    project_id = db.Column(
+        db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True
+    )
+
+    total = db.Column(db.Integer, default=0, nullable=False)
+
+    # Status buckets
+    pending = db.Column(db.Integer, default=0, nullable=False)
+    in_progress = db.Column(db.Integer, default=0, nullable=False)
+    completed = db.Column(db.Integer, default=0, nullable=False)
+    cancelled = db.Column(db.Integer, default=0, nullable=False)
+
+    # Priority buckets
+    high = db.Column(db.Integer, default=0, nullable=False)
+    medium = db.Column(db.Integer, default=0, nullable=False)
+    low = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    @classmethod
+    def for_project(cls, project_id: int) -> 'ProjectTaskStats':
+        """Return the counters for a project (all zero if it has no row yet)."""
+        stats = cls.query.get(project_id)
+        if stats is None:
+            stats = cls(project_id=project_id, **{column: 0 for column in COUNTER_COLUMNS})
+        return stats
+
+    @classmethod
+    def for_projects(cls, project_ids: Iterable[int]) -> Dict[int, 'ProjectTaskStats']:
+        """Return counters for several projects in one query, keyed by project id."""
+        project_ids = list(project_ids)
+        if not project_ids:
+            return {}
+        rows = cls.query.filter(cls.project_id.in_(project_ids)).all()
+        return {row.project_id: row for row in rows}
+
+    @classmethod
+    def rebuild(cls, project_ids: Optional[Iterable[int]] = None):
+        """Recompute counters from the tasks table (all projects when None)."""
+        _rebuild(db.session.connection(), project_ids)
+
+    def by_status(self) -> dict:
+        return {status: getattr(self, status) for status in STATUS_BUCKETS}
+
+    def by_priority(self) -> dict:
+        return {priority: getattr(self, priority) for priority in PRIORITY_BUCKETS}
+
+    def to_dict(self) -> dict:
+        return {
+            'project_id': self.project_id,
+            'total': self.total,
+            'by_status': self.by_status(),
+            'by_priority': self.by_priority(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f'<ProjectTaskStats {self.project_id}>'
+
+
+def _counts_select(project_ids=None):
+    """SELECT producing one counter row per project from the base tables."""
+    columns = [Project.id, func.count(Task.id)]
+    columns += [func.count(case((Task.status == status, 1))) for status in STATUS_BUCKETS]
+    columns += [func.count(case((Task.priority == priority, 1))) for priority in PRIORITY_BUCKETS]
+    columns.append(func.now())
+    query = select(*columns).select_from(Project).outerjoin(
+        Task, Task.project_id == Project.id
+    ).group_by(Project.id)
+    if project_ids is not None:
+        query = query.where(Project.id.in_(project_ids))
+    return query
+
+
+def _rebuild(connection, project_ids=None):
+    table = ProjectTaskStats.__table__
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        connection.execute(table.delete().where(table.c.project_id.in_(project_ids)))
+    else:
+        connection.execute(table.delete())
+    connection.execute(table.insert().from_select(
+        ['project_id', *COUNTER_COLUMNS, 'updated_at'], _counts_select(project_ids)
+    ))
+
+
+def _bucket_deltas(status, priority, sign: int) -> Dict[str, int]:
+    deltas = {'total': sign}
+    if status in STATUS_BUCKETS:
+        deltas[status] = sign
+    if priority in PRIORITY_BUCKETS:
+        deltas[priority] = deltas.get(priority, 0) + sign
+    return deltas
+
+
+def _apply_deltas(connection, project_id, deltas: Dict[str, int]):
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if project_id is None or not deltas:
+        return
+    table = ProjectTaskStats.__table__
+    values = {column: table.c[column] + delta for column, delta in deltas.items()}
+    values['updated_at'] = datetime.utcnow()
+    result = connection.execute(
+        table.update().where(table.c.project_id == project_id).values(**values)
+    )
+    if result.rowcount == 0:
+        # No counter row yet (e.g. project predates the table); the flushed
+        # task rows are visible on this connection, so count them directly.
+        _rebuild(connection, [project_id])
+
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the prior value on assignment even when the attribute was expired, so
+# the update hook can always tell which buckets a task is leaving.
+for _attribute in (Task.project_id, Task.status, Task.priority):
+    event.listen(_attribute, 'set', _track_previous_value, active_history=True, retval=True)
+
+
+def _previous(target, attribute):
+    history = get_history(target, attribute)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+@event.listens_for(Task, 'after_insert')
+def _task_inserted(mapper, connection, target):
+    _apply_deltas(connection, target.project_id, _bucket_deltas(target.status, target.priority, 1))
+
+
+@event.listens_for(Task, 'after_delete')
+def _task_deleted(mapper, connection, target):
+    _apply_deltas(
+        connection,
+        _previous(target, 'project_id'),
+        _bucket_deltas(_previous(target, 'status'), _previous(target, 'priority'), -1)
+    )
+
+
+@event.listens_for(Task, 'after_update')
+def _task_updated(mapper, connection, target):
+    old_project_id = _previous(target, 'project_id')
+    old_status = _previous(target, 'status')
+    old_priority = _previous(target, 'priority')
+
+    if (old_project_id, old_status, old_priority) == (target.project_id, target.status, target.priority):
+        return
+
+    removed = _bucket_deltas(old_status, old_priority, -1)
+    added = _bucket_deltas(target.status, target.priority, 1)
+    if old_project_id == target.project_id:
+        for column, delta in added.items():
+            removed[column] = removed.get(column, 0) + delta
+        _apply_deltas(connection, target.project_id, removed)
+    else:
+        _apply_deltas(connection, old_project_id, removed)
+        _apply_deltas(connection, target.project_id, added)
+
+
+@event.listens_for(Project, 'after_insert')
+def _project_inserted(mapper, connection, target):
+    connection.execute(ProjectTaskStats.__table__.insert().values(
+        project_id=target.id,
+        updated_at=datetime.utcnow(),
+        **{column: 0 for column in COUNTER_COLUMNS}
+    ))
+
+
+@event.listens_for(Project, 'after_delete')
+def _project_deleted(mapper, connection, target):
+    table = ProjectTaskStats.__table__
+    connection.execute(table.delete().where(table.c.project_id == target.id))
@@ -1,7 +1,8 @@
 """Recurring task model."""
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.extensions import db
 from app.models.task import Task
+from app.services.recurrence import RecurrenceRule
 
 
 class RecurringTask(db.Model):
@@ -20,6 +21,11 @@ class RecurringTask(db.Model):
     recurrence_days = db.Column(db.JSON, default=list)  # For weekly: [1,3,5] = Mon, Wed, Fri
     recurrence_day_of_month = db.Column(db.Integer, nullable=True)  # For monthly: day of the month
     recurrence_end_date = db.Column(db.DateTime, nullable=True)  # When to stop recurring
+    # First occurrence; monthly and yearly series keep its day and month
+    start_date = db.Column(
+        db.DateTime, nullable=True,
+        default=lambda context: context.get_current_parameters().get('next_due_date')
+    )
     
     # Task details
     assigned_to = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -31,6 +37,8 @@ class RecurringTask(db.Model):
     last_generated_date = db.Column(db.DateTime, nullable=True)
     next_due_date = db.Column(db.DateTime, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
+    # Upcoming occurrences are materialized up to here (see UpcomingOccurrence)
+    indexed_until = db.Column(db.DateTime, nullable=True)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -46,18 +54,8 @@ class RecurringTask(db.Model):
     def calculate_next_due_date(self, from_date=None):
         """Calculate the next due date based on recurrence settings."""
         base_date = from_date or self.next_due_date or datetime.utcnow()
-        
-        if self.recurrence_type == 'daily':
-            return base_date + timedelta(days=self.recurrence_interval)
-        elif self.recurrence_type == 'weekly':
-            return base_date + timedelta(weeks=self.recurrence_interval)
-        elif self.recurrence_type == 'monthly':
-            # Add months (approximate with 30 days, can be refined)
-            return base_date + timedelta(days=30 * self.recurrence_interval)
-        elif self.recurrence_type == 'yearly':
-            return base_date + timedelta(days=365 * self.recurrence_interval)
-        
-        return base_date + timedelta(days=1)  # Default to daily
+        # Stepped on the calendar; the end date is left to the caller
+        return RecurrenceRule.for_template(self, start=base_date, until=datetime.max).next_after(base_date)
     
     def generate_task(self):
         """Generate a new task instance from this recurring template."""
@@ -65,8 +63,8 @@ class RecurringTask(db.Model):
             return None
             
         if self.recurrence_end_date and datetime.utcnow() > self.recurrence_end_date:
+            # Left for the caller to commit with the rest of its batch
             self.is_active = False
-            db.session.commit()
             return None
         
         task = Task(
@@ -98,6 +96,7 @@ class RecurringTask(db.Model):
             'recurrence_days': self.recurrence_days,
             'recurrence_day_of_month': self.recurrence_day_of_month,
             'recurrence_end_date': self.recurrence_end_date.isoformat() if self.recurrence_end_date else None,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
             'assigned_to': self.assigned_to,
             'project_id': self.project_id,
             'created_by': self.created_by,
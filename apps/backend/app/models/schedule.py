@@ -45,6 +45,11 @@ class Schedule(db.Model):
     project = db.relationship('Project', backref='schedules')
     team = db.relationship('Team', backref='schedules')
     
+    # Calendar windows and free/busy lookups filter on the date
+    __table_args__ = (
+        db.Index('idx_schedule_date_start', 'date', 'start_time'),
+    )
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -98,13 +103,17 @@ class ScheduleParticipant(db.Model):
     schedule = db.relationship('Schedule', backref='participants')
     user = db.relationship('User', backref='schedule_participations')
     
+    __table_args__ = (
+        db.Index('idx_schedule_participant_user', 'user_id'),
+    )
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
             'schedule_id': self.schedule_id,
             'user_id': self.user_id,
             'email': self.email,
-            'name': self.name or (self.user.full_name if self.user else None),
+            'name': self.name or (self.user.email if self.user else None),
             'response_status': self.response_status,
             'is_organizer': self.is_organizer,
             'invited_at': self.invited_at.isoformat() if self.invited_at else None,
@@ -113,5 +122,5 @@ class ScheduleParticipant(db.Model):
         }
     
     def __repr__(self):
-        participant_name = self.name or (self.user.full_name if self.user else self.email)
+        participant_name = self.name or (self.user.email if self.user else self.email)
         return f'<ScheduleParticipant {participant_name} in {self.schedule.title}>'
\ No newline at end of file
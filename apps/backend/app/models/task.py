@@ -46,7 +46,29 @@ class Task(db.Model):
     project = db.relationship('Project', backref='tasks')
     department = db.relationship('Department', backref='tasks')
     
-    def to_dict(self) -> dict:
+    # Indexes matched to the board, personal-task and analytics filters
+    __table_args__ = (
+        db.Index('idx_task_project_status', 'project_id', 'status'),
+        db.Index('idx_task_assignee_status_due', 'assigned_to', 'status', 'due_date'),
+        db.Index('idx_task_project_completed', 'project_id', 'completed_at'),
+        db.Index('idx_task_created_by', 'created_by'),
+        # One task per recurrence occurrence; lets generation skip existing rows
+        db.Index('uq_task_recurring_due', 'recurring_task_id', 'due_date', unique=True),
+    )
+    
+    def to_dict(self, users: Optional[dict] = None) -> dict:
+        """Serialize the task.
+
+        Args:
+            users: Optional id -> User mapping used instead of lazy-loading
+                assignee, creator and approver (see ``serialize_tasks``)
+        """
+        if users is None:
+            assignee, creator, approver = self.assignee, self.creator, self.approver
+        else:
+            assignee = users.get(self.assigned_to)
+            creator = users.get(self.created_by)
+            approver = users.get(self.approved_by)
         return {
             'id': self.id,
             'title': self.title,
@@ -67,9 +89,9 @@ class Task(db.Model):
             'approval_status': self.approval_status,
             'approval_notes': self.approval_notes,
             'recurring_task_id': self.recurring_task_id,
-            'assignee': self.assignee.to_dict() if self.assignee else None,
-            'creator': self.creator.to_dict() if self.creator else None,
-            'approver': self.approver.to_dict() if self.approver else None,
+            'assignee': assignee.to_dict() if assignee else None,
+            'creator': creator.to_dict() if creator else None,
+            'approver': approver.to_dict() if approver else None,
         }
     
     def __repr__(self):
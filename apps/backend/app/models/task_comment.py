@@ -27,6 +27,10 @@ class TaskComment(db.Model):
     user = db.relationship('User', backref='task_comments')
     replies = db.relationship('TaskComment', backref=db.backref('parent', remote_side=[id]), lazy='dynamic')
     
+    __table_args__ = (
+        db.Index('idx_comment_task_created', 'task_id', 'created_at'),
+    )
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
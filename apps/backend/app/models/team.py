@@ -1,5 +1,6 @@
 """Team and TeamMember models."""
 from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
 from app.extensions import db
 
 
@@ -27,7 +28,55 @@ class Team(db.Model):
     departments = db.relationship('Department', backref='team', cascade='all, delete-orphan')
     projects = db.relationship('Project', backref='team', cascade='all, delete-orphan')
     
-    def to_dict(self) -> dict:
+    @classmethod
+    def counts(cls, team_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """``(member_count, department_count)`` per team id, in one query.
+
+        Members and departments are counted by grouped subqueries joined to
+        the teams, so neither collection is loaded.
+        """
+        from app.models.department import Department
+        team_ids = set(team_ids)
+        if not team_ids:
+            return {}
+        members = (
+            db.session.query(TeamMember.team_id, db.func.count(TeamMember.id).label('count'))
+            .filter(TeamMember.team_id.in_(team_ids))
+            .group_by(TeamMember.team_id)
+            .subquery()
+        )
+        departments = (
+            db.session.query(Department.team_id, db.func.count(Department.id).label('count'))
+            .filter(Department.team_id.in_(team_ids))
+            .group_by(Department.team_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(
+                cls.id,
+                db.func.coalesce(members.c.count, 0),
+                db.func.coalesce(departments.c.count, 0),
+            )
+            .outerjoin(members, members.c.team_id == cls.id)
+            .outerjoin(departments, departments.c.team_id == cls.id)
+            .filter(cls.id.in_(team_ids))
+        )
+        return {team_id: (member_count, department_count) for team_id, member_count, department_count in rows}
+    
+    def to_dict(self, member_count: Optional[int] = None, department_count: Optional[int] = None) -> dict:
+        """Serialize the team.
+
+        Args:
+            member_count: Precomputed member count (e.g. from ``Team.counts``)
+            department_count: Precomputed department count
+
+        Counts that are not given are read with ``Team.counts``; the
+        ``members`` and ``departments`` collections are never loaded.
+        """
+        if member_count is None or department_count is None:
+            counted = Team.counts([self.id]).get(self.id, (0, 0)) if self.id is not None else (0, 0)
+            member_count = counted[0] if member_count is None else member_count
+            department_count = counted[1] if department_count is None else department_count
         return {
             'id': self.id,
             'name': self.name,
@@ -35,8 +84,8 @@ class Team(db.Model):
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'member_count': len(self.members),
-            'department_count': len(self.departments),
+            'member_count': member_count,
+            'department_count': department_count,
         }
     
     def __repr__(self):
@@ -59,8 +108,11 @@ class TeamMember(db.Model):
     # Relationships
     user = db.relationship('User', backref='team_memberships')
     
-    # Unique constraint
-    __table_args__ = (db.UniqueConstraint('team_id', 'user_id', name='unique_team_membership'),)
+    # Unique constraint; team_id lookups use its leading column, user_id needs its own index
+    __table_args__ = (
+        db.UniqueConstraint('team_id', 'user_id', name='unique_team_membership'),
+        db.Index('idx_team_member_user', 'user_id'),
+    )
     
     def to_dict(self) -> dict:
         return {
@@ -0,0 +1,169 @@
+"""Materialized upcoming occurrences of recurring task templates."""
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, update
+from sqlalchemy.orm.attributes import get_history, set_committed_value
+
+from app.extensions import db
+from app.models.recurring_task import RecurringTask
+from app.services.recurrence import RecurrenceRule
+
+DEFAULT_HORIZON_DAYS = 30
+# Upper bound on occurrences indexed per template in one pass
+MAX_OCCURRENCES = 1000
+# Template columns that change which occurrences exist or who they belong to
+INDEXED_ATTRIBUTES = (
+    'recurrence_type', 'recurrence_interval', 'recurrence_days', 'recurrence_day_of_month',
+    'recurrence_end_date', 'start_date', 'next_due_date', 'is_active', 'assigned_to', 'project_id', 'created_by',
+)
+
+
+class UpcomingOccurrence(db.Model):
+    """Due dates of active recurring templates over the next few days.
+
+    Each active template has a row for every occurrence from its
+    ``next_due_date`` through its ``indexed_until``, so "what's due this
+    week" and the task generator read an indexed table instead of expanding
+    rules. Template mapper events re-index a template whenever its rule,
+    owner or next due date changes. ``UpcomingOccurrence.extend`` tops up
+    templates whose coverage falls short of the horizon; the generator calls
+    it on every run and ``flask index-upcoming-occurrences`` runs it alone.
+    """
+
+    __tablename__ = 'upcoming_occurrences'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recurring_task_id = db.Column(
+        db.Integer, db.ForeignKey('recurring_tasks.id', ondelete='CASCADE'), nullable=False
+    )
+    due_date = db.Column(db.DateTime, nullable=False)
+
+    # Copied from the template for the per-user and per-project lookups
+    assigned_to = db.Column(db.Integer, nullable=True)
+    project_id = db.Column(db.Integer, nullable=True)
+    created_by = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('uq_upcoming_occurrence', 'recurring_task_id', 'due_date', unique=True),
+        db.Index('idx_upcoming_due', 'due_date'),
+        db.Index('idx_upcoming_assignee_due', 'assigned_to', 'due_date'),
+        db.Index('idx_upcoming_project_due', 'project_id', 'due_date'),
+        db.Index('idx_upcoming_creator_due', 'created_by', 'due_date'),
+    )
+
+    @staticmethod
+    def horizon_end(now: Optional[datetime] = None) -> datetime:
+        """The moment the index should cover up to."""
+        days = DEFAULT_HORIZON_DAYS
+        if has_app_context():
+            days = current_app.config.get('RECURRENCE_HORIZON_DAYS', days)
+        return (now or datetime.utcnow()) + timedelta(days=days)
+
+    @classmethod
+    def extend(cls, until: Optional[datetime] = None, chunk_size: int = 500) -> int:
+        """Index active templates whose coverage ends before ``until``.
+
+        Commits after each chunk. Returns the number of templates indexed.
+        """
+        until = until or cls.horizon_end()
+        indexed = 0
+        last_id = 0
+        while True:
+            templates = RecurringTask.query.filter(
+                RecurringTask.is_active.is_(True),
+                db.or_(RecurringTask.indexed_until.is_(None), RecurringTask.indexed_until < until),
+                RecurringTask.id > last_id
+            ).order_by(RecurringTask.id).limit(chunk_size).all()
+            if not templates:
+                break
+            last_id = templates[-1].id
+            coverage = _index(db.session.connection(), templates, until, replace=False)
+            # By primary key, so the template mapper events do not re-index
+            db.session.execute(update(RecurringTask), [
+                {'id': template_id, 'indexed_until': covered}
+                for template_id, covered in coverage.items()
+            ])
+            db.session.commit()
+            indexed += len(templates)
+        return indexed
+
+    def to_dict(self) -> dict:
+        return {
+            'recurring_task_id': self.recurring_task_id,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'assigned_to': self.assigned_to,
+            'project_id': self.project_id,
+            'created_by': self.created_by,
+        }
+
+    def __repr__(self):
+        return f'<UpcomingOccurrence {self.recurring_task_id} {self.due_date}>'
+
+
+def _index(connection, templates: Iterable[RecurringTask], until: datetime, replace: bool = True):
+    """Write index rows for ``templates`` up to ``until``.
+
+    With ``replace`` the templates' rows are rebuilt from ``next_due_date``;
+    otherwise only occurrences after each template's ``indexed_until`` are
+    added. Returns ``{template id: new indexed_until}``.
+    """
+    table = UpcomingOccurrence.__table__
+    templates = list(templates)
+    if replace and templates:
+        connection.execute(table.delete().where(
+            table.c.recurring_task_id.in_([template.id for template in templates])
+        ))
+
+    rows = []
+    coverage = {}
+    for template in templates:
+        coverage[template.id] = until
+        if not template.is_active or template.next_due_date is None:
+            continue
+        after = None if replace else template.indexed_until
+        if after is not None and after < template.next_due_date:
+            after = None
+        due_dates = list(islice(
+            RecurrenceRule.for_template(template).occurrences(after=after, before=until),
+            MAX_OCCURRENCES
+        ))
+        if len(due_dates) == MAX_OCCURRENCES:
+            # Capped: the next pass continues after the last indexed date
+            coverage[template.id] = due_dates[-1]
+        rows.extend({
+            'recurring_task_id': template.id,
+            'due_date': due_date,
+            'assigned_to': template.assigned_to,
+            'project_id': template.project_id,
+            'created_by': template.created_by,
+        } for due_date in due_dates)
+    if rows:
+        connection.execute(table.insert(), rows)
+    return coverage
+
+
+def _reindex(connection, template: RecurringTask):
+    covered = _index(connection, [template], UpcomingOccurrence.horizon_end())[template.id]
+    table = RecurringTask.__table__
+    connection.execute(table.update().where(table.c.id == template.id).values(indexed_until=covered))
+    set_committed_value(template, 'indexed_until', covered)
+
+
+@event.listens_for(RecurringTask, 'after_insert')
+def _template_inserted(mapper, connection, target):
+    _reindex(connection, target)
+
+
+@event.listens_for(RecurringTask, 'after_update')
+def _template_updated(mapper, connection, target):
+    if any(get_history(target, attribute).has_changes() for attribute in INDEXED_ATTRIBUTES):
+        _reindex(connection, target)
+
+
+@event.listens_for(RecurringTask, 'after_delete')
+def _template_deleted(mapper, connection, target):
+    table = UpcomingOccurrence.__table__
+    connection.execute(table.delete().where(table.c.recurring_task_id == target.id))
@@ -0,0 +1,66 @@
+"""Streaming CSV exports.
+
+Rows are read with ``yield_per`` (a server-side cursor on PostgreSQL) and
+written through the ``csv`` module into a small buffer that is flushed to the
+client every ``CHUNK_SIZE`` bytes, so memory stays flat however many rows are
+exported.
+"""
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+from flask import Response, stream_with_context
+
+from app.extensions import db
+
+CHUNK_SIZE = 64 * 1024
+YIELD_PER = 1000
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence[Any]],
+             chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield CSV text in chunks of roughly ``chunk_size`` characters."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_cell(value) for value in row])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_rows(statement, yield_per: int = YIELD_PER) -> Iterator[Sequence[Any]]:
+    """Execute a column ``select()`` and yield its rows in batches of ``yield_per``."""
+    result = db.session.execute(statement.execution_options(yield_per=yield_per))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def csv_response(filename: str, header: Sequence[str], statement) -> Response:
+    """Stream the rows of ``statement`` to the client as a CSV attachment.
+
+    Args:
+        filename: Download filename for the Content-Disposition header
+        header: Column names for the first line
+        statement: A ``select()`` of plain columns (not ORM entities)
+    """
+    return Response(
+        stream_with_context(iter_csv(header, stream_rows(statement))),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
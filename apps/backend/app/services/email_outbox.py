@@ -0,0 +1,277 @@
+"""Background delivery of queued emails.
+
+Request handlers only insert rows into ``email_outbox`` (see
+``EmailService.queue_email``). An ``OutboxSender`` claims due rows, splits them
+across a small thread pool where each worker sends its share over a single SMTP
+connection, and records the outcome. Failed sends are retried with
+exponential backoff until ``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached.
+
+Rows are claimed with a per-run token, so several processes (e.g. gunicorn
+workers) can run senders against the same table without sending twice. A row
+left in ``sending`` by a process that died is reclaimed after
+``EMAIL_OUTBOX_CLAIM_TIMEOUT`` seconds.
+"""
+import logging
+import random
+import smtplib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db, mail
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Set after a commit that queued mail, so an idle sender wakes up immediately
+_wakeup = threading.Event()
+
+_sender_lock = threading.Lock()
+_sender_thread: Optional[threading.Thread] = None
+
+
+@dataclass
+class OutgoingEmail:
+    """Plain snapshot of an outbox row, safe to hand to a worker thread."""
+
+    id: int
+    recipients: List[str]
+    sender: str
+    subject: str
+    html: Optional[str]
+    body: Optional[str]
+
+    def to_message(self) -> Message:
+        return Message(
+            subject=self.subject,
+            recipients=list(self.recipients),
+            sender=self.sender,
+            html=self.html,
+            body=self.body
+        )
+
+
+def enqueue(recipients: List[str], subject: str, sender: str,
+            html: Optional[str] = None, body: Optional[str] = None) -> EmailOutbox:
+    """Add a rendered email to the outbox in the current session."""
+    entry = EmailOutbox(
+        recipients=list(recipients),
+        sender=sender,
+        subject=subject,
+        html=html,
+        body=body,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(entry)
+    db.session.info['email_outbox_queued'] = True
+    return entry
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_sender(session):
+    if session.info.pop('email_outbox_queued', False):
+        _wakeup.set()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_wakeup(session):
+    session.info.pop('email_outbox_queued', None)
+
+
+# Reconnects allowed per batch after the server drops a connection mid-batch
+MAX_RECONNECTS = 3
+
+
+def send_batch(app, messages: List[OutgoingEmail]) -> Dict[int, Optional[str]]:
+    """Send messages over one SMTP connection; return id -> error (None if sent).
+
+    A connection dropped after delivering at least one message is reopened
+    (up to ``MAX_RECONNECTS`` times). One dropped before delivering anything
+    fails the rest of the batch, so they are retried later with backoff.
+    """
+    results: Dict[int, Optional[str]] = {}
+    remaining = list(messages)
+    reconnects = 0
+    with app.app_context():
+        while remaining:
+            sent = 0
+            try:
+                with mail.connect() as connection:
+                    while remaining:
+                        message = remaining.pop(0)
+                        try:
+                            connection.send(message.to_message())
+                            results[message.id] = None
+                            sent += 1
+                        except smtplib.SMTPServerDisconnected as exc:
+                            results[message.id] = str(exc) or 'Server disconnected'
+                            raise
+                        except Exception as exc:
+                            results[message.id] = str(exc) or exc.__class__.__name__
+            except smtplib.SMTPServerDisconnected as exc:
+                if sent and reconnects < MAX_RECONNECTS:
+                    # Reconnect and carry on with the rest of the chunk
+                    reconnects += 1
+                    continue
+                for message in remaining:
+                    results[message.id] = str(exc) or 'Server disconnected'
+                remaining = []
+            except Exception as exc:
+                # Could not connect; everything left is retried later
+                for message in remaining:
+                    results[message.id] = str(exc) or exc.__class__.__name__
+                remaining = []
+    return results
+
+
+class OutboxSender:
+    """Claims due outbox rows and delivers them through a bounded thread pool."""
+
+    def __init__(self, app):
+        self.app = app
+        config = app.config
+        self.workers = max(1, int(config.get('EMAIL_OUTBOX_WORKERS', 4)))
+        self.batch_size = max(1, int(config.get('EMAIL_OUTBOX_BATCH_SIZE', 100)))
+        self.max_attempts = int(config.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+        self.backoff_base = float(config.get('EMAIL_OUTBOX_BACKOFF_SECONDS', 30))
+        self.backoff_max = float(config.get('EMAIL_OUTBOX_BACKOFF_MAX_SECONDS', 3600))
+        self.claim_timeout = float(config.get('EMAIL_OUTBOX_CLAIM_TIMEOUT', 600))
+        self.poll_interval = float(config.get('EMAIL_OUTBOX_POLL_INTERVAL', 5))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='email-outbox')
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before the next attempt: exponential with +/-20% jitter."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    def _claim(self) -> List[EmailOutbox]:
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        claimable = or_(
+            and_(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now),
+            and_(
+                EmailOutbox.status == 'sending',
+                EmailOutbox.claimed_at < now - timedelta(seconds=self.claim_timeout)
+            )
+        )
+        due_ids = db.session.execute(
+            select(EmailOutbox.id).where(claimable)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(self.batch_size)
+        ).scalars().all()
+        if not due_ids:
+            db.session.rollback()
+            return []
+
+        # Re-check the condition so rows another sender claimed meanwhile are skipped
+        db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due_ids), claimable)
+            .values(status='sending', claimed_by=token, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return EmailOutbox.query.filter_by(claimed_by=token, status='sending').all()
+
+    def _record(self, entries: List[EmailOutbox], results: Dict[int, Optional[str]]) -> Dict[str, int]:
+        now = datetime.utcnow()
+        stats = {'sent': 0, 'retrying': 0, 'failed': 0}
+        for entry in entries:
+            error = results.get(entry.id, 'Not attempted')
+            entry.attempts += 1
+            entry.claimed_by = None
+            entry.claimed_at = None
+            if error is None:
+                entry.status = 'sent'
+                entry.sent_at = now
+                entry.last_error = None
+                stats['sent'] += 1
+            elif entry.attempts >= self.max_attempts:
+                entry.status = 'failed'
+                entry.last_error = error
+                stats['failed'] += 1
+            else:
+                entry.status = 'pending'
+                entry.next_attempt_at = now + self.backoff(entry.attempts)
+                entry.last_error = error
+                stats['retrying'] += 1
+        db.session.commit()
+        return stats
+
+    def run_once(self) -> Dict[str, int]:
+        """Deliver one batch of due emails and return counts by outcome."""
+        with self.app.app_context():
+            entries = self._claim()
+            if not entries:
+                return {'claimed': 0, 'sent': 0, 'retrying': 0, 'failed': 0}
+
+            messages = [
+                OutgoingEmail(e.id, e.recipients, e.sender, e.subject, e.html, e.body)
+                for e in entries
+            ]
+            chunks = [messages[i::self.workers] for i in range(self.workers)]
+            results: Dict[int, Optional[str]] = {}
+            for chunk_results in self._pool.map(
+                lambda chunk: send_batch(self.app, chunk), [c for c in chunks if c]
+            ):
+                results.update(chunk_results)
+
+            stats = self._record(entries, results)
+            stats['claimed'] = len(entries)
+            if stats['retrying'] or stats['failed']:
+                logger.warning(f"Email outbox batch: {stats}")
+            return stats
+
+    def run_forever(self, stop: Optional[threading.Event] = None):
+        """Deliver due emails until ``stop`` is set, sleeping between empty polls."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                stats = self.run_once()
+            except Exception:
+                logger.exception('Email outbox sender failed')
+                stats = {'claimed': 0}
+            if stats['claimed'] < self.batch_size:
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def start_background_sender(app) -> threading.Thread:
+    """Start this process's outbox sender thread if it is not running yet."""
+    global _sender_thread
+    with _sender_lock:
+        if _sender_thread is None or not _sender_thread.is_alive():
+            sender = OutboxSender(app)
+            _sender_thread = threading.Thread(
+                target=sender.run_forever, name='email-outbox-sender', daemon=True
+            )
+            _sender_thread.start()
+        return _sender_thread
+
+
+def init_email_outbox(app):
+    """Start the in-process sender on the first request when configured.
+
+    Starting lazily (rather than in ``create_app``) keeps CLI commands from
+    spawning a sender and makes sure each forked server worker gets its own.
+    Set ``EMAIL_OUTBOX_SENDER = 'off'`` when a separate
+    ``flask send-queued-email`` process delivers the outbox instead.
+    """
+    if app.config.get('EMAIL_OUTBOX_SENDER', 'thread') != 'thread':
+        return
+
+    @app.before_request
+    def _ensure_outbox_sender():
+        if _sender_thread is None or not _sender_thread.is_alive():
+            start_background_sender(current_app._get_current_object())
@@ -1,15 +1,65 @@
 """Email service for sending various types of emails."""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from flask import current_app, render_template
+from typing import List, Optional, Dict, Any, Tuple
+from flask import current_app
 from flask_mail import Message
 from app.extensions import mail
+from . import email_outbox
+from .email_templates import get_registry as get_email_templates
 from .token_service import generate_token
 
 
 class EmailService:
     """Service for handling email operations."""
     
+    @staticmethod
+    def _render(template: str, template_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Render the HTML and text versions of an email template."""
+        return get_email_templates().render(template, template_data)
+    
+    @staticmethod
+    def queue_email(
+        to: List[str], 
+        subject: str, 
+        template: str, 
+        template_data: Dict[str, Any] = None,
+        from_email: Optional[str] = None
+    ) -> bool:
+        """
+        Render an email and add it to the outbox for background delivery.
+        
+        The email is added to the current session and does not commit: it is
+        stored (and the sender woken) when the caller commits, together with
+        the caller's own changes, and dropped if the caller rolls back.
+        Delivery happens in the outbox sender with retries.
+        
+        Args:
+            to: List of recipient email addresses
+            subject: Email subject
+            template: Template name (without .html/.txt extension)
+            template_data: Data to pass to the template
+            from_email: Sender email (defaults to MAIL_DEFAULT_SENDER)
+            
+        Returns:
+            bool: True if the email was queued, False otherwise
+        """
+        try:
+            html, body = EmailService._render(template, template_data or {})
+            email_outbox.enqueue(
+                recipients=to,
+                subject=subject,
+                sender=from_email or current_app.config['MAIL_DEFAULT_SENDER'],
+                html=html,
+                body=body
+            )
+            return True
+        except Exception as e:
+            current_app.logger.error(f"Failed to queue email: {e}")
+            return False
+    
     @staticmethod
     def send_email(
         to: List[str], 
@@ -46,15 +96,7 @@ class EmailService:
             )
             
             # Render templates
-            try:
-                msg.html = render_template(f'email/{template}.html', **template_data)
-            except Exception as e:
-                current_app.logger.warning(f"Could not render HTML template {template}.html: {e}")
-                
-            try:
-                msg.body = render_template(f'email/{template}.txt', **template_data)
-            except Exception as e:
-                current_app.logger.warning(f"Could not render text template {template}.txt: {e}")
+            msg.html, msg.body = EmailService._render(template, template_data)
                 
             # Send email
             if current_app.config.get('MAIL_SUPPRESS_SEND', False):
@@ -79,14 +121,14 @@ class EmailService:
             signed_up_at: When they signed up
             
         Returns:
-            bool: True if sent successfully
+            bool: True if queued successfully
         """
         template_data = {
             'email': email,
             'signed_up_at': signed_up_at.strftime('%B %d, %Y at %I:%M %p UTC')
         }
         
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject="🎉 Welcome to the Granula waitlist!",
             template="waitlist_welcome",
@@ -116,7 +158,7 @@ class EmailService:
             recent_signups: Recent signups count
             
         Returns:
-            bool: True if sent successfully
+            bool: True if queued successfully
         """
         admin_email = current_app.config.get('ADMIN_EMAIL')
         if not admin_email:
@@ -134,7 +176,7 @@ class EmailService:
             'admin_url': current_app.config.get('BASE_URL', 'https://granula.app') + '/admin/waitlist'
         }
         
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[admin_email],
             subject=f"🎯 New Granula waitlist signup: {user_email}",
             template="admin_new_signup",
@@ -147,7 +189,7 @@ class EmailService:
         token = generate_token({"email": email}, purpose="verify_email", expires_in=timedelta(hours=24))
         verify_url = f"{current_app.config.get('BASE_URL', 'http://localhost:5000')}/api/auth/verify-email?token={token}"
         template_data = {'email': email, 'verify_url': verify_url}
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject="Verify your Granula account",
             template="verify_email",
@@ -157,7 +199,7 @@ class EmailService:
     @staticmethod
     def send_verified_welcome(email: str) -> bool:
         """Send a welcome email after verification."""
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject="Welcome to Granula 🎉",
             template="welcome_verified",
@@ -167,7 +209,7 @@ class EmailService:
     @staticmethod
     def send_login_otp(email: str, code: str) -> bool:
         """Send a one-time passcode to the user's email."""
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject="Your Granula login code",
             template="otp_code",
@@ -179,7 +221,7 @@ class EmailService:
         """Send a password reset link to the user."""
         token = generate_token({"email": email}, purpose="reset_password", expires_in=timedelta(hours=1))
         reset_url = f"{current_app.config.get('FRONTEND_URL', 'http://localhost:3000')}/reset-password?token={token}"
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject="Reset your Granula password",
             template="password_reset",
@@ -209,7 +251,7 @@ class EmailService:
             expires_at: When the invitation expires
             
         Returns:
-            bool: True if sent successfully
+            bool: True if queued successfully
         """
         template_data = {
             'email': email,
@@ -222,7 +264,7 @@ class EmailService:
             'base_url': current_app.config.get('BASE_URL', 'https://granula.app')
         }
         
-        return EmailService.send_email(
+        return EmailService.queue_email(
             to=[email],
             subject=f"You're invited to join {team_name} on Granula",
             template="team_invitation",
@@ -235,40 +277,86 @@ class EmailService:
         subject: str,
         template: str,
         template_data: Dict[str, Any] = None,
-        batch_size: int = 50
-    ) -> Dict[str, int]:
+        batch_size: int = 50,
+        recipient_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Send bulk emails in batches.
         
+        The template is rendered once per distinct context rather than once per
+        recipient, and each batch is sent over a single SMTP connection. Batches
+        run concurrently on a bounded thread pool.
+        
         Args:
             recipients: List of email addresses
             subject: Email subject
             template: Template name
-            template_data: Template data
-            batch_size: Number of emails per batch
+            template_data: Template data shared by all recipients
+            batch_size: Number of emails per batch (and per SMTP connection)
+            recipient_data: Optional per-recipient data merged over template_data
+            max_workers: Concurrent batches (defaults to EMAIL_OUTBOX_WORKERS)
             
         Returns:
-            dict: Statistics about sending (sent, failed counts)
+            dict: Statistics about sending (sent, failed counts, per-batch throughput)
         """
-        sent = 0
-        failed = 0
+        template_data = template_data or {}
+        recipient_data = recipient_data or {}
+        sender = current_app.config['MAIL_DEFAULT_SENDER']
         
-        # Process in batches
-        for i in range(0, len(recipients), batch_size):
-            batch = recipients[i:i + batch_size]
-            
-            for email in batch:
-                success = EmailService.send_email(
-                    to=[email],
-                    subject=subject,
-                    template=template,
-                    template_data=template_data or {}
-                )
-                
-                if success:
-                    sent += 1
-                else:
-                    failed += 1
+        # Render once per distinct context
+        rendered: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        messages = []
+        for index, email in enumerate(recipients):
+            context = {**template_data, **recipient_data.get(email, {})}
+            key = json.dumps(context, sort_keys=True, default=str)
+            if key not in rendered:
+                rendered[key] = EmailService._render(template, context)
+            html, body = rendered[key]
+            messages.append(email_outbox.OutgoingEmail(index, [email], sender, subject, html, body))
+        
+        batch_size = max(1, batch_size)
+        batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+        workers = max_workers or current_app.config.get('EMAIL_OUTBOX_WORKERS', 4)
+        app = current_app._get_current_object()
         
-        current_app.logger.info(f"Bulk email completed: {sent} sent, {failed} failed")
-        return {"sent": sent, "failed": failed}
+        def send(numbered_batch):
+            number, batch = numbered_batch
+            started = time.perf_counter()
+            results = email_outbox.send_batch(app, batch)
+            elapsed = time.perf_counter() - started
+            failed = sum(1 for error in results.values() if error is not None)
+            return {
+                'batch': number,
+                'size': len(batch),
+                'sent': len(batch) - failed,
+                'failed': failed,
+                'seconds': round(elapsed, 3),
+                'per_second': round(len(batch) / elapsed, 1) if elapsed else None,
+            }
+        
+        started = time.perf_counter()
+        batch_stats = []
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as pool:
+                for stats in pool.map(send, enumerate(batches)):
+                    batch_stats.append(stats)
+                    current_app.logger.info(
+                        f"Bulk email batch {stats['batch']}: {stats['sent']}/{stats['size']} sent "
+                        f"in {stats['seconds']}s ({stats['per_second']}/s)"
+                    )
+        elapsed = time.perf_counter() - started
+        
+        sent = sum(stats['sent'] for stats in batch_stats)
+        failed = sum(stats['failed'] for stats in batch_stats)
+        current_app.logger.info(
+            f"Bulk email completed: {sent} sent, {failed} failed, "
+            f"{len(rendered)} renders, {len(batches)} batches in {elapsed:.2f}s"
+        )
+        return {
+            "sent": sent,
+            "failed": failed,
+            "renders": len(rendered),
+            "seconds": round(elapsed, 3),
+            "batches": batch_stats,
+        }
@@ -0,0 +1,127 @@
+"""Compiled email templates.
+
+Each template under ``templates/email`` is compiled on its first render and
+kept, or all of them when the app is created if ``EMAIL_TEMPLATES_PRELOAD``
+is set (a preloading gunicorn master compiles them once for every worker).
+Rendering an email then skips the Jinja loader search, and a template that does
+not exist (several notifications only ship one of ``.html``/``.txt``, or none)
+is remembered as missing instead of raising and logging on every send.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+from jinja2 import Template, TemplateNotFound
+
+TEMPLATE_DIR = 'email'
+
+
+class EmailTemplateRegistry:
+    """Compiled email templates, known-missing names and render timings."""
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: Dict[str, Template] = {}
+        self._missing = set()
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self.preload_seconds = 0.0
+
+    def preload(self):
+        """Compile every template under ``templates/email``."""
+        started = time.perf_counter()
+        env = self.app.jinja_env
+        for name in env.list_templates(filter_func=lambda n: n.startswith(f'{TEMPLATE_DIR}/')):
+            self._templates[name] = env.get_template(name)
+        self.preload_seconds = time.perf_counter() - started
+
+    def get(self, name: str) -> Optional[Template]:
+        """Return the compiled template, or None if it does not exist."""
+        template = self._templates.get(name)
+        if template is not None:
+            # Keep picking up edits when Jinja auto-reload is on (debug)
+            if self.app.jinja_env.auto_reload and not template.is_up_to_date:
+                template = self._load(name)
+            return template
+        if name in self._missing:
+            return None
+        return self._load(name)
+
+    def _load(self, name: str) -> Optional[Template]:
+        try:
+            template = self.app.jinja_env.get_template(name)
+        except TemplateNotFound:
+            with self._lock:
+                self._missing.add(name)
+            self.app.logger.warning(f"Email template {name} not found; sending without it")
+            return None
+        with self._lock:
+            self._missing.discard(name)
+            self._templates[name] = template
+        return template
+
+    def render(self, template: str, data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Render the HTML and text versions of ``template``; missing parts are None."""
+        started = time.perf_counter()
+        context = dict(data)
+        # Same context processors as flask.render_template
+        self.app.update_template_context(context)
+        html = self._render_one(f'{TEMPLATE_DIR}/{template}.html', context)
+        body = self._render_one(f'{TEMPLATE_DIR}/{template}.txt', context)
+        self._record(template, time.perf_counter() - started)
+        return html, body
+
+    def _render_one(self, name: str, context: Dict[str, Any]) -> Optional[str]:
+        compiled = self.get(name)
+        if compiled is None:
+            return None
+        try:
+            return compiled.render(context)
+        except Exception as e:
+            self.app.logger.warning(f"Could not render template {name}: {e}")
+            return None
+
+    def _record(self, template: str, elapsed: float):
+        with self._lock:
+            timing = self._timings.setdefault(template, {'renders': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            timing['renders'] += 1
+            timing['total_seconds'] += elapsed
+            timing['max_seconds'] = max(timing['max_seconds'], elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Render counts and timings per template, plus what is cached and missing."""
+        with self._lock:
+            timings = {
+                name: {
+                    'renders': t['renders'],
+                    'avg_ms': round(t['total_seconds'] * 1000 / t['renders'], 3),
+                    'max_ms': round(t['max_seconds'] * 1000, 3),
+                    'total_ms': round(t['total_seconds'] * 1000, 3),
+                }
+                for name, t in self._timings.items()
+            }
+            return {
+                'compiled': sorted(self._templates),
+                'missing': sorted(self._missing),
+                'preload_ms': round(self.preload_seconds * 1000, 3),
+                'templates': timings,
+            }
+
+
+def get_registry() -> EmailTemplateRegistry:
+    """The registry of the current app, created on first use if needed."""
+    registry = current_app.extensions.get('email_templates')
+    if registry is None:
+        registry = current_app.extensions['email_templates'] = EmailTemplateRegistry(
+            current_app._get_current_object()
+        )
+    return registry
+
+
+def init_email_templates(app):
+    """Register the template registry; compile every template now if configured."""
+    registry = EmailTemplateRegistry(app)
+    if app.config.get('EMAIL_TEMPLATES_PRELOAD'):
+        registry.preload()
+    app.extensions['email_templates'] = registry
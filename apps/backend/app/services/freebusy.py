@@ -0,0 +1,126 @@
+"""Free/busy lookups and conflict detection for schedules.
+
+``BusyIndex.load`` reads every schedule the given users take part in over a
+window with one query (participants joined to schedules, cancelled events
+and declined invitations left out), expands recurring series with
+``iter_occurrences`` and keeps one list of intervals per user, sorted by
+start. Overlap checks then bisect into that list instead of scanning it.
+
+Times are compared as stored, like the rest of the calendar; the schedule's
+``timezone`` is not applied.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.schedule import Schedule, ScheduleParticipant
+from app.services.schedule_expansion import in_range, iter_occurrences
+
+# Recurring schedules are checked for conflicts over this many days
+CONFLICT_WINDOW_DAYS = 90
+
+Interval = Tuple[datetime, datetime, int]
+
+
+def occurrence_intervals(schedules, start: date, end: date) -> List[Interval]:
+    """``(start, end, schedule id)`` of each occurrence within ``[start, end]``."""
+    return [
+        (datetime.combine(day, schedule.start_time), datetime.combine(day, schedule.end_time), schedule.id)
+        for day, schedule in iter_occurrences(schedules, start, end)
+    ]
+
+
+class BusyIndex:
+    """Busy intervals per user, sorted by start."""
+
+    def __init__(self, intervals: Dict[int, List[Interval]]):
+        self._intervals = {user_id: sorted(items) for user_id, items in intervals.items()}
+        self._starts = {user_id: [item[0] for item in items] for user_id, items in self._intervals.items()}
+        # Longest interval, so a bisect on start times can find every overlap
+        self._longest = max(
+            (item[1] - item[0] for items in self._intervals.values() for item in items),
+            default=timedelta(0)
+        )
+
+    @classmethod
+    def load(cls, user_ids: Iterable[int], start: date, end: date,
+             exclude_schedule_id: Optional[int] = None) -> 'BusyIndex':
+        """Build the index for ``user_ids`` over the days ``[start, end]``."""
+        user_ids = set(user_ids)
+        intervals = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return cls(intervals)
+
+        query = select(
+            ScheduleParticipant.user_id, Schedule.id, Schedule.date, Schedule.start_time,
+            Schedule.end_time, Schedule.is_recurring, Schedule.recurring_pattern
+        ).join(Schedule, Schedule.id == ScheduleParticipant.schedule_id).where(
+            ScheduleParticipant.user_id.in_(user_ids),
+            ScheduleParticipant.response_status != 'declined',
+            Schedule.status != 'cancelled',
+            in_range(start, end)
+        )
+        if exclude_schedule_id is not None:
+            query = query.where(Schedule.id != exclude_schedule_id)
+
+        attendees = defaultdict(set)
+        schedules = {}
+        for row in db.session.execute(query):
+            attendees[row.id].add(row.user_id)
+            schedules[row.id] = row
+
+        # Expand each schedule once, however many of the users attend it
+        for interval in occurrence_intervals(schedules.values(), start, end):
+            for user_id in attendees[interval[2]]:
+                intervals[user_id].append(interval)
+        return cls(intervals)
+
+    def intervals(self, user_id: int) -> List[Interval]:
+        return self._intervals.get(user_id, [])
+
+    def busy(self, user_id: int) -> List[Tuple[datetime, datetime]]:
+        """The user's busy time as merged, non-overlapping blocks."""
+        blocks = []
+        for start, end, _ in self.intervals(user_id):
+            if blocks and start <= blocks[-1][1]:
+                blocks[-1][1] = max(blocks[-1][1], end)
+            else:
+                blocks.append([start, end])
+        return [(start, end) for start, end in blocks]
+
+    def overlapping(self, user_id: int, start: datetime, end: datetime) -> List[Interval]:
+        """Intervals of the user that overlap ``[start, end)``."""
+        items = self.intervals(user_id)
+        if not items:
+            return []
+        starts = self._starts[user_id]
+        first = bisect_left(starts, start - self._longest)
+        last = bisect_left(starts, end)
+        return [item for item in items[first:last] if item[1] > start]
+
+
+def find_conflicts(schedule: Schedule, user_ids: Iterable[int]) -> List[dict]:
+    """Existing schedules that overlap ``schedule`` for any of ``user_ids``.
+
+    Recurring schedules are checked over their first ``CONFLICT_WINDOW_DAYS``.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    start = schedule.date
+    end = start + timedelta(days=CONFLICT_WINDOW_DAYS) if schedule.is_recurring else start
+    index = BusyIndex.load(user_ids, start, end, exclude_schedule_id=schedule.id)
+
+    conflicts = []
+    for occurrence_start, occurrence_end, _ in occurrence_intervals([schedule], start, end):
+        for user_id in sorted(user_ids):
+            for other_start, other_end, other_id in index.overlapping(user_id, occurrence_start, occurrence_end):
+                conflicts.append({
+                    'user_id': user_id,
+                    'schedule_id': other_id,
+                    'start': other_start.isoformat(),
+                    'end': other_end.isoformat(),
+                })
+    return conflicts
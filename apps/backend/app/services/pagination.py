@@ -0,0 +1,114 @@
+"""Keyset (cursor) pagination for newest-first listings.
+
+``paginate()`` issues a ``COUNT(*)`` over the filtered query for every page and
+uses OFFSET, which gets slower the deeper a client pages. Keyset pagination
+instead seeks past the last row seen using its ``(timestamp, id)`` pair, so
+every page costs the same regardless of position and the count is only run
+when explicitly requested.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+# Largest page a listing endpoint returns
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor that cannot be decoded."""
+
+
+@dataclass
+class KeysetPage:
+    items: List
+    next_cursor: Optional[str]
+    per_page: int
+    total: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_response(self, key: str, items: List) -> dict:
+        """Response body with the serialized ``items`` under ``key``.
+
+        ``total`` is only included when it was requested.
+        """
+        response = {
+            key: items,
+            'per_page': self.per_page,
+            'has_next': self.has_next,
+            'next_cursor': self.next_cursor,
+        }
+        if self.total is not None:
+            response['total'] = self.total
+        return response
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a ``(timestamp, id)`` position as an opaque URL-safe token."""
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by ``encode_cursor``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor('Invalid cursor') from exc
+
+
+def keyset_paginate(query, time_column, id_column, cursor: Optional[str], per_page: int,
+                    include_total: bool = False) -> KeysetPage:
+    """Return one newest-first page of ``query`` positioned after ``cursor``.
+
+    Args:
+        query: Filtered query without ordering
+        time_column: Non-null timestamp column to order by
+        id_column: Primary key column used as the tie-breaker
+        cursor: Token from a previous page's ``next_cursor`` (empty for the first page)
+        per_page: Maximum number of rows to return, clamped to 1..MAX_PER_PAGE
+        include_total: Also run a ``COUNT(*)`` of the unpaginated query
+
+    Raises:
+        InvalidCursor: If ``cursor`` is malformed
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            time_column < timestamp,
+            and_(time_column == timestamp, id_column < row_id)
+        ))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(time_column.desc(), id_column.desc()).limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, time_column.key), getattr(last, id_column.key))
+
+    return KeysetPage(items=items, next_cursor=next_cursor, per_page=per_page, total=total)
+
+
+def paginate_from_args(query, time_column, id_column, args, per_page: int) -> KeysetPage:
+    """``keyset_paginate`` driven by a request's ``cursor`` and ``include_total`` args.
+
+    Raises:
+        InvalidCursor: If the ``cursor`` argument is malformed
+    """
+    include_total = (args.get('include_total') or '').lower() == 'true'
+    return keyset_paginate(query, time_column, id_column, args.get('cursor'), per_page, include_total)
@@ -0,0 +1,155 @@
+"""Calendar-correct recurrence rules.
+
+A ``RecurrenceRule`` describes a series the way an iCalendar RRULE does: a
+frequency, an interval, optional weekdays (weekly) or day of month (monthly)
+and an optional end. Occurrences are produced lazily, so callers take only
+as many as they need. Months and years are stepped on the calendar, and a
+day that does not exist in a month (the 31st, 29 February) falls on that
+month's last day.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from itertools import count, islice
+from typing import Iterable, Iterator, List, Optional
+
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+
+
+def _add_months(year: int, month: int, months: int):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _on_day(year: int, month: int, day: int, at: datetime) -> datetime:
+    day = min(day, calendar.monthrange(year, month)[1])
+    return datetime.combine(date(year, month, day), at.time())
+
+
+class RecurrenceRule:
+    """A recurring series anchored at ``start``.
+
+    Args:
+        frequency: One of ``daily``, ``weekly``, ``monthly``, ``yearly``
+        start: First occurrence; also supplies the time of day
+        interval: Every N days/weeks/months/years
+        weekdays: Weekly only, ISO weekdays (1 = Monday ... 7 = Sunday; 0 is
+            accepted for Sunday). Defaults to the weekday of ``start``
+        day_of_month: Monthly and yearly; defaults to the day of ``start``
+        month: Yearly only; defaults to the month of ``start``
+        until: Last moment an occurrence may fall on
+    """
+
+    def __init__(self, frequency: str, start: datetime, interval: int = 1,
+                 weekdays: Optional[Iterable[int]] = None, day_of_month: Optional[int] = None,
+                 month: Optional[int] = None, until: Optional[datetime] = None):
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"frequency must be one of {', '.join(FREQUENCIES)}")
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError('interval must be a positive integer')
+        self.frequency = frequency
+        self.start = start
+        self.interval = interval
+        self.weekdays = sorted({7 if day == 0 else day for day in weekdays or ()}) or [start.isoweekday()]
+        if any(not 1 <= day <= 7 for day in self.weekdays):
+            raise ValueError('weekdays must be between 1 (Monday) and 7 (Sunday)')
+        self.day_of_month = day_of_month or start.day
+        if not 1 <= self.day_of_month <= 31:
+            raise ValueError('day_of_month must be between 1 and 31')
+        self.month = month or start.month
+        if not 1 <= self.month <= 12:
+            raise ValueError('month must be between 1 and 12')
+        self.until = until
+
+    @classmethod
+    def for_template(cls, template, start: Optional[datetime] = None,
+                     until: Optional[datetime] = None) -> 'RecurrenceRule':
+        """Build the rule of a ``RecurringTask``, starting at its next due date.
+
+        Monthly and yearly series keep the day (and month) of the template's
+        ``start_date``, so stepping on from an occurrence that was moved to
+        the end of a short month returns to the original day afterwards.
+        ``until`` defaults to the template's end date. Unknown recurrence
+        types fall back to daily, as they always have.
+        """
+        frequency = template.recurrence_type if template.recurrence_type in FREQUENCIES else 'daily'
+        anchor = template.start_date or template.next_due_date
+        day_of_month = template.recurrence_day_of_month if frequency == 'monthly' else None
+        if frequency in ('monthly', 'yearly') and anchor is not None:
+            day_of_month = day_of_month or anchor.day
+        return cls(
+            frequency,
+            start or template.next_due_date,
+            interval=template.recurrence_interval or 1,
+            weekdays=template.recurrence_days if frequency == 'weekly' else None,
+            day_of_month=day_of_month,
+            month=anchor.month if frequency == 'yearly' and anchor is not None else None,
+            until=until if until is not None else template.recurrence_end_date,
+        )
+
+    def _first_period(self, after: Optional[datetime]) -> int:
+        """A period index at or before the one containing ``after``, to skip ahead."""
+        if after is None or after <= self.start:
+            return 0
+        start = self.start
+        if self.frequency == 'daily':
+            elapsed = (after - start).days
+        elif self.frequency == 'weekly':
+            elapsed = (after - start).days // 7
+        elif self.frequency == 'monthly':
+            elapsed = (after.year - start.year) * 12 + after.month - start.month
+        else:
+            elapsed = after.year - start.year
+        return max(0, elapsed // self.interval - 1)
+
+    def _candidates(self, first_period: int = 0) -> Iterator[datetime]:
+        """Pattern dates in ascending order, period by period, without bounds."""
+        start = self.start
+        if self.frequency == 'daily':
+            for period in count(first_period):
+                yield start + timedelta(days=period * self.interval)
+        elif self.frequency == 'weekly':
+            monday = start - timedelta(days=start.weekday())
+            for period in count(first_period):
+                week = monday + timedelta(weeks=period * self.interval)
+                for weekday in self.weekdays:
+                    yield week + timedelta(days=weekday - 1)
+        elif self.frequency == 'monthly':
+            for period in count(first_period):
+                year, month = _add_months(start.year, start.month, period * self.interval)
+                yield _on_day(year, month, self.day_of_month, start)
+        else:
+            for period in count(first_period):
+                yield _on_day(start.year + period * self.interval, self.month, self.day_of_month, start)
+
+    def occurrences(self, after: Optional[datetime] = None,
+                    before: Optional[datetime] = None) -> Iterator[datetime]:
+        """Yield occurrences in order, starting with ``start`` itself.
+
+        Args:
+            after: Only occurrences strictly later than this
+            before: Stop at the first occurrence later than this
+        """
+        end = self.until
+        if before is not None and (end is None or before < end):
+            end = before
+        if end is not None and self.start > end:
+            return
+        if after is None or self.start > after:
+            yield self.start
+        for moment in self._candidates(self._first_period(after)):
+            if end is not None and moment > end:
+                return
+            if moment > self.start and (after is None or moment > after):
+                yield moment
+
+    def between(self, start: datetime, end: datetime, limit: Optional[int] = None) -> List[datetime]:
+        """Occurrences within ``[start, end]``, at most ``limit`` of them."""
+        moments = self.occurrences(after=start - timedelta(microseconds=1), before=end)
+        return list(islice(moments, limit))
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """The first occurrence later than ``moment``, or None once the rule has ended."""
+        return next(self.occurrences(after=moment), None)
+
+    def __repr__(self):
+        return f'<RecurrenceRule {self.frequency}/{self.interval} from {self.start.isoformat()}>'
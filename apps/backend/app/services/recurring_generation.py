@@ -0,0 +1,158 @@
+"""Set-based generation of tasks from recurring templates.
+
+The ``upcoming_occurrences`` index is topped up first. Due templates are
+then read in id-ordered chunks, and every indexed occurrence of a chunk up
+to now is inserted with one executemany. The unique
+``(recurring_task_id, due_date)`` index makes inserts of occurrences that
+already exist a no-op, so a run that is interrupted or repeated never
+duplicates tasks. Each chunk commits on its own, together with the
+templates' new ``next_due_date``.
+"""
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.recurring_task import RecurringTask
+from app.models.task import Task
+from app.models.upcoming_occurrence import MAX_OCCURRENCES, UpcomingOccurrence
+from app.services import response_cache
+from app.services.recurrence import RecurrenceRule
+
+CHUNK_SIZE = 500
+
+
+def _indexed_occurrences(template_ids: List[int], now: datetime) -> Dict[int, List[datetime]]:
+    """Due dates up to ``now`` from the index, per template."""
+    due_dates = defaultdict(list)
+    rows = db.session.execute(
+        select(UpcomingOccurrence.recurring_task_id, UpcomingOccurrence.due_date).where(
+            UpcomingOccurrence.recurring_task_id.in_(template_ids),
+            UpcomingOccurrence.due_date <= now
+        ).order_by(UpcomingOccurrence.recurring_task_id, UpcomingOccurrence.due_date)
+    )
+    for template_id, due_date in rows:
+        due_dates[template_id].append(due_date)
+    return due_dates
+
+
+def _insert_new(rows: List[dict]) -> List[int]:
+    """Insert task rows, skipping occurrences that already exist; return new ids."""
+    if not rows:
+        return []
+    table = Task.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statement = pg_insert(table).on_conflict_do_nothing(
+            index_elements=['recurring_task_id', 'due_date']
+        )
+    elif dialect == 'sqlite':
+        statement = sqlite_insert(table).on_conflict_do_nothing()
+    else:
+        existing = set(db.session.execute(
+            select(Task.recurring_task_id, Task.due_date).where(
+                Task.recurring_task_id.in_({row['recurring_task_id'] for row in rows})
+            )
+        ).all())
+        rows = [row for row in rows if (row['recurring_task_id'], row['due_date']) not in existing]
+        if not rows:
+            return []
+        statement = table.insert()
+    return db.session.execute(statement.returning(table.c.id), rows).scalars().all()
+
+
+def generate_due_tasks(now: Optional[datetime] = None, chunk_size: int = CHUNK_SIZE,
+                       task_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    """Create tasks for every missed occurrence of every active template.
+
+    Args:
+        now: Generate occurrences due up to this time (default: now)
+        chunk_size: Templates loaded and inserted per transaction
+        task_ids: Optional list the ids of the created tasks are appended to
+
+    Returns:
+        dict: templates processed, tasks created, templates deactivated
+    """
+    now = now or datetime.utcnow()
+    UpcomingOccurrence.extend(UpcomingOccurrence.horizon_end(now), chunk_size=chunk_size)
+
+    stats = {'templates': 0, 'created': 0, 'deactivated': 0}
+    last_id = 0
+    while True:
+        templates = RecurringTask.query.filter(
+            RecurringTask.is_active.is_(True),
+            RecurringTask.next_due_date <= now,
+            RecurringTask.id > last_id
+        ).order_by(RecurringTask.id).limit(chunk_size).all()
+        if not templates:
+            break
+        last_id = templates[-1].id
+        indexed = _indexed_occurrences([template.id for template in templates], now)
+
+        rows, changes = [], []
+        for template in templates:
+            due_dates = indexed.get(template.id)
+            if not due_dates:
+                # Not indexed (e.g. written by a bulk statement); expand the rule
+                due_dates = list(islice(
+                    RecurrenceRule.for_template(template).occurrences(before=now), MAX_OCCURRENCES
+                ))
+            for due_date in due_dates:
+                rows.append({
+                    'title': template.title,
+                    'description': template.description,
+                    'priority': template.priority,
+                    'status': 'pending',
+                    'due_date': due_date,
+                    'assigned_to': template.assigned_to,
+                    'project_id': template.project_id,
+                    'created_by': template.created_by,
+                    'department_id': template.department_id,
+                    'recurring_task_id': template.id,
+                    'requires_approval': False,
+                    'created_at': now,
+                    'updated_at': now,
+                })
+            change = {'id': template.id, 'next_due_date': template.next_due_date}
+            if due_dates:
+                change['last_generated_date'] = now
+                change['next_due_date'] = template.calculate_next_due_date(due_dates[-1])
+            if template.recurrence_end_date and change['next_due_date'] > template.recurrence_end_date:
+                change['is_active'] = False
+                stats['deactivated'] += 1
+            changes.append(change)
+
+        created = _insert_new(rows)
+        stats['templates'] += len(templates)
+        stats['created'] += len(created)
+        if task_ids is not None:
+            task_ids.extend(created)
+
+        # Consumed occurrences leave the index. Templates are written by
+        # primary key, which skips the mapper events that would rebuild it.
+        db.session.execute(delete(UpcomingOccurrence).where(
+            UpcomingOccurrence.recurring_task_id.in_([template.id for template in templates]),
+            UpcomingOccurrence.due_date <= now
+        ))
+        db.session.execute(update(RecurringTask), changes)
+
+        team_ids, user_ids = [], set()
+        if created:
+            # The bulk insert skips the Task mapper events
+            project_ids = {t.project_id for t in templates if t.project_id is not None}
+            ProjectTaskStats.rebuild(project_ids)
+            if project_ids:
+                team_ids = db.session.execute(
+                    select(Project.team_id).where(Project.id.in_(project_ids))
+                ).scalars().all()
+            user_ids = {t.assigned_to for t in templates} | {t.created_by for t in templates}
+        db.session.commit()
+        response_cache.invalidate(user_ids, team_ids)
+    return stats
@@ -0,0 +1,213 @@
+"""Per-user response caching for dashboard and board endpoints.
+
+``@cached_response`` stores a view's JSON response in the shared cache under a
+key built from the caller, the URL and the current *versions* of everything
+the caller can see: their own user version and the version of each team they
+belong to. Versions are random tokens kept in the cache. Committing a change to
+a Task, TaskComment, TeamMember, Project, Schedule or ScheduleParticipant
+replaces the tokens of the affected users and teams, so later requests build new keys and the old entries are
+never read again; they simply expire after ``RESPONSE_CACHE_TTL`` seconds.
+
+The ``simple`` cache backend is per process, so a bump in one worker is not
+seen by the others. The TTL therefore defaults to 0 (disabled) unless Redis
+is configured.
+"""
+import hashlib
+import threading
+import uuid
+from functools import wraps
+from typing import Dict, Iterable
+
+from flask import Response, current_app, has_app_context, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from app.authz import get_membership_context
+from app.extensions import cache
+from app.models.project import Project
+from app.models.schedule import Schedule, ScheduleParticipant
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.team import TeamMember
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _version_key(kind: str, ident: int) -> str:
+    return f'respcache:v:{kind}:{ident}'
+
+
+def _count(endpoint: str, outcome: str):
+    with _stats_lock:
+        counters = _stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit and miss counters per endpoint for this process."""
+    with _stats_lock:
+        return {endpoint: dict(counters) for endpoint, counters in _stats.items()}
+
+
+def _current_versions(keys):
+    versions = cache.get_many(*keys)
+    missing = [key for key, version in zip(keys, versions) if version is None]
+    if missing:
+        # Unknown (or evicted) versions start from a fresh token
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, timeout=0)
+        versions = cache.get_many(*keys)
+    return versions
+
+
+def cached_response(view):
+    """Cache a view's 200 responses per user until their data changes.
+
+    Apply below ``@jwt_required()``. The key covers the full path and query
+    string, so the view's own access checks still decide what each user sees.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        ttl = current_app.config.get('RESPONSE_CACHE_TTL', 0)
+        if not ttl:
+            return view(*args, **kwargs)
+
+        user_id = int(get_jwt_identity())
+        version_keys = [_version_key('user', user_id)] + [
+            _version_key('team', team_id)
+            for team_id in sorted(get_membership_context(user_id).team_ids)
+        ]
+        versions = _current_versions(version_keys)
+        digest = hashlib.sha1(
+            '|'.join([request.full_path] + [str(v) for v in versions]).encode()
+        ).hexdigest()
+        key = f'respcache:{request.endpoint}:{user_id}:{digest}'
+
+        cached = cache.get(key)
+        if cached is not None:
+            _count(request.endpoint, 'hits')
+            body, mimetype = cached
+            response = Response(body, mimetype=mimetype)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        _count(request.endpoint, 'misses')
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            cache.set(key, (response.get_data(), response.mimetype), timeout=ttl)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+
+def invalidate(user_ids: Iterable[int] = (), team_ids: Iterable[int] = ()):
+    """Bump the versions of the given users and teams."""
+    if not has_app_context() or not current_app.config.get('RESPONSE_CACHE_TTL', 0):
+        return
+    keys = [_version_key('user', i) for i in set(user_ids) if i is not None]
+    keys += [_version_key('team', i) for i in set(team_ids) if i is not None]
+    if keys:
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=0)
+
+
+def _changed(target):
+    if not has_app_context() or not current_app.config.get('RESPONSE_CACHE_TTL', 0):
+        return None
+    session = object_session(target)
+    if session is None:
+        return None
+    return session.info.setdefault('response_cache_changed', {'users': set(), 'teams': set()})
+
+
+def _values(target, attribute):
+    return {getattr(target, attribute), *get_history(target, attribute).deleted}
+
+
+def _project_teams(connection, project_ids):
+    project_ids = {i for i in project_ids if i is not None}
+    if not project_ids:
+        return set()
+    return set(connection.execute(
+        select(Project.team_id).where(Project.id.in_(project_ids))
+    ).scalars())
+
+
+def _task_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        changed['users'].update(_values(target, 'assigned_to') | _values(target, 'created_by'))
+        changed['teams'].update(_project_teams(connection, _values(target, 'project_id')))
+
+
+def _comment_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        changed['users'].add(target.user_id)
+        project_ids = connection.execute(
+            select(Task.project_id).where(Task.id == target.task_id)
+        ).scalars()
+        changed['teams'].update(_project_teams(connection, project_ids))
+
+
+def _member_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        changed['users'].update(_values(target, 'user_id'))
+        changed['teams'].update(_values(target, 'team_id'))
+
+
+def _project_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        changed['teams'].update(_values(target, 'team_id'))
+
+
+def _schedule_users(connection, schedule_ids):
+    schedule_ids = {i for i in schedule_ids if i is not None}
+    if not schedule_ids:
+        return set()
+    return set(connection.execute(
+        select(ScheduleParticipant.user_id).where(ScheduleParticipant.schedule_id.in_(schedule_ids))
+    ).scalars())
+
+
+def _schedule_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        # Every participant's calendar shows the schedule
+        changed['users'].update(_values(target, 'created_by') | _schedule_users(connection, [target.id]))
+        changed['teams'].update(_values(target, 'team_id'))
+
+
+def _participant_changed(mapper, connection, target):
+    changed = _changed(target)
+    if changed is not None:
+        schedule_ids = _values(target, 'schedule_id')
+        changed['users'].update(_values(target, 'user_id') | _schedule_users(connection, schedule_ids))
+        changed['users'].update(connection.execute(
+            select(Schedule.created_by).where(Schedule.id.in_(schedule_ids))
+        ).scalars())
+
+
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Task, _event, _task_changed)
+    event.listen(TaskComment, _event, _comment_changed)
+    event.listen(TeamMember, _event, _member_changed)
+    event.listen(Project, _event, _project_changed)
+    event.listen(Schedule, _event, _schedule_changed)
+    event.listen(ScheduleParticipant, _event, _participant_changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_versions(session):
+    changed = session.info.pop('response_cache_changed', None)
+    if changed:
+        invalidate(changed['users'], changed['teams'])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('response_cache_changed', None)
@@ -0,0 +1,62 @@
+"""Expansion of recurring schedules for calendar range queries.
+
+A recurring schedule is stored once, on the date of its first occurrence,
+with a ``recurring_pattern`` of daily, weekly, monthly or yearly. For a
+window the candidate series are loaded with one query: single events inside
+the window and recurring events that started before it ends. Each series is
+then turned into a lazy ``RecurrenceRule`` that fast-forwards to the window,
+and the per-series streams are merged in date and start time order, so only
+occurrences inside the window are ever produced.
+"""
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from app.models.schedule import Schedule
+from app.services.recurrence import FREQUENCIES, RecurrenceRule
+
+# Widest window expanded in one request
+MAX_RANGE_DAYS = 732
+
+
+def schedule_rule(schedule: Schedule) -> Optional[RecurrenceRule]:
+    """The recurrence of a schedule, or None for a single event."""
+    if not schedule.is_recurring or schedule.recurring_pattern not in FREQUENCIES:
+        return None
+    return RecurrenceRule(schedule.recurring_pattern, datetime.combine(schedule.date, schedule.start_time))
+
+
+def in_range(start: date, end: date):
+    """Criteria for schedules that may have an occurrence within ``[start, end]``."""
+    return or_(
+        and_(Schedule.date >= start, Schedule.date <= end),
+        and_(
+            Schedule.is_recurring.is_(True),
+            Schedule.recurring_pattern.in_(FREQUENCIES),
+            Schedule.date < start
+        )
+    )
+
+
+def _series(schedule: Schedule, start: date, end: date):
+    """Yield ``(date, start time, id, schedule)`` for one schedule's occurrences."""
+    start_time, schedule_id = schedule.start_time, schedule.id
+    rule = schedule_rule(schedule)
+    if rule is None:
+        if start <= schedule.date <= end:
+            yield schedule.date, start_time, schedule_id, schedule
+        return
+    # The window is whole days, whatever time the series starts at
+    after = datetime.combine(start, time.min) - timedelta(microseconds=1)
+    for moment in rule.occurrences(after=after, before=datetime.combine(end, time.max)):
+        yield moment.date(), start_time, schedule_id, schedule
+
+
+def iter_occurrences(schedules: Iterable[Schedule], start: date, end: date) -> Iterator[Tuple[date, Schedule]]:
+    """Yield ``(occurrence date, schedule)`` within ``[start, end]`` in calendar order."""
+    # Ids are unique, so the merge never compares schedules themselves
+    streams = [_series(schedule, start, end) for schedule in schedules]
+    for occurrence_date, _, _, schedule in heapq.merge(*streams):
+        yield occurrence_date, schedule
@@ -0,0 +1,229 @@
+"""Batched serializers for list endpoints.
+
+Model ``to_dict`` methods follow relationships lazily, which costs one query
+per related row when called in a loop. These helpers gather the referenced ids
+for a whole page of rows up front and resolve them with a single query.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, func
+
+from app.extensions import db
+from app.models.department import Department
+from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.schedule import ScheduleParticipant
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.team import Team
+from app.models.user import User
+
+
+def load_users(user_ids: Iterable[Optional[int]]) -> Dict[int, User]:
+    """Fetch users by id in one query, returning a mapping of id -> User."""
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if not ids:
+        return {}
+    return {user.id: user for user in User.query.filter(User.id.in_(ids)).all()}
+
+
+def task_user_ids(tasks: Iterable) -> List[int]:
+    """Collect every user id referenced by the given tasks."""
+    ids = []
+    for task in tasks:
+        ids.extend((task.assigned_to, task.created_by, task.approved_by))
+    return ids
+
+
+def serialize_tasks(tasks: Iterable, users: Optional[Dict[int, User]] = None) -> List[dict]:
+    """Serialize tasks with their assignee, creator and approver batched.
+
+    Args:
+        tasks: Task rows to serialize
+        users: Optional pre-loaded user mapping to reuse across several lists
+
+    Returns:
+        list: ``Task.to_dict`` output for each task, in order
+    """
+    tasks = list(tasks)
+    if users is None:
+        users = load_users(task_user_ids(tasks))
+    return [task.to_dict(users=users) for task in tasks]
+
+
+def serialize_projects(projects: Iterable) -> List[dict]:
+    """Serialize projects with their task counts read in one query.
+
+    Counts come from the ``ProjectTaskStats`` counters, so no tasks are loaded
+    or counted per project; projects without a counter row have no tasks.
+    """
+    projects = list(projects)
+    stats = ProjectTaskStats.for_projects(project.id for project in projects)
+    return [
+        project.to_dict(task_count=stats[project.id].total if project.id in stats else 0)
+        for project in projects
+    ]
+
+
+def serialize_teams(teams: Iterable) -> List[dict]:
+    """Serialize teams with member and department counts from one query.
+
+    Cost scales with the number of teams, not with their membership.
+    """
+    teams = list(teams)
+    counts = Team.counts(team.id for team in teams)
+    return [team.to_dict(*counts.get(team.id, (0, 0))) for team in teams]
+
+
+def serialize_departments(departments: Iterable) -> List[dict]:
+    """Serialize departments with their member counts from one grouped COUNT."""
+    departments = list(departments)
+    counts = Department.member_counts(department.id for department in departments)
+    return [department.to_dict(member_count=counts.get(department.id, 0)) for department in departments]
+
+
+def serialize_invitations(invitations: Iterable) -> List[dict]:
+    """Serialize invitations, loading teams (with counts) and inviters once."""
+    invitations = list(invitations)
+    team_ids = {invitation.team_id for invitation in invitations}
+    teams = {
+        team['id']: team
+        for team in serialize_teams(Team.query.filter(Team.id.in_(team_ids)).all())
+    } if team_ids else {}
+    users = load_users(invitation.invited_by for invitation in invitations)
+    return [invitation.to_dict(teams=teams, users=users) for invitation in invitations]
+
+
+def task_cards(*criteria) -> List[dict]:
+    """Lightweight kanban cards for the tasks matching ``criteria``.
+
+    One query: the task columns a card shows, the assignee's email, a grouped
+    comment count and an overdue flag computed by the database. Use this
+    instead of ``serialize_tasks`` when the full task and user dicts are not
+    needed.
+    """
+    comment_counts = (
+        db.session.query(TaskComment.task_id, func.count(TaskComment.id).label('count'))
+        .join(Task, Task.id == TaskComment.task_id)
+        .filter(*criteria)
+        .group_by(TaskComment.task_id)
+        .subquery()
+    )
+    is_overdue = case(
+        (and_(Task.due_date < datetime.utcnow(), Task.status != 'completed'), True),
+        else_=False
+    )
+    rows = (
+        db.session.query(
+            Task.id, Task.title, Task.priority, Task.status, Task.due_date,
+            Task.project_id, Task.assigned_to, Task.requires_approval, Task.approval_status,
+            User.email.label('assignee_email'),
+            func.coalesce(comment_counts.c.count, 0).label('comments_count'),
+            is_overdue.label('is_overdue'),
+        )
+        .outerjoin(User, User.id == Task.assigned_to)
+        .outerjoin(comment_counts, comment_counts.c.task_id == Task.id)
+        .filter(*criteria)
+        .order_by(Task.id)
+        .all()
+    )
+    return [
+        {
+            'id': row.id,
+            'title': row.title,
+            'priority': row.priority,
+            'status': row.status,
+            'due_date': row.due_date.isoformat() if row.due_date else None,
+            'project_id': row.project_id,
+            'assigned_to': row.assigned_to,
+            'assignee': {'id': row.assigned_to, 'email': row.assignee_email} if row.assigned_to else None,
+            'requires_approval': bool(row.requires_approval),
+            'approval_status': row.approval_status,
+            'comments_count': row.comments_count,
+            'is_overdue': bool(row.is_overdue),
+        }
+        for row in rows
+    ]
+
+
+def schedule_summaries(schedules: Iterable) -> List[dict]:
+    """Compact schedule dicts for calendar listings.
+
+    Same fields as ``Schedule.to_dict``, but the creator, project and team are
+    reduced to ids and names/emails and participants carry a user summary
+    instead of the full user. Participants, users, projects and teams are
+    each loaded with one query for the whole list, whatever its length.
+    """
+    schedules = list(schedules)
+    schedule_ids = {schedule.id for schedule in schedules}
+    if not schedule_ids:
+        return []
+
+    participants = {schedule_id: [] for schedule_id in schedule_ids}
+    for participant in ScheduleParticipant.query.filter(
+        ScheduleParticipant.schedule_id.in_(schedule_ids)
+    ).order_by(ScheduleParticipant.id):
+        participants[participant.schedule_id].append(participant)
+
+    users = load_users(
+        [schedule.created_by for schedule in schedules]
+        + [p.user_id for items in participants.values() for p in items]
+    )
+    project_ids = {schedule.project_id for schedule in schedules if schedule.project_id is not None}
+    projects = dict(
+        db.session.query(Project.id, Project.name).filter(Project.id.in_(project_ids)).all()
+    ) if project_ids else {}
+    team_ids = {schedule.team_id for schedule in schedules if schedule.team_id is not None}
+    teams = dict(
+        db.session.query(Team.id, Team.name).filter(Team.id.in_(team_ids)).all()
+    ) if team_ids else {}
+
+    def user_summary(user_id):
+        user = users.get(user_id)
+        return {'id': user.id, 'email': user.email} if user else None
+
+    def participant_summary(participant):
+        user = users.get(participant.user_id)
+        return {
+            'id': participant.id,
+            'schedule_id': participant.schedule_id,
+            'user_id': participant.user_id,
+            'email': participant.email,
+            'name': participant.name or (user.email if user else None),
+            'response_status': participant.response_status,
+            'is_organizer': participant.is_organizer,
+            'invited_at': participant.invited_at.isoformat() if participant.invited_at else None,
+            'responded_at': participant.responded_at.isoformat() if participant.responded_at else None,
+            'user': user_summary(participant.user_id),
+        }
+
+    return [
+        {
+            'id': schedule.id,
+            'title': schedule.title,
+            'description': schedule.description,
+            'date': schedule.date.isoformat() if schedule.date else None,
+            'start_time': schedule.start_time.strftime('%H:%M') if schedule.start_time else None,
+            'end_time': schedule.end_time.strftime('%H:%M') if schedule.end_time else None,
+            'timezone': schedule.timezone,
+            'meeting_type': schedule.meeting_type,
+            'meeting_link': schedule.meeting_link,
+            'location': schedule.location,
+            'status': schedule.status,
+            'is_recurring': schedule.is_recurring,
+            'recurring_pattern': schedule.recurring_pattern,
+            'created_by': schedule.created_by,
+            'project_id': schedule.project_id,
+            'team_id': schedule.team_id,
+            'created_at': schedule.created_at.isoformat() if schedule.created_at else None,
+            'updated_at': schedule.updated_at.isoformat() if schedule.updated_at else None,
+            'creator': user_summary(schedule.created_by),
+            'project': {'id': schedule.project_id, 'name': projects.get(schedule.project_id)}
+            if schedule.project_id is not None else None,
+            'team': {'id': schedule.team_id, 'name': teams.get(schedule.team_id)}
+            if schedule.team_id is not None else None,
+            'participants': [participant_summary(p) for p in participants[schedule.id]],
+        }
+        for schedule in schedules
+    ]
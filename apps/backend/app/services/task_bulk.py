@@ -0,0 +1,276 @@
+"""Bulk create/update/delete of tasks for ``POST /api/tasks/bulk``.
+
+Every referenced task, project, department and assignee membership is
+loaded up front with one query each and checked against the caller's membership context.
+Valid operations are then written as a handful of executemany statements
+in a single transaction. These writes bypass the ORM unit of work, so the
+affected ``ProjectTaskStats`` rows are rebuilt and the response cache is
+invalidated explicitly.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, select, update
+
+from app.authz import get_membership_context
+from app.extensions import db
+from app.models.department import Department
+from app.models.project import Project
+from app.models.project_task_stats import PRIORITY_BUCKETS, STATUS_BUCKETS, ProjectTaskStats
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.team import TeamMember
+from app.services import response_cache
+
+OPERATIONS = ('create', 'update', 'status', 'assign', 'delete')
+MAX_OPERATIONS = 5000
+UPDATABLE_FIELDS = ('title', 'description', 'priority', 'status', 'assigned_to', 'department_id', 'due_date')
+
+
+class BulkOperationError(ValueError):
+    """An operation that cannot be applied; the message is returned to the client."""
+
+
+def _parse_due_date(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BulkOperationError('Invalid due_date')
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_ids(op: Dict[str, Any]):
+    key = 'project_id' if op['op'] == 'create' else 'id'
+    if not _is_id(op.get(key)):
+        raise BulkOperationError(f'{key} must be an integer')
+    for key in ('assigned_to', 'department_id'):
+        if op.get(key) is not None and not _is_id(op[key]):
+            raise BulkOperationError(f'{key} must be an integer')
+
+
+def _check_fields(fields: Dict[str, Any]):
+    if 'title' in fields and not (isinstance(fields['title'], str) and fields['title'].strip()):
+        raise BulkOperationError('Title is required')
+    if 'status' in fields and fields['status'] not in STATUS_BUCKETS:
+        raise BulkOperationError(f"Status must be one of {', '.join(STATUS_BUCKETS)}")
+    if 'priority' in fields and fields['priority'] not in PRIORITY_BUCKETS:
+        raise BulkOperationError(f"Priority must be one of {', '.join(PRIORITY_BUCKETS)}")
+
+
+class _Plan:
+    """Validated writes plus what they touch."""
+
+    def __init__(self):
+        self.creates: List[Tuple[int, Dict[str, Any]]] = []
+        self.updates: Dict[int, Dict[str, Any]] = {}
+        self.deletes: Set[int] = set()
+        self.project_ids: Set[int] = set()
+        self.user_ids: Set[int] = set()
+
+
+def apply_task_operations(user_id: int, operations: List[Dict[str, Any]],
+                          atomic: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+    """Validate and apply bulk task operations.
+
+    Args:
+        user_id: The caller
+        operations: Items like ``{"op": "status", "id": 5, "status": "completed"}``
+        atomic: Apply nothing if any operation is invalid
+
+    Returns:
+        tuple: (per-item results in request order, whether anything was written)
+    """
+    context = get_membership_context(user_id)
+    team_ids = set(context.team_ids)
+
+    # One query each for the referenced tasks, projects, departments and assignee memberships.
+    # Malformed ids are skipped here and reported per item by _check_ids.
+    task_ids = {op['id'] for op in operations if op.get('op') != 'create' and _is_id(op.get('id'))}
+    tasks = {
+        row.id: row for row in db.session.execute(
+            select(
+                Task.id, Task.project_id, Task.created_by, Task.assigned_to, Task.status,
+                Task.completed_at, Task.requires_approval, Task.approval_status, Project.team_id
+            ).join(Project, Project.id == Task.project_id).where(Task.id.in_(task_ids))
+        )
+    } if task_ids else {}
+
+    project_ids = {
+        op['project_id'] for op in operations if op.get('op') == 'create' and _is_id(op.get('project_id'))
+    }
+    project_teams = dict(db.session.execute(
+        select(Project.id, Project.team_id).where(Project.id.in_(project_ids))
+    ).all()) if project_ids else {}
+
+    assignee_ids = {op['assigned_to'] for op in operations if _is_id(op.get('assigned_to'))}
+    memberships = set(db.session.execute(
+        select(TeamMember.team_id, TeamMember.user_id).where(TeamMember.user_id.in_(assignee_ids))
+    ).all()) if assignee_ids else set()
+
+    department_ids = {op['department_id'] for op in operations if _is_id(op.get('department_id'))}
+    department_teams = dict(db.session.execute(
+        select(Department.id, Department.team_id).where(Department.id.in_(department_ids))
+    ).all()) if department_ids else {}
+
+    def check_assignee(assigned_to, team_id):
+        if assigned_to is not None and (team_id, assigned_to) not in memberships:
+            raise BulkOperationError('User is not a team member')
+
+    def check_department(department_id, team_id):
+        if department_id is not None and department_teams.get(department_id) != team_id:
+            raise BulkOperationError('Department not found')
+
+    def editable_task(op, allow_assignee=False):
+        task = tasks.get(op.get('id'))
+        if task is None or op['id'] in plan.deletes:
+            raise BulkOperationError('Task not found')
+        allowed = task.team_id in team_ids or task.created_by == user_id
+        if allow_assignee:
+            allowed = allowed or task.assigned_to == user_id
+        if not allowed:
+            raise BulkOperationError('Task not found')
+        return task
+
+    def queue_update(task, values):
+        mapping = plan.updates.setdefault(task.id, {'id': task.id})
+        if 'status' in values:
+            completed_at = mapping.get('completed_at', task.completed_at)
+            if values['status'] == 'completed':
+                values['completed_at'] = completed_at or datetime.utcnow()
+            else:
+                values['completed_at'] = None
+        mapping.update(values)
+        plan.project_ids.add(task.project_id)
+        plan.user_ids.update((task.created_by, task.assigned_to, values.get('assigned_to')))
+
+    plan = _Plan()
+    results = []
+    for index, op in enumerate(operations):
+        kind = op.get('op')
+        result = {'index': index, 'op': kind, 'id': op.get('id')}
+        try:
+            if kind not in OPERATIONS:
+                raise BulkOperationError(f"op must be one of {', '.join(OPERATIONS)}")
+            _check_ids(op)
+
+            if kind == 'create':
+                fields = {key: op[key] for key in UPDATABLE_FIELDS if key in op}
+                fields.setdefault('title', '')
+                _check_fields(fields)
+                team_id = project_teams.get(op.get('project_id'))
+                if team_id is None or team_id not in team_ids:
+                    raise BulkOperationError('Access denied to this project')
+                check_assignee(fields.get('assigned_to'), team_id)
+                check_department(fields.get('department_id'), team_id)
+                now = datetime.utcnow()
+                status = fields.get('status', 'pending')
+                plan.creates.append((index, {
+                    'title': fields['title'].strip(),
+                    'description': fields.get('description', ''),
+                    'priority': fields.get('priority', 'medium'),
+                    'status': status,
+                    'project_id': op['project_id'],
+                    'created_by': user_id,
+                    'assigned_to': fields.get('assigned_to'),
+                    'department_id': fields.get('department_id'),
+                    'due_date': _parse_due_date(fields.get('due_date')),
+                    'requires_approval': False,
+                    'created_at': now,
+                    'updated_at': now,
+                    'completed_at': now if status == 'completed' else None,
+                }))
+                plan.project_ids.add(op['project_id'])
+                plan.user_ids.update((user_id, fields.get('assigned_to')))
+
+            elif kind == 'delete':
+                task = editable_task(op)
+                plan.deletes.add(task.id)
+                plan.updates.pop(task.id, None)
+                plan.project_ids.add(task.project_id)
+                plan.user_ids.update((task.created_by, task.assigned_to))
+
+            elif kind == 'status':
+                task = editable_task(op, allow_assignee=True)
+                status = op.get('status')
+                _check_fields({'status': status})
+                if status == 'completed' and task.requires_approval and task.approval_status != 'approved':
+                    raise BulkOperationError('Task requires approval; use PATCH /api/tasks/<id>/status')
+                queue_update(task, {'status': status})
+
+            elif kind == 'assign':
+                task = editable_task(op)
+                check_assignee(op.get('assigned_to'), task.team_id)
+                queue_update(task, {'assigned_to': op.get('assigned_to')})
+
+            else:  # update
+                task = editable_task(op)
+                values = {key: op[key] for key in UPDATABLE_FIELDS if key in op}
+                _check_fields(values)
+                if 'title' in values:
+                    values['title'] = values['title'].strip()
+                if 'due_date' in values:
+                    values['due_date'] = _parse_due_date(values['due_date'])
+                if 'assigned_to' in values:
+                    check_assignee(values['assigned_to'], task.team_id)
+                if 'department_id' in values:
+                    check_department(values['department_id'], task.team_id)
+                queue_update(task, values)
+
+            result['status'] = 'ok'
+        except BulkOperationError as e:
+            result['status'] = 'error'
+            result['error'] = str(e)
+        results.append(result)
+
+    failed = any(result['status'] == 'error' for result in results)
+    if atomic and failed:
+        for result in results:
+            if result['status'] == 'ok':
+                result['status'] = 'skipped'
+        return results, False
+
+    if not (plan.creates or plan.updates or plan.deletes):
+        return results, False
+
+    _write(plan, results)
+    return results, True
+
+
+def _write(plan: _Plan, results: List[Dict[str, Any]]):
+    """Apply the plan in one transaction, then refresh counters and caches."""
+    try:
+        if plan.creates:
+            new_ids = db.session.scalars(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                [row for _, row in plan.creates]
+            ).all()
+            for (index, _), task_id in zip(plan.creates, new_ids):
+                results[index]['id'] = task_id
+
+        if plan.updates:
+            now = datetime.utcnow()
+            db.session.execute(
+                update(Task), [{**mapping, 'updated_at': now} for mapping in plan.updates.values()]
+            )
+
+        if plan.deletes:
+            # Comments cascade in the ORM, not on every database
+            db.session.execute(delete(TaskComment).where(TaskComment.task_id.in_(plan.deletes)))
+            db.session.execute(delete(Task).where(Task.id.in_(plan.deletes)))
+
+        # Bulk statements skip the mapper events that maintain the counters
+        ProjectTaskStats.rebuild(plan.project_ids)
+        team_ids = db.session.execute(
+            select(Project.team_id).where(Project.id.in_(plan.project_ids))
+        ).scalars().all()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    # Nor do they reach the response cache's commit hook
+    response_cache.invalidate(plan.user_ids, team_ids)
@@ -0,0 +1,9 @@
+"""Benchmarks for the backend's hot paths.
+
+Each module compares an endpoint or service against the implementation it
+replaced. Run them from ``apps/backend`` as modules, for example::
+
+    python -m benchmarks.kanban_board 5000
+
+Shared app setup, seeding and timing live in ``benchmarks.common``.
+"""
@@ -0,0 +1,95 @@
+"""App setup, seeding and timing shared by the benchmarks.
+
+The app is imported lazily: several benchmarks point the config at a scratch
+database through environment variables before the first import.
+"""
+import contextlib
+import io
+import os
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet():
+    """Swallow the debugging output routes and ``create_app`` print."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def create_bench_app(config_name='testing'):
+    with quiet():
+        from app import create_app
+        return create_app(config_name)
+
+
+def auth_headers(user_id) -> dict:
+    """Authorization header for ``user_id``; needs an app context."""
+    from flask_jwt_extended import create_access_token
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+
+def seed_team(users=1, projects=0, name='Bench', prefix='user'):
+    """Create users, one team they all belong to and its projects.
+
+    The first user creates the team and the projects. Nothing is committed.
+
+    Returns:
+        tuple: (users, team, projects)
+    """
+    from app.extensions import db
+    from app.models import Project, Team, TeamMember, User
+
+    members = [User(email=f'{prefix}{i}@example.com', password_hash='x') for i in range(users)]
+    db.session.add_all(members)
+    db.session.flush()
+    team = Team(name=name, created_by=members[0].id)
+    db.session.add(team)
+    db.session.flush()
+    db.session.add_all(TeamMember(team_id=team.id, user_id=user.id) for user in members)
+    team_projects = [
+        Project(name=f'Project {i}', team_id=team.id, created_by=members[0].id) for i in range(projects)
+    ]
+    db.session.add_all(team_projects)
+    db.session.flush()
+    return members, team, team_projects
+
+
+class QueryTimer:
+    """Best-of-N wall time and statement count of a callable.
+
+    Create inside an app context, after the database is seeded.
+    """
+
+    def __init__(self, rounds):
+        from sqlalchemy import event
+        from app.extensions import db
+
+        self.rounds = rounds
+        self.statements = 0
+        event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.statements += 1
+
+    def time(self, fn, fresh=True):
+        """Run ``fn`` ``rounds`` times.
+
+        Args:
+            fn: The callable to measure
+            fresh: Start every round from an empty session
+
+        Returns:
+            tuple: (best seconds, statements in the last round, last return value)
+        """
+        from app.extensions import db
+
+        best, queries, result = float('inf'), 0, None
+        for _ in range(self.rounds):
+            if fresh:
+                db.session.expunge_all()
+            self.statements = 0
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+            queries = self.statements
+        return best, queries, result
@@ -0,0 +1,84 @@
+"""Benchmark the waitlist CSV export at increasing sizes.
+
+Seeds a temporary SQLite file with N waitlist entries and downloads
+GET /api/waitlist/export through the test client, reporting wall time and
+peak Python memory (tracemalloc) while the response is consumed. The previous
+implementation (``.all()`` plus string concatenation) is measured too, up to
+``LEGACY_LIMIT`` rows.
+
+Usage: python -m benchmarks.csv_export [rows ...]   (default: 10000 100000 1000000)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.common import create_bench_app
+
+LEGACY_LIMIT = 100000
+
+
+def legacy_export():
+    """The body of the old export endpoint, kept here for comparison."""
+    from app.models.waitlist import WaitlistEntry
+    entries = WaitlistEntry.query.order_by(WaitlistEntry.signed_up_at.desc()).all()
+    csv_content = "email,signed_up_at,status,ip_address\n"
+    for entry in entries:
+        csv_content += f"{entry.email},{entry.signed_up_at.isoformat()},{entry.status},{entry.ip_address or ''}\n"
+    return csv_content
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['TEST_DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    app = create_bench_app()
+    from app.extensions import db
+    from app.models.waitlist import WaitlistEntry
+
+    print(f"{'rows':>9}  {'variant':<10} {'seconds':>8} {'peak MiB':>9} {'MiB out':>8}")
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+        seeded = 0
+        now = datetime.utcnow()
+        for rows in sorted(sizes):
+            # Top up the table to the next size
+            while seeded < rows:
+                batch = range(seeded, min(rows, seeded + 50000))
+                db.session.execute(WaitlistEntry.__table__.insert(), [
+                    {'email': f'user{i}@example.com', 'signed_up_at': now - timedelta(seconds=i),
+                     'status': 'pending', 'ip_address': '127.0.0.1', 'confirmation_sent': False}
+                    for i in batch
+                ])
+                db.session.commit()
+                seeded = batch[-1] + 1
+
+            def streamed():
+                response = client.get('/api/waitlist/export')
+                return sum(len(chunk) for chunk in response.response)
+
+            variants = [('streamed', streamed)]
+            if rows <= LEGACY_LIMIT:
+                variants.append(('previous', lambda: len(legacy_export())))
+            for name, fn in variants:
+                db.session.expunge_all()
+                seconds, peak, size = measure(fn)
+                print(f"{rows:>9}  {name:<10} {seconds:8.2f} {peak / 2**20:9.1f} {size / 2**20:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
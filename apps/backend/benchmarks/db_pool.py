@@ -0,0 +1,116 @@
+"""Load test the database connection pool.
+
+Runs C client threads (default 5, one request in flight each, like a sync
+gunicorn worker plus its email outbox threads) against GET /api/teams/ for
+D seconds per scenario (default 3), each scenario using its own
+app and engine:
+
+* ``NullPool``, which opens and closes a connection for every checkout
+* a pool smaller than the load (size 2, overflow 10), where connections
+  beyond the pool are opened and closed again on every burst
+* the configured pool (``DB_POOL_SIZE``/``DB_MAX_OVERFLOW`` from the
+  production config)
+
+and reports requests served, connections opened and closed, and the pool
+status as returned by /ready. A pool that covers the load opens its
+connections once and then reuses them.
+
+Runs against a scratch SQLite file by default; set DATABASE_URL to point
+it at a scratch PostgreSQL database instead (it creates tables and rows).
+
+Usage: python -m benchmarks.db_pool [clients] [seconds]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import auth_headers, create_bench_app, quiet, seed_team
+
+scratch = tempfile.TemporaryDirectory()
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{scratch.name}/bench.db')
+
+
+def seed(db, models):
+    (user,), _, _ = seed_team(name='Team 0')
+    for i in range(1, 10):
+        team = models.Team(name=f'Team {i}', created_by=user.id)
+        db.session.add(team)
+        db.session.flush()
+        db.session.add(models.TeamMember(team_id=team.id, user_id=user.id))
+    db.session.commit()
+    return user.id
+
+
+def run(app, headers, clients, seconds):
+    """Hammer the app from ``clients`` threads; return requests served."""
+    served = []
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        test_client = app.test_client()
+        count = 0
+        while time.perf_counter() < deadline:
+            response = test_client.get('/api/teams/', headers=headers)
+            assert response.status_code == 200, response.status_code
+            count += 1
+        served.append(count)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(served)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with quiet():
+        from app.config import ProductionConfig, config_by_name
+    from sqlalchemy.pool import NullPool
+    from app.db_pool import pool_stats
+    from app.extensions import db
+    import app.models as models
+
+    scenarios = [
+        ('NullPool', {'SQLALCHEMY_ENGINE_OPTIONS': {'poolclass': NullPool}}),
+        ('pool 2 + overflow 10', {'DB_POOL_SIZE': 2, 'DB_MAX_OVERFLOW': 10}),
+        (f'configured ({ProductionConfig.DB_POOL_SIZE} + {ProductionConfig.DB_MAX_OVERFLOW})', {}),
+    ]
+
+    results = []
+    user_id = None
+    for name, overrides in scenarios:
+        config_by_name['bench'] = type('BenchConfig', (ProductionConfig,), overrides)
+        app = create_bench_app('bench')
+        logging.disable(logging.CRITICAL)
+        with app.app_context():
+            if user_id is None:
+                db.create_all()
+                user_id = seed(db, models)
+            headers = auth_headers(user_id)
+            db.session.remove()
+            db.engine.dispose()
+            backend = db.engine.url.get_backend_name()
+            before = pool_stats(db.engine)
+            with quiet():
+                served = run(app, headers, clients, seconds)
+                ready = app.test_client().get('/ready').get_json()['pool']
+            opened = ready['opened'] - before['opened']
+            closed = ready['closed'] - before['closed']
+        results.append((name, served, opened, closed, ready))
+
+    print(f"{clients} clients x {seconds:g}s against {backend}")
+    for name, served, opened, closed, ready in results:
+        status = ', '.join(f'{key}={ready[key]}' for key in ('size', 'checked_in', 'checked_out', 'overflow')
+                           if key in ready)
+        print(f"  {name:<22} {served:6d} requests  {opened:6d} opened  {closed:6d} closed  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark free/busy lookups and conflict checks for a busy team.
+
+Seeds an in-memory SQLite database with a team of 50 users sharing about
+four single meetings a day each over three months (3-6 attendees per
+meeting) plus daily and weekly recurring series, then times:
+
+* ``BusyIndex.load`` for all 50 users over one month
+* GET /api/schedules/freebusy for the same users and month
+* a per-user baseline that queries each user's schedules separately and
+  scans them linearly for overlaps
+* ``find_conflicts`` for a new six-attendee meeting
+
+Usage: python -m benchmarks.freebusy [meetings_per_day] [rounds]
+"""
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+USERS = 50
+DAYS = 90
+
+
+def per_user_busy(user_ids, start, end):
+    """Baseline: one query per user, then a linear merge of that user's events."""
+    from app.models.schedule import Schedule, ScheduleParticipant
+
+    busy = {}
+    for user_id in user_ids:
+        schedules = Schedule.query.join(ScheduleParticipant).filter(
+            ScheduleParticipant.user_id == user_id,
+            Schedule.date >= start, Schedule.date <= end
+        ).order_by(Schedule.date, Schedule.start_time).all()
+        blocks = []
+        for schedule in schedules:
+            begin = datetime.combine(schedule.date, schedule.start_time)
+            finish = datetime.combine(schedule.date, schedule.end_time)
+            if blocks and begin <= blocks[-1][1]:
+                blocks[-1][1] = max(blocks[-1][1], finish)
+            else:
+                blocks.append([begin, finish])
+        busy[user_id] = blocks
+    return busy
+
+
+def seed(db, models, meetings_per_day):
+    rng = random.Random(7)
+    users, team, _ = seed_team(users=USERS)
+
+    first = date.today()
+    schedules, attendees = [], []
+    # Each meeting has ~4.5 attendees, so this gives every user about meetings_per_day a day
+    for day in range(DAYS):
+        for _ in range(USERS * meetings_per_day * 2 // 9):
+            hour = rng.randint(8, 17)
+            schedules.append(models.Schedule(
+                title='Meeting', date=first + timedelta(days=day),
+                start_time=datetime.strptime(f'{hour:02d}:{rng.choice([0, 30])}', '%H:%M').time(),
+                end_time=datetime.strptime(f'{hour + 1:02d}:00', '%H:%M').time(),
+                created_by=users[0].id, team_id=team.id
+            ))
+            attendees.append(rng.sample(users, rng.randint(3, 6)))
+    for i in range(40):
+        schedules.append(models.Schedule(
+            title='Standup', date=first - timedelta(days=30), is_recurring=True,
+            recurring_pattern='daily' if i % 2 else 'weekly',
+            start_time=datetime.strptime('09:00', '%H:%M').time(),
+            end_time=datetime.strptime('09:15', '%H:%M').time(),
+            created_by=users[0].id, team_id=team.id
+        ))
+        attendees.append(rng.sample(users, 5))
+    db.session.add_all(schedules)
+    db.session.flush()
+    db.session.execute(models.ScheduleParticipant.__table__.insert(), [
+        {'schedule_id': schedule.id, 'user_id': user.id, 'response_status': 'accepted',
+         'is_organizer': False, 'invited_at': datetime.utcnow()}
+        for schedule, people in zip(schedules, attendees) for user in people
+    ])
+    db.session.commit()
+    return [u.id for u in users], len(schedules)
+
+
+def main():
+    meetings_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    app = create_bench_app()
+    from app.extensions import db
+    from app.services.freebusy import BusyIndex, find_conflicts
+    import app.models as models
+
+    start = date.today() + timedelta(days=7)
+    end = start + timedelta(days=30)
+
+    with app.app_context():
+        db.create_all()
+        user_ids, schedule_count = seed(db, models, meetings_per_day)
+        headers = auth_headers(user_ids[0])
+        client = app.test_client()
+        url = (f"/api/schedules/freebusy?user_ids={','.join(map(str, user_ids))}"
+               f"&start_date={start.isoformat()}&end_date={end.isoformat()}")
+        timer = QueryTimer(rounds)
+
+        def endpoint():
+            with quiet():
+                response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        candidate = models.Schedule(
+            title='New', date=start + timedelta(days=3),
+            start_time=datetime.strptime('10:00', '%H:%M').time(),
+            end_time=datetime.strptime('11:00', '%H:%M').time()
+        )
+
+        def index_busy():
+            index = BusyIndex.load(user_ids, start, end)
+            return {user_id: index.busy(user_id) for user_id in user_ids}
+
+        results = [
+            ('per-user baseline', timer.time(lambda: per_user_busy(user_ids, start, end))),
+            ('BusyIndex.load', timer.time(index_busy)),
+            ('GET /freebusy', timer.time(endpoint)),
+            ('find_conflicts', timer.time(lambda: find_conflicts(candidate, user_ids[:6]))),
+        ]
+
+    print(f"{USERS} users, {schedule_count} schedules over {DAYS} days, "
+          f"window {start} to {end}, best of {rounds} rounds")
+    for name, (seconds, queries, _) in results:
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms  {queries:4d} queries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark the project Kanban board on a large project.
+
+Seeds an in-memory SQLite database with one project of N tasks (default
+5000, three comments each) and times GET /api/kanban/project/<id>/board
+against the previous implementation, which serialized every task with the
+full ``to_dict`` and loaded all comments per card to count them.
+
+Usage: python -m benchmarks.kanban_board [tasks] [rounds]
+"""
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+
+def legacy_board(project_id):
+    """The card-building part of the old endpoint, kept here for comparison."""
+    from app.models.task import Task
+    from app.services.serializers import serialize_tasks
+
+    tasks_by_status = {'pending': [], 'in_progress': [], 'completed': [], 'cancelled': [], 'pending_approval': []}
+    tasks = Task.query.filter_by(project_id=project_id).all()
+    for task, task_dict in zip(tasks, serialize_tasks(tasks)):
+        task_dict['comments_count'] = len(task.comments.all())
+        if task.approval_status == 'pending_approval':
+            tasks_by_status['pending_approval'].append(task_dict)
+        elif task.status in tasks_by_status:
+            tasks_by_status[task.status].append(task_dict)
+        else:
+            tasks_by_status['pending'].append(task_dict)
+    now = datetime.utcnow()
+    overdue = len([t for t in tasks if t.due_date and t.due_date < now and t.status != 'completed'])
+    return tasks_by_status, overdue
+
+
+def seed(db, models, task_count):
+    users, _, (project,) = seed_team(users=20, projects=1)
+
+    now = datetime.utcnow()
+    statuses = ['pending', 'in_progress', 'completed', 'cancelled']
+    tasks = [
+        models.Task(
+            title=f'Task {i}', project_id=project.id, created_by=users[i % 20].id,
+            assigned_to=users[(i + 1) % 20].id, status=statuses[i % 4],
+            due_date=now + timedelta(days=i % 14 - 7)
+        )
+        for i in range(task_count)
+    ]
+    db.session.add_all(tasks)
+    db.session.flush()
+    db.session.add_all(
+        models.TaskComment(content='Looks good', task_id=task.id, user_id=users[0].id)
+        for task in tasks for _ in range(3)
+    )
+    db.session.commit()
+    return users[0].id, project.id
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = create_bench_app()
+    from app.extensions import db
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id, project_id = seed(db, models, task_count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        timer = QueryTimer(rounds)
+
+        def current():
+            with quiet():
+                response = client.get(f'/api/kanban/project/{project_id}/board', headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        results = [
+            ('previous board', timer.time(lambda: legacy_board(project_id))),
+            ('current board', timer.time(current)),
+        ]
+
+    print(f"{task_count} tasks, {task_count * 3} comments, best of {rounds} rounds")
+    for name, (seconds, queries, _) in results:
+        print(f"  {name:<16} {seconds * 1000:9.1f} ms  {queries:6d} queries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark the project analytics overview on a large project.
+
+Seeds an in-memory SQLite database with one project of N tasks (default
+50000, one comment each) spread over 20 assignees, and times GET
+/api/analytics/project/<id> against the previous implementation, which ran
+a COUNT per status, loaded every completed task to average its completion
+time and loaded the whole task collection for ``Project.to_dict``.
+
+Usage: python -m benchmarks.project_analytics [tasks] [rounds]
+"""
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+
+def legacy_analytics(project_id):
+    """The statistics part of the old endpoint, kept here for comparison.
+
+    Assignees are grouped by email; the old ``User.username`` column no
+    longer exists.
+    """
+    from sqlalchemy import func
+
+    from app.extensions import db
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.task_comment import TaskComment
+    from app.models.user import User
+
+    project = db.session.get(Project, project_id)
+    counts = {'total': Task.query.filter_by(project_id=project_id).count()}
+    for status in ('completed', 'in_progress', 'pending', 'cancelled'):
+        counts[status] = Task.query.filter_by(project_id=project_id, status=status).count()
+    counts['overdue'] = Task.query.filter(
+        Task.project_id == project_id,
+        Task.due_date < datetime.utcnow(),
+        Task.status != 'completed'
+    ).count()
+
+    timeline = db.session.query(
+        func.date(Task.completed_at), func.count(Task.id)
+    ).filter(
+        Task.project_id == project_id,
+        Task.completed_at >= datetime.utcnow() - timedelta(days=30)
+    ).group_by(func.date(Task.completed_at)).all()
+
+    completed = Task.query.filter_by(project_id=project_id, status='completed').filter(
+        Task.completed_at.isnot(None)
+    ).all()
+    average = None
+    if completed:
+        average = sum((t.completed_at - t.created_at).total_seconds() for t in completed) / len(completed) / 86400
+
+    priorities = db.session.query(Task.priority, func.count(Task.id)).filter_by(
+        project_id=project_id
+    ).group_by(Task.priority).all()
+    assignees = db.session.query(User.email, func.count(Task.id)).join(
+        Task, Task.assigned_to == User.id
+    ).filter(Task.project_id == project_id).group_by(User.email).all()
+    productivity = db.session.query(User.email, func.count(Task.id)).join(
+        Task, Task.assigned_to == User.id
+    ).filter(Task.project_id == project_id, Task.status == 'completed').group_by(User.email).all()
+    comments = TaskComment.query.join(Task).filter(Task.project_id == project_id).count()
+
+    return {
+        'project': project.to_dict(task_count=len(project.tasks)),
+        'counts': counts,
+        'average': average,
+        'timeline': timeline,
+        'priorities': priorities,
+        'assignees': assignees,
+        'productivity': productivity,
+        'comments': comments,
+    }
+
+
+def seed(db, models, task_count):
+    users, _, (project,) = seed_team(users=20, projects=1)
+
+    now = datetime.utcnow()
+    statuses = ['pending', 'in_progress', 'completed', 'cancelled']
+    priorities = ['low', 'medium', 'high', 'urgent']
+    rows = []
+    for i in range(task_count):
+        status = statuses[i % 4]
+        created_at = now - timedelta(days=i % 60 + 1)
+        rows.append({
+            'title': f'Task {i}', 'description': '', 'project_id': project.id,
+            'created_by': users[i % 20].id, 'assigned_to': users[(i + 1) % 20].id,
+            'status': status, 'priority': priorities[i % 4], 'requires_approval': False,
+            'due_date': now + timedelta(days=i % 14 - 7), 'created_at': created_at, 'updated_at': created_at,
+            'completed_at': created_at + timedelta(hours=i % 96) if status == 'completed' else None,
+        })
+    task_ids = db.session.execute(
+        models.Task.__table__.insert().returning(models.Task.id), rows
+    ).scalars().all()
+    db.session.execute(models.TaskComment.__table__.insert(), [
+        {'content': 'Looks good', 'task_id': task_id, 'user_id': users[0].id,
+         'created_at': now, 'updated_at': now}
+        for task_id in task_ids
+    ])
+    # The bulk insert skips the counter hooks
+    models.ProjectTaskStats.rebuild([project.id])
+    db.session.commit()
+    return users[0].id, project.id
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = create_bench_app()
+    from app.extensions import db
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id, project_id = seed(db, models, task_count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        timer = QueryTimer(rounds)
+
+        def current():
+            with quiet():
+                response = client.get(f'/api/analytics/project/{project_id}', headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        results = [
+            ('previous analytics', timer.time(lambda: legacy_analytics(project_id))),
+            ('current analytics', timer.time(current)),
+        ]
+
+    print(f"{task_count} tasks, {task_count} comments, best of {rounds} rounds")
+    for name, (seconds, queries, _) in results:
+        print(f"  {name:<20} {seconds * 1000:9.1f} ms  {queries:6d} queries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark project listings for a team with many tasks.
+
+Seeds an in-memory SQLite database with one team of 200 projects and N tasks
+spread across them (default 100000), then times:
+
+* serializing every project the old way, counting ``len(project.tasks)``
+* serializing with ``serialize_projects`` (task counts from ``ProjectTaskStats``)
+* GET /api/projects/team/<id>
+
+Usage: python -m benchmarks.project_listing [tasks] [rounds]
+"""
+import sys
+from datetime import datetime
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+PROJECTS = 200
+
+
+def legacy_listing(projects):
+    """Old behaviour: load every project's tasks to count them."""
+    listing = []
+    for project in projects:
+        data = project.to_dict(task_count=0)
+        data['task_count'] = len(project.tasks)
+        listing.append(data)
+    return listing
+
+
+def seed(db, models, task_count):
+    (user,), team, projects = seed_team(projects=PROJECTS)
+    now = datetime.utcnow()
+    db.session.execute(models.Task.__table__.insert(), [
+        {'title': f'Task {i}', 'project_id': projects[i % PROJECTS].id, 'created_by': user.id,
+         'status': 'pending', 'priority': 'medium', 'created_at': now, 'updated_at': now}
+        for i in range(task_count)
+    ])
+    # Core inserts skip the mapper events that maintain the counters
+    models.ProjectTaskStats.rebuild([project.id for project in projects])
+    db.session.commit()
+    return user.id, team.id
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = create_bench_app()
+    from app.extensions import db
+    from app.services.serializers import serialize_projects
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id, team_id = seed(db, models, task_count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        timer = QueryTimer(rounds)
+
+        def projects():
+            return models.Project.query.filter_by(team_id=team_id).all()
+
+        def endpoint():
+            with quiet():
+                response = client.get(f'/api/projects/team/{team_id}', headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        legacy = legacy_listing(projects())
+        db.session.expunge_all()
+        assert legacy == serialize_projects(projects())
+
+        results = [
+            ('len(project.tasks)', timer.time(lambda: legacy_listing(projects()))),
+            ('serialize_projects', timer.time(lambda: serialize_projects(projects()))),
+            ('GET /team/<id>', timer.time(endpoint)),
+        ]
+
+    print(f"{PROJECTS} projects, {task_count} tasks, best of {rounds} rounds")
+    for name, (seconds, queries, _) in results:
+        print(f"  {name:<20} {seconds * 1000:8.1f} ms  {queries:4d} queries")
+
+
+if __name__ == '__main__':
+    main()
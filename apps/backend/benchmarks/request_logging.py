@@ -0,0 +1,120 @@
+"""Benchmark per-request logging overhead.
+
+Compares an authenticated no-op endpoint with:
+  - access logging off
+  - the old before_request hook (header dump, unverified JWT decode and
+    token-revocation prints, all flushed to stdout)
+  - queue-based access logging at sample rates 1.0 and 0.1
+
+Each variant runs in a fresh interpreter, best of several rounds. Log output
+is written to a temporary file so the numbers include real write syscalls
+without flooding the terminal.
+
+Usage: python -m benchmarks.request_logging [requests] [rounds]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR
+
+
+def legacy_log_request():
+    """The request hook removed from create_app, kept here for comparison."""
+    from flask import request
+    print(f"REQUEST: {request.method} {request.path} - Headers: {dict(request.headers)}", flush=True)
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        token = auth_header.split(' ')[1]
+        print(f"JWT TOKEN PRESENT: {token[:50]}...", flush=True)
+        try:
+            import jwt as pyjwt
+            decoded = pyjwt.decode(token, options={"verify_signature": False})
+            print(f"JWT PAYLOAD (unverified): {decoded}", flush=True)
+            # check_if_token_revoked printed twice per authenticated request
+            print(f"CHECKING TOKEN REVOCATION: Payload={decoded}", flush=True)
+            print(f"TOKEN JTI {decoded.get('jti')} - REVOKED: False", flush=True)
+        except Exception as decode_error:
+            print(f"JWT DECODE ERROR: {decode_error}", flush=True)
+
+
+def build_app(level='INFO', sample_rate=1.0, legacy=False):
+    from app import create_app
+    from app.config import config_by_name
+    from flask_jwt_extended import create_access_token, jwt_required
+
+    config = config_by_name['testing']
+    config.REQUEST_LOG_LEVEL = level
+    config.REQUEST_LOG_SAMPLE_RATE = sample_rate
+    app = create_app('testing')
+    if legacy:
+        app.before_request(legacy_log_request)
+
+    @app.route('/__bench')
+    @jwt_required()
+    def bench():
+        return {'ok': True}
+
+    with app.app_context():
+        token = create_access_token(identity='1')
+    return app, {'Authorization': f'Bearer {token}', 'User-Agent': 'bench', 'Accept': 'application/json'}
+
+
+def run(app, headers, requests):
+    client = app.test_client()
+    for _ in range(100):
+        client.get('/__bench', headers=headers)
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get('/__bench', headers=headers)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+VARIANTS = [
+    ('logging off', dict(level='CRITICAL')),
+    ('old print hook', dict(level='CRITICAL', legacy=True)),
+    ('queue, sample 1.0', dict(sample_rate=1.0)),
+    ('queue, sample 0.1', dict(sample_rate=0.1)),
+]
+
+
+def run_variant(index, requests):
+    """Time one variant in this process and print microseconds per request."""
+    log_file = tempfile.TemporaryFile('w')
+    real_stdout = sys.stdout
+    sys.stdout = log_file
+    try:
+        app, headers = build_app(**VARIANTS[index][1])
+        micros = run(app, headers, requests)
+    finally:
+        sys.stdout = real_stdout
+        log_file.close()
+    print(micros)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--variant':
+        run_variant(int(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    best = [float('inf')] * len(VARIANTS)
+    for _ in range(rounds):
+        for index in range(len(VARIANTS)):
+            output = subprocess.run(
+                [sys.executable, '-m', __spec__.name, '--variant', str(index), str(requests)],
+                capture_output=True, text=True, check=True, cwd=BACKEND_DIR
+            ).stdout
+            best[index] = min(best[index], float(output.strip().splitlines()[-1]))
+
+    baseline = best[0]
+    print(f"{requests} requests per variant, best of {rounds} rounds")
+    for (name, _), micros in zip(VARIANTS, best):
+        print(f"  {name:<20} {micros:8.1f} us/request  ({micros - baseline:+7.1f} us overhead)")
+
+
+if __name__ == '__main__':
+    main()
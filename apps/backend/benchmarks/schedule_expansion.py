@@ -0,0 +1,112 @@
+"""Benchmark year-view schedule queries with many recurring events.
+
+Seeds an in-memory SQLite database with N recurring schedules for one user
+(default 2000: weekly, daily and monthly series started over the previous
+three years) and measures a one-year window:
+
+* expanding the loaded series with ``iter_occurrences`` against a naive
+  expansion that steps every series from its first date and sorts at the end
+* GET /api/schedules for the year with the response cache off, and served
+  from the response cache
+
+Usage: python -m benchmarks.schedule_expansion [schedules] [rounds]
+"""
+import sys
+from datetime import date, datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet
+
+PATTERNS = ['weekly'] * 6 + ['monthly'] * 3 + ['daily']
+
+
+def naive_expand(schedules, start, end):
+    """Step each series from its first date and sort everything at the end."""
+    steps = {'daily': timedelta(days=1), 'weekly': timedelta(weeks=1), 'monthly': timedelta(days=30)}
+    occurrences = []
+    for schedule in schedules:
+        current = schedule.date
+        while current <= end:
+            if current >= start:
+                occurrences.append((current, schedule.start_time, schedule.id, schedule))
+            current += steps[schedule.recurring_pattern]
+    occurrences.sort(key=lambda item: item[:3])
+    return [(item[0], item[3]) for item in occurrences]
+
+
+def seed(db, models, count):
+    user = models.User(email='calendar@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    first = date.today() - timedelta(days=3 * 365)
+    schedules = [
+        models.Schedule(
+            title=f'Series {i}', date=first + timedelta(days=i % 1000),
+            start_time=datetime.strptime(f'{8 + i % 9:02d}:00', '%H:%M').time(),
+            end_time=datetime.strptime(f'{9 + i % 9:02d}:00', '%H:%M').time(),
+            is_recurring=True, recurring_pattern=PATTERNS[i % len(PATTERNS)], created_by=user.id
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(schedules)
+    db.session.flush()
+    db.session.add_all(
+        models.ScheduleParticipant(schedule_id=s.id, user_id=user.id, is_organizer=True,
+                                   response_status='accepted')
+        for s in schedules
+    )
+    db.session.commit()
+    return user.id
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = create_bench_app()
+    from app.extensions import db
+    from app.services.schedule_expansion import iter_occurrences
+    import app.models as models
+
+    start = date.today()
+    end = start + timedelta(days=364)
+    url = f'/api/schedules?start_date={start.isoformat()}&end_date={end.isoformat()}'
+
+    with app.app_context():
+        db.create_all()
+        user_id = seed(db, models, count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        schedules = models.Schedule.query.all()
+        timer = QueryTimer(rounds)
+
+        def request():
+            with quiet():
+                response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.status_code
+            return len(response.data)
+
+        def expansion(fn):
+            seconds, queries, size = timer.time(fn, fresh=False)
+            return seconds, queries, f'{size:7d} occurrences'
+
+        def response():
+            seconds, queries, size = timer.time(request)
+            return seconds, queries, f'{size / 2**20:7.1f} MiB'
+
+        results = [
+            ('naive expansion', expansion(lambda: len(naive_expand(schedules, start, end)))),
+            ('iter_occurrences', expansion(lambda: len(list(iter_occurrences(schedules, start, end))))),
+        ]
+        app.config['RESPONSE_CACHE_TTL'] = 0
+        results.append(('request, no cache', response()))
+        app.config['RESPONSE_CACHE_TTL'] = 300
+        request()  # miss, fills the cache
+        results.append(('request, cached', response()))
+
+    print(f"{count} recurring schedules, {start} to {end}, best of {rounds} rounds")
+    for name, (seconds, queries, size) in results:
+        print(f"  {name:<18} {seconds * 1000:9.1f} ms  {queries:6d} queries  {size}")
+
+
+if __name__ == '__main__':
+    main()
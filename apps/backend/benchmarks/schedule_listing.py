@@ -0,0 +1,113 @@
+"""Benchmark the month view of GET /api/schedules.
+
+Seeds an in-memory SQLite database with a 30-member team, a few projects of
+2000 tasks each and N schedules in one month (default 100, 250 and 500),
+each with four participants and a project. Times the listing against the
+previous serialization (``Schedule.to_dict`` per row, which loads the
+creator, every task of the project, every team member and department, and
+each participant's user lazily) and counts the queries.
+
+Usage: python -m benchmarks.schedule_listing [events ...] [--rounds N]
+"""
+import sys
+from datetime import date, datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+TASKS_PER_PROJECT = 2000
+
+
+def legacy_listing(user_id, start, end):
+    """The previous query and per-row ``to_dict``, kept here for comparison."""
+    from app.extensions import db
+    from app.models.schedule import Schedule, ScheduleParticipant
+
+    schedules = db.session.query(Schedule).join(
+        ScheduleParticipant, Schedule.id == ScheduleParticipant.schedule_id
+    ).filter(
+        db.or_(Schedule.created_by == user_id, ScheduleParticipant.user_id == user_id),
+        Schedule.date >= start, Schedule.date <= end
+    ).distinct().order_by(Schedule.date, Schedule.start_time).all()
+    return [schedule.to_dict() for schedule in schedules]
+
+
+def seed(db, models, events):
+    users, team, projects = seed_team(users=30, projects=4)
+    now = datetime.utcnow()
+    db.session.execute(models.Task.__table__.insert(), [
+        {'title': f'Task {i}', 'priority': 'medium', 'status': 'pending', 'project_id': project.id,
+         'created_by': users[0].id, 'requires_approval': False, 'created_at': now, 'updated_at': now}
+        for project in projects for i in range(TASKS_PER_PROJECT)
+    ])
+
+    first = date.today().replace(day=1)
+    schedules = [
+        models.Schedule(
+            title=f'Meeting {i}', date=first + timedelta(days=i % 28),
+            start_time=datetime.strptime(f'{8 + i % 9:02d}:00', '%H:%M').time(),
+            end_time=datetime.strptime(f'{9 + i % 9:02d}:00', '%H:%M').time(),
+            created_by=users[i % 30].id, project_id=projects[i % 4].id, team_id=team.id
+        )
+        for i in range(events)
+    ]
+    db.session.add_all(schedules)
+    db.session.flush()
+    db.session.execute(models.ScheduleParticipant.__table__.insert(), [
+        {'schedule_id': schedule.id, 'user_id': users[(i + k) % 30].id if k else users[0].id,
+         'response_status': 'accepted', 'is_organizer': k == 0, 'invited_at': now}
+        for i, schedule in enumerate(schedules) for k in range(4)
+    ])
+    db.session.commit()
+    return users[0].id, first, first + timedelta(days=27)
+
+
+def run(events, rounds):
+    app = create_bench_app()
+    from app.extensions import db
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id, start, end = seed(db, models, events)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        url = f'/api/schedules?start_date={start.isoformat()}&end_date={end.isoformat()}'
+        timer = QueryTimer(rounds)
+
+        def timed(fn):
+            seconds, queries, count = timer.time(fn)
+            assert count == events, count
+            return seconds, queries
+
+        def current():
+            with quiet():
+                response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.status_code
+            return response.json['total']
+
+        results = [
+            ('previous to_dict', timed(lambda: len(legacy_listing(user_id, start, end)))),
+            ('current listing', timed(current)),
+        ]
+        db.session.remove()
+        db.drop_all()
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    rounds = 3
+    if '--rounds' in args:
+        index = args.index('--rounds')
+        rounds = int(args[index + 1])
+        del args[index:index + 2]
+    sizes = [int(arg) for arg in args] or [100, 250, 500]
+
+    print(f"{'events':>6}  {'variant':<17} {'ms':>9} {'queries':>8}   (best of {rounds} rounds)")
+    for events in sizes:
+        for name, (seconds, queries) in run(events, rounds):
+            print(f"{events:>6}  {name:<17} {seconds * 1000:9.1f} {queries:8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark worker startup.
+
+Times how long a worker takes to import the app, create it and serve its
+first GET /health, with a simulated database connect latency of L ms
+(default 250, slept on every new connection):
+
+* a fresh interpreter that imports and creates the app: the old behaviour
+  (``STARTUP_DB_CHECK`` round trip and every email template compiled), no
+  check with the templates compiled, and neither (``gunicorn.conf.py``
+  without ``preload_app``)
+* a worker forked from a preloaded master (gunicorn ``--preload``), which
+  only disposes the inherited engine as ``gunicorn.conf.py`` does; the
+  master compiled the templates
+
+then the first GET /ready, where the database is contacted instead, and
+what the templates cost: compiling all of them up front, and the first and
+second render of one email when they are compiled lazily.
+
+Usage: python -m benchmarks.startup [latency_ms] [rounds]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR, quiet
+
+WORKER = '''
+import contextlib, io, logging, sys, time
+started = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+event.listen(Pool, 'connect', lambda *args: time.sleep({latency}))
+with contextlib.redirect_stdout(io.StringIO()):
+    from app import create_app
+    imported = time.perf_counter()
+    app = create_app('production')
+    logging.disable(logging.CRITICAL)
+    assert app.test_client().get('/health').status_code == 200
+print(imported - started, time.perf_counter() - imported)
+'''
+
+
+def fresh_worker(latency, startup_check, preload_templates):
+    """``(import, create and first /health)`` seconds in a new interpreter."""
+    env = dict(os.environ, STARTUP_DB_CHECK='true' if startup_check else 'false',
+               EMAIL_TEMPLATES_PRELOAD='true' if preload_templates else 'false')
+    output = subprocess.run([sys.executable, '-c', WORKER.format(latency=latency)], check=True,
+                            cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+    imported, created = map(float, output.split())
+    return imported, created
+
+
+def forked_worker(app, db):
+    """Fork from this (preloaded) process and time the child's first /health."""
+    read_end, write_end = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        with app.app_context():
+            db.engine.dispose(close=False)
+        ok = app.test_client().get('/health').status_code == 200
+        os.write(write_end, b'1' if ok else b'0')
+        os._exit(0)
+    result = os.read(read_end, 1)
+    elapsed = time.perf_counter() - started
+    os.waitpid(pid, 0)
+    assert result == b'1'
+    return elapsed
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 250) / 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    scratch = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{scratch.name}/bench.db'
+    os.environ['EMAIL_OUTBOX_SENDER'] = 'off'
+
+    def best_fresh(startup_check, preload_templates):
+        runs = [fresh_worker(latency, startup_check, preload_templates) for _ in range(rounds)]
+        return min(run[0] for run in runs), min(run[1] for run in runs)
+
+    results = [
+        ('fresh, check+templates', best_fresh(True, True)),
+        ('fresh, templates', best_fresh(False, True)),
+        ('fresh, lazy templates', best_fresh(False, False)),
+    ]
+
+    # As gunicorn.conf.py sets it for a preloading master
+    os.environ['EMAIL_TEMPLATES_PRELOAD'] = 'true'
+    import logging
+    from sqlalchemy import event
+    from sqlalchemy.pool import Pool
+    event.listen(Pool, 'connect', lambda *args: time.sleep(latency))
+    with quiet():
+        from app import create_app
+        from app.extensions import db
+        app = create_app('production')
+    logging.disable(logging.CRITICAL)
+    results.append(('forked from preload', (0.0, min(forked_worker(app, db) for _ in range(rounds)))))
+
+    started = time.perf_counter()
+    assert app.test_client().get('/ready').status_code == 200
+    first_ready = time.perf_counter() - started
+
+    from app.services.email_templates import EmailTemplateRegistry
+    with app.app_context():
+        preload_ms = app.extensions['email_templates'].stats()['preload_ms']
+        # A fresh registry and Jinja cache, as in a worker that compiles lazily
+        app.jinja_env.cache.clear()
+        lazy = EmailTemplateRegistry(app)
+        renders = []
+        for _ in range(2):
+            started = time.perf_counter()
+            lazy.render('otp_code', {'code': '123456'})
+            renders.append(time.perf_counter() - started)
+
+    print(f"connect latency {latency * 1000:.0f} ms, best of {rounds} rounds")
+    print(f"  {'':<22} {'imports':>9}  {'create + first /health':>22}")
+    for name, (imported, created) in results:
+        print(f"  {name:<22} {imported * 1000:6.1f} ms  {created * 1000:19.1f} ms")
+    print(f"  first /ready {first_ready * 1000:36.1f} ms")
+    print(f"  compile all email templates {preload_ms:21.1f} ms")
+    print(f"  lazy otp_code email, first render {renders[0] * 1000:15.1f} ms"
+          f", then {renders[1] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
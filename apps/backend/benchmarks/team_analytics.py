@@ -0,0 +1,136 @@
+"""Benchmark team analytics as a team grows.
+
+For each size M (default 10, 50 and 200 members) seeds an in-memory SQLite
+database with a team of M members, M / 5 projects and 200 tasks per
+project, then times GET /api/analytics/team/<id> against the previous
+implementation, which ran two COUNTs per member and three per project. The
+statement count of the endpoint should stay flat while the previous one
+grows with the team.
+
+Usage: python -m benchmarks.team_analytics [members ...] [--rounds N]
+"""
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+TASKS_PER_PROJECT = 200
+
+
+def legacy_analytics(team_id):
+    """The statistics part of the old endpoint, kept here for comparison.
+
+    Members are reported by email; the old ``User.username`` column no
+    longer exists.
+    """
+    from sqlalchemy import case, func
+
+    from app.extensions import db
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.team import TeamMember
+    from app.models.user import User
+
+    projects = Project.query.filter_by(team_id=team_id).all()
+    project_ids = [p.id for p in projects]
+    total_tasks = Task.query.filter(Task.project_id.in_(project_ids)).count()
+    completed_tasks = Task.query.filter(Task.project_id.in_(project_ids), Task.status == 'completed').count()
+
+    member_stats = []
+    for member in TeamMember.query.filter_by(team_id=team_id).all():
+        member_user = db.session.get(User, member.user_id)
+        assigned = Task.query.filter(
+            Task.project_id.in_(project_ids), Task.assigned_to == member.user_id
+        ).count()
+        completed = Task.query.filter(
+            Task.project_id.in_(project_ids), Task.assigned_to == member.user_id, Task.status == 'completed'
+        ).count()
+        member_stats.append((member_user.email, assigned, completed))
+
+    project_performance = []
+    for project in projects:
+        project_performance.append((
+            project.name,
+            Task.query.filter_by(project_id=project.id).count(),
+            Task.query.filter_by(project_id=project.id, status='completed').count(),
+            Task.query.filter(
+                Task.project_id == project.id,
+                Task.due_date < datetime.utcnow(),
+                Task.status != 'completed'
+            ).count(),
+        ))
+
+    timeline = db.session.query(
+        func.date(Task.created_at), func.count(Task.id), func.sum(case((Task.status == 'completed', 1), else_=0))
+    ).filter(
+        Task.project_id.in_(project_ids),
+        Task.created_at >= datetime.utcnow() - timedelta(days=7)
+    ).group_by(func.date(Task.created_at)).all()
+    return total_tasks, completed_tasks, member_stats, project_performance, timeline
+
+
+def seed(db, models, member_count):
+    users, team, projects = seed_team(users=member_count, projects=max(1, member_count // 5))
+
+    now = datetime.utcnow()
+    statuses = ['pending', 'in_progress', 'completed', 'cancelled']
+    db.session.execute(models.Task.__table__.insert(), [
+        {'title': f'Task {i}', 'description': '', 'project_id': project.id,
+         'created_by': users[0].id, 'assigned_to': users[i % member_count].id,
+         'status': statuses[i % 4], 'priority': 'medium', 'requires_approval': False,
+         'due_date': now + timedelta(days=i % 14 - 7),
+         'created_at': now - timedelta(days=i % 10), 'updated_at': now}
+        for project in projects for i in range(TASKS_PER_PROJECT)
+    ])
+    # The bulk insert skips the counter hooks
+    models.ProjectTaskStats.rebuild([project.id for project in projects])
+    db.session.commit()
+    return users[0].id, team.id, len(projects)
+
+
+def run(member_count, rounds):
+    app = create_bench_app()
+    from app.extensions import db
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id, team_id, project_count = seed(db, models, member_count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        timer = QueryTimer(rounds)
+
+        def current():
+            with quiet():
+                response = client.get(f'/api/analytics/team/{team_id}', headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        seconds, queries, _ = timer.time(lambda: legacy_analytics(team_id))
+        results = [('previous analytics', (seconds, queries))]
+        seconds, queries, _ = timer.time(current)
+        results.append(('current analytics', (seconds, queries)))
+        db.session.remove()
+        db.drop_all()
+    return project_count, results
+
+
+def main():
+    args = sys.argv[1:]
+    rounds = 3
+    if '--rounds' in args:
+        index = args.index('--rounds')
+        rounds = int(args[index + 1])
+        del args[index:index + 2]
+    sizes = [int(arg) for arg in args] or [10, 50, 200]
+
+    print(f"{'members':>7} {'projects':>8} {'tasks':>6}  {'variant':<19} {'ms':>9} {'queries':>8}"
+          f"   (best of {rounds} rounds)")
+    for members in sizes:
+        project_count, results = run(members, rounds)
+        for name, (seconds, queries) in results:
+            print(f"{members:>7} {project_count:>8} {project_count * TASKS_PER_PROJECT:>6}  "
+                  f"{name:<19} {seconds * 1000:9.1f} {queries:8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark team listings for a user in many large teams.
+
+Seeds an in-memory SQLite database with one user who belongs to T teams
+(default 50), each with M members (default 500) and five departments of
+M / 5 members, then times:
+
+* serializing the teams the old way, with ``len(team.members)`` and
+  ``len(team.departments)``
+* ``serialize_teams`` (counts from grouped aggregate subqueries)
+* GET /api/teams/
+
+Usage: python -m benchmarks.team_listing [teams] [members] [rounds]
+"""
+import sys
+from datetime import datetime
+
+from benchmarks.common import QueryTimer, auth_headers, create_bench_app, quiet, seed_team
+
+DEPARTMENTS = 5
+
+
+def legacy_listing(teams):
+    """Old behaviour: load every membership and department to count them."""
+    listing = []
+    for team in teams:
+        data = team.to_dict(member_count=0, department_count=0)
+        data['member_count'] = len(team.members)
+        data['department_count'] = len(team.departments)
+        listing.append(data)
+    return listing
+
+
+def seed(db, models, team_count, member_count):
+    users, first, _ = seed_team(users=member_count, name='Team 0')
+    others = [models.Team(name=f'Team {i}', created_by=users[0].id) for i in range(1, team_count)]
+    db.session.add_all(others)
+    db.session.flush()
+    teams = [first] + others
+    departments = [models.Department(name=f'Department {i}', team_id=team.id)
+                   for team in teams for i in range(DEPARTMENTS)]
+    db.session.add_all(departments)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    db.session.execute(models.TeamMember.__table__.insert(), [
+        {'team_id': team.id, 'user_id': user.id, 'role': 'member', 'joined_at': now}
+        for team in others for user in users
+    ])
+    db.session.execute(models.UserDepartment.__table__.insert(), [
+        {'department_id': department.id, 'user_id': user.id, 'assigned_at': now}
+        for index, department in enumerate(departments)
+        for user in users[index % DEPARTMENTS::DEPARTMENTS]
+    ])
+    db.session.commit()
+    return users[0].id
+
+
+def main():
+    team_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    member_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    app = create_bench_app()
+    from app.extensions import db
+    from app.services.serializers import serialize_teams
+    import app.models as models
+
+    with app.app_context():
+        db.create_all()
+        user_id = seed(db, models, team_count, member_count)
+        headers = auth_headers(user_id)
+        client = app.test_client()
+        timer = QueryTimer(rounds)
+
+        def teams():
+            return models.Team.query.join(models.TeamMember).filter(
+                models.TeamMember.user_id == user_id
+            ).all()
+
+        def endpoint():
+            with quiet():
+                response = client.get('/api/teams/', headers=headers)
+            assert response.status_code == 200, response.status_code
+
+        legacy = legacy_listing(teams())
+        db.session.expunge_all()
+        assert legacy == serialize_teams(teams())
+
+        results = [
+            ('len(collections)', timer.time(lambda: legacy_listing(teams()))),
+            ('serialize_teams', timer.time(lambda: serialize_teams(teams()))),
+            ('GET /api/teams/', timer.time(endpoint)),
+        ]
+
+    print(f"{team_count} teams x {member_count} members, {DEPARTMENTS} departments each, "
+          f"best of {rounds} rounds")
+    for name, (seconds, queries, _) in results:
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms  {queries:4d} queries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""pytest configuration for the backend.
+
+The test_*.py scripts next to this file are run by hand against a configured
+database and mail server. The test suite lives in tests/.
+"""
+collect_ignore = ['test_email.py', 'test_sendgrid.py', 'test_server.py', 'test_templates.py']
@@ -0,0 +1,47 @@
+"""Gunicorn settings, loaded with ``gunicorn -c gunicorn.conf.py run:app``.
+
+With ``preload_app`` the master imports the app, registers the blueprints and
+compiles the email templates (``EMAIL_TEMPLATES_PRELOAD``) once and forks
+ready workers, instead of every worker doing it at boot.
+Nothing touches the database while the app is created (see
+``STARTUP_DB_CHECK``), and ``post_fork`` drops any pooled connections a
+worker inherited so no socket is shared between processes. Once a worker
+has loaded the app, ``post_worker_init`` applies ``DB_STATEMENT_TIMEOUT_MS``
+to its connections; CLI commands and migrations never run these hooks.
+
+Environment:
+    PORT: Port to bind (default 5000)
+    WEB_CONCURRENCY: Number of worker processes (default 4)
+    GUNICORN_TIMEOUT: Worker timeout in seconds (default 120)
+    GUNICORN_PRELOAD: Load the app in the master before forking (default true)
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+# Read by app.config, which the master imports after this file
+os.environ.setdefault('EMAIL_TEMPLATES_PRELOAD', 'true' if preload_app else 'false')
+
+
+def post_fork(server, worker):
+    """Give each preloaded worker its own database connections."""
+    if not server.cfg.preload_app:
+        return
+    from app.extensions import db
+    from run import app
+
+    with app.app_context():
+        # close=False leaves the master's connections open for the master
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Bound each web request's queries with the configured statement timeout."""
+    from app.db_pool import enable_statement_timeout
+    from app.extensions import db
+    from run import app
+
+    with app.app_context():
+        enable_statement_timeout(db.engine, app.config['DB_STATEMENT_TIMEOUT_MS'])
@@ -0,0 +1,26 @@
+"""Add schedule date index
+
+Revision ID: a1c5e7f93d24
+Revises: f4d2a8c61b93
+Create Date: 2026-10-18 19:12:44.031587
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c5e7f93d24'
+down_revision = 'f4d2a8c61b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.create_index('idx_schedule_date_start', ['date', 'start_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index('idx_schedule_date_start')
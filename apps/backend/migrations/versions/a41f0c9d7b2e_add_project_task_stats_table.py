@@ -0,0 +1,56 @@
+"""Add project_task_stats table
+
+Revision ID: a41f0c9d7b2e
+Revises: 3827b7f2e6fa
+Create Date: 2026-10-18 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f0c9d7b2e'
+down_revision = '3827b7f2e6fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.Column('high', sa.Integer(), nullable=False),
+    sa.Column('medium', sa.Integer(), nullable=False),
+    sa.Column('low', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Backfill counters for existing projects
+    op.execute("""
+        INSERT INTO project_task_stats
+            (project_id, total, pending, in_progress, completed, cancelled, high, medium, low, updated_at)
+        SELECT p.id,
+               COUNT(t.id),
+               COUNT(CASE WHEN t.status = 'pending' THEN 1 END),
+               COUNT(CASE WHEN t.status = 'in_progress' THEN 1 END),
+               COUNT(CASE WHEN t.status = 'completed' THEN 1 END),
+               COUNT(CASE WHEN t.status = 'cancelled' THEN 1 END),
+               COUNT(CASE WHEN t.priority = 'high' THEN 1 END),
+               COUNT(CASE WHEN t.priority = 'medium' THEN 1 END),
+               COUNT(CASE WHEN t.priority = 'low' THEN 1 END),
+               CURRENT_TIMESTAMP
+        FROM projects p
+        LEFT OUTER JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+    """)
+
+
+def downgrade():
+    op.drop_table('project_task_stats')
@@ -0,0 +1,36 @@
+"""Add recurring task start date
+
+Existing templates start at their earliest generated task, or at their next
+due date if they have not generated one yet.
+
+Revision ID: b5d1e8a3c642
+Revises: a1c5e7f93d24
+Create Date: 2026-10-18 21:05:37.418260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d1e8a3c642'
+down_revision = 'a1c5e7f93d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('recurring_tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('start_date', sa.DateTime(), nullable=True))
+
+    op.execute("""
+        UPDATE recurring_tasks SET start_date = COALESCE(
+            (SELECT MIN(tasks.due_date) FROM tasks WHERE tasks.recurring_task_id = recurring_tasks.id),
+            next_due_date
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('recurring_tasks', schema=None) as batch_op:
+        batch_op.drop_column('start_date')
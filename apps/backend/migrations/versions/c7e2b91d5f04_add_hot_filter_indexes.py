@@ -0,0 +1,50 @@
+"""Add indexes for hot task, membership, comment and participant filters
+
+Revision ID: c7e2b91d5f04
+Revises: a41f0c9d7b2e
+Create Date: 2026-10-18 11:37:02.914327
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2b91d5f04'
+down_revision = 'a41f0c9d7b2e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('idx_task_project_status', ['project_id', 'status'], unique=False)
+        batch_op.create_index('idx_task_assignee_status_due', ['assigned_to', 'status', 'due_date'], unique=False)
+        batch_op.create_index('idx_task_project_completed', ['project_id', 'completed_at'], unique=False)
+        batch_op.create_index('idx_task_created_by', ['created_by'], unique=False)
+
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.create_index('idx_team_member_user', ['user_id'], unique=False)
+
+    with op.batch_alter_table('task_comments', schema=None) as batch_op:
+        batch_op.create_index('idx_comment_task_created', ['task_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('schedule_participants', schema=None) as batch_op:
+        batch_op.create_index('idx_schedule_participant_user', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schedule_participants', schema=None) as batch_op:
+        batch_op.drop_index('idx_schedule_participant_user')
+
+    with op.batch_alter_table('task_comments', schema=None) as batch_op:
+        batch_op.drop_index('idx_comment_task_created')
+
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.drop_index('idx_team_member_user')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('idx_task_created_by')
+        batch_op.drop_index('idx_task_project_completed')
+        batch_op.drop_index('idx_task_assignee_status_due')
+        batch_op.drop_index('idx_task_project_status')
@@ -0,0 +1,42 @@
+"""Unique task per recurring template occurrence
+
+Revision ID: e9b4c1a7d352
+Revises: d3a8f06c2b71
+Create Date: 2026-10-18 16:20:44.108531
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c1a7d352'
+down_revision = 'd3a8f06c2b71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier generator runs could create the same occurrence twice. Keep the
+    # oldest task linked to its template and detach the rest (they stay as
+    # ordinary tasks) so the unique index can be built.
+    op.execute(
+        """
+        UPDATE tasks SET recurring_task_id = NULL
+        WHERE recurring_task_id IS NOT NULL
+          AND id NOT IN (
+            SELECT keep_id FROM (
+              SELECT MIN(id) AS keep_id FROM tasks
+              WHERE recurring_task_id IS NOT NULL
+              GROUP BY recurring_task_id, due_date
+            ) AS first_occurrences
+          )
+        """
+    )
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('uq_task_recurring_due', ['recurring_task_id', 'due_date'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('uq_task_recurring_due')
@@ -0,0 +1,55 @@
+"""Add upcoming occurrences index for recurring tasks
+
+Rows are filled by `flask index-upcoming-occurrences` (or the next recurring
+task generation run), since every template starts with indexed_until NULL.
+
+Revision ID: f4d2a8c61b93
+Revises: e9b4c1a7d352
+Create Date: 2026-10-18 17:41:06.582930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4d2a8c61b93'
+down_revision = 'e9b4c1a7d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upcoming_occurrences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recurring_task_id', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recurring_task_id'], ['recurring_tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('upcoming_occurrences', schema=None) as batch_op:
+        batch_op.create_index('uq_upcoming_occurrence', ['recurring_task_id', 'due_date'], unique=True)
+        batch_op.create_index('idx_upcoming_due', ['due_date'], unique=False)
+        batch_op.create_index('idx_upcoming_assignee_due', ['assigned_to', 'due_date'], unique=False)
+        batch_op.create_index('idx_upcoming_project_due', ['project_id', 'due_date'], unique=False)
+        batch_op.create_index('idx_upcoming_creator_due', ['created_by', 'due_date'], unique=False)
+
+    with op.batch_alter_table('recurring_tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('indexed_until', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('recurring_tasks', schema=None) as batch_op:
+        batch_op.drop_column('indexed_until')
+
+    with op.batch_alter_table('upcoming_occurrences', schema=None) as batch_op:
+        batch_op.drop_index('idx_upcoming_creator_due')
+        batch_op.drop_index('idx_upcoming_project_due')
+        batch_op.drop_index('idx_upcoming_assignee_due')
+        batch_op.drop_index('idx_upcoming_due')
+        batch_op.drop_index('uq_upcoming_occurrence')
+
+    op.drop_table('upcoming_occurrences')
@@ -4,7 +4,9 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 from app import create_app
+from app.extensions import db
 from app.services.email_service import EmailService
+from app.services.email_outbox import OutboxSender
 
 # Load environment variables
 load_dotenv()
@@ -51,6 +53,14 @@ def test_email_functionality():
         else:
             print("⚠️ No admin email configured - skipping admin notification test")
         
+        # Emails are queued in this session; commit them so the sender can claim them
+        db.session.commit()
+        print("\n📤 Delivering queued emails...")
+        sender = OutboxSender(app)
+        stats = sender.run_once()
+        sender.shutdown()
+        print(f"✅ Outbox: {stats}")
+        
         print("\n🎉 Email testing complete!")
         
         if app.config.get('MAIL_SUPPRESS_SEND'):
@@ -0,0 +1,95 @@
+"""Shared base class for tests that drive the API against a fresh database."""
+import contextlib
+import io
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.project import Project  # noqa: E402
+from app.models.team import Team, TeamMember  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+class AppTestCase(unittest.TestCase):
+    """An app on in-memory SQLite, created and dropped around every test.
+
+    Routes print debugging output, so requests made through ``get``/``post``
+    etc. run with stdout captured. ``statements`` records every SQL statement
+    executed, for query-count assertions.
+    """
+
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app = create_app('testing')
+        logging.disable(logging.CRITICAL)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record_statement)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record_statement)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        logging.disable(logging.NOTSET)
+
+    def _record_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    @contextlib.contextmanager
+    def count_queries(self):
+        """Collect the statements run inside the block, starting from an empty session."""
+        db.session.expunge_all()
+        self.statements.clear()
+        captured = []
+        yield captured
+        captured.extend(self.statements)
+
+    def request(self, method, url, user_id=None, **kwargs):
+        headers = kwargs.pop('headers', {})
+        if user_id is not None:
+            headers['Authorization'] = f'Bearer {create_access_token(identity=str(user_id))}'
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.client.open(url, method=method, headers=headers, **kwargs)
+
+    def get(self, url, user_id=None, **kwargs):
+        return self.request('GET', url, user_id, **kwargs)
+
+    def post(self, url, user_id=None, **kwargs):
+        return self.request('POST', url, user_id, **kwargs)
+
+    def put(self, url, user_id=None, **kwargs):
+        return self.request('PUT', url, user_id, **kwargs)
+
+    def make_users(self, count, prefix='user'):
+        users = [User(email=f'{prefix}{i}@example.com', password_hash='x') for i in range(count)]
+        db.session.add_all(users)
+        db.session.flush()
+        return users
+
+    def make_team(self, owner, members=(), name='Team'):
+        """A team owned by ``owner`` with ``members`` as plain members."""
+        team = Team(name=name, created_by=owner.id)
+        db.session.add(team)
+        db.session.flush()
+        db.session.add(TeamMember(team_id=team.id, user_id=owner.id, role='owner'))
+        db.session.add_all(TeamMember(team_id=team.id, user_id=user.id) for user in members)
+        db.session.flush()
+        return team
+
+    def make_project(self, team, name='Project'):
+        project = Project(name=name, team_id=team.id, created_by=team.created_by)
+        db.session.add(project)
+        db.session.flush()
+        return project
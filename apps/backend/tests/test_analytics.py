@@ -0,0 +1,104 @@
+"""Tests for the analytics dashboard endpoints."""
+import unittest
+from datetime import datetime, timedelta
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+
+
+class ProjectAnalyticsTestCase(AppTestCase):
+
+    def seed(self, count):
+        """A project with ``count`` tasks spread over four assignees, statuses and priorities."""
+        users = self.make_users(4, prefix=f'project{count}-')
+        owner = users[0]
+        project = self.make_project(self.make_team(owner, users[1:], name=f'Team {count}'))
+        now = datetime.utcnow()
+        statuses = ('pending', 'in_progress', 'completed', 'cancelled')
+        tasks = [
+            Task(title=f'Task {i}', project_id=project.id, created_by=owner.id,
+                 assigned_to=users[i % 4].id, status=statuses[i % 4],
+                 priority=('high', 'medium', 'low')[i % 3],
+                 created_at=now - timedelta(days=3),
+                 completed_at=now - timedelta(days=1) if statuses[i % 4] == 'completed' else None,
+                 due_date=now - timedelta(days=2) if i % 2 else now + timedelta(days=2))
+            for i in range(count)
+        ]
+        db.session.add_all(tasks)
+        db.session.flush()
+        db.session.add_all(TaskComment(task_id=task.id, user_id=owner.id, content='Note') for task in tasks[:5])
+        db.session.commit()
+        return owner.id, project.id
+
+    def test_overview(self):
+        user_id, project_id = self.seed(40)
+        response = self.get(f'/api/analytics/project/{project_id}', user_id)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['overview'], {
+            'total_tasks': 40, 'completed_tasks': 10, 'in_progress_tasks': 10,
+            'pending_tasks': 10, 'cancelled_tasks': 10,
+            # Odd indexes are past due and none of them is completed
+            'overdue_tasks': 20, 'completion_rate': 25.0, 'avg_completion_days': 2.0,
+            'total_comments': 5,
+        })
+        self.assertEqual([item['count'] for item in body['assignee_distribution']], [10] * 4)
+        self.assertEqual(sum(item['count'] for item in body['priority_distribution']), 40)
+        self.assertEqual(body['project']['task_count'], 40)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        for count in (10, 1000):
+            user_id, project_id = self.seed(count)
+            with self.count_queries() as statements:
+                response = self.get(f'/api/analytics/project/{project_id}', user_id)
+            self.assertEqual(response.get_json()['overview']['total_tasks'], count)
+            # Access check, counters, timing, timeline, assignees, comments, milestones
+            self.assertEqual(len(statements), 7, statements)
+
+
+class TeamAnalyticsTestCase(AppTestCase):
+
+    def seed(self, members, projects, tasks_per_project):
+        users = self.make_users(members, prefix=f'team{members}-')
+        owner = users[0]
+        team = self.make_team(owner, users[1:], name=f'Team {members}')
+        for p in range(projects):
+            project = self.make_project(team, f'Project {p}')
+            db.session.add_all(
+                Task(title=f'Task {i}', project_id=project.id, created_by=owner.id,
+                     assigned_to=users[i % members].id, status='completed' if i % 2 else 'pending')
+                for i in range(tasks_per_project)
+            )
+        db.session.commit()
+        return owner.id, team.id
+
+    def test_statistics(self):
+        user_id, team_id = self.seed(members=3, projects=2, tasks_per_project=6)
+        response = self.get(f'/api/analytics/team/{team_id}', user_id)
+        body = response.get_json()
+        self.assertEqual(body['overview'], {
+            'total_projects': 2, 'active_projects': 2, 'total_tasks': 12,
+            'completed_tasks': 6, 'team_members': 3, 'overall_completion_rate': 50.0,
+        })
+        self.assertEqual([member['assigned_tasks'] for member in body['member_statistics']], [4, 4, 4])
+        self.assertEqual([project['completed_tasks'] for project in body['project_performance']], [3, 3])
+
+        outsider, = self.make_users(1, prefix='outsider')
+        db.session.commit()
+        self.assertEqual(self.get(f'/api/analytics/team/{team_id}', outsider.id).status_code, 403)
+
+    def test_query_count_does_not_grow_with_teams_or_members(self):
+        for members, projects in ((2, 1), (10, 5), (40, 20)):
+            user_id, team_id = self.seed(members, projects, tasks_per_project=members)
+            with self.count_queries() as statements:
+                response = self.get(f'/api/analytics/team/{team_id}', user_id)
+            self.assertEqual(len(response.get_json()['member_statistics']), members)
+            # Membership, projects, per-project, members, per-assignee, timeline
+            self.assertEqual(len(statements), 6, statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
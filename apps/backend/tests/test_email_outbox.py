@@ -0,0 +1,227 @@
+"""Tests for the email outbox sender against a local SMTP stand-in."""
+import os
+import socketserver
+import sys
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db, mail  # noqa: E402
+from app.models.email_outbox import EmailOutbox  # noqa: E402
+from app.services.email_outbox import OutboxSender  # noqa: E402
+from app.services.email_service import EmailService  # noqa: E402
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts every message unless told to fail."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        if server.close_on_accept:
+            return
+        self.reply('220 localhost test SMTP')
+        recipients, lines, in_data = [], [], False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if in_data:
+                if line in (b'.\r\n', b'.\n'):
+                    in_data = False
+                    with server.lock:
+                        if server.fail_next > 0:
+                            server.fail_next -= 1
+                            self.reply('451 Try again later')
+                        else:
+                            server.messages.append((recipients, b''.join(lines)))
+                            self.reply('250 OK')
+                    recipients, lines = [], []
+                else:
+                    lines.append(line)
+                continue
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.reply('250 localhost')
+            elif command in (b'MAIL', b'RSET', b'NOOP'):
+                self.reply('250 OK')
+            elif command == b'RCPT':
+                recipients.append(line.decode().strip())
+                self.reply('250 OK')
+            elif command == b'DATA':
+                in_data = True
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Not implemented')
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.fail_next = 0
+        self.close_on_accept = False
+        self.messages = []
+
+
+class EmailOutboxTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.smtp = _SMTPServer()
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+
+        self.app = create_app('testing')
+        self.app.config.update(
+            MAIL_SERVER='127.0.0.1',
+            MAIL_PORT=self.smtp.server_address[1],
+            MAIL_USE_TLS=False,
+            MAIL_USE_SSL=False,
+            MAIL_USERNAME=None,
+            MAIL_PASSWORD=None,
+            MAIL_SUPPRESS_SEND=False,
+            EMAIL_OUTBOX_WORKERS=4,
+            EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+        )
+        mail.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.sender = OutboxSender(self.app)
+
+    def tearDown(self):
+        self.sender.shutdown()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+    def queue(self, count):
+        for i in range(count):
+            self.assertTrue(EmailService.queue_email(
+                to=[f'user{i}@example.com'],
+                subject=f'Hello {i}',
+                template='verify_email',
+                template_data={'email': f'user{i}@example.com', 'verify_url': 'http://example.com'}
+            ))
+        db.session.commit()
+
+    def make_due(self):
+        EmailOutbox.query.update({'next_attempt_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+    def test_queue_email_does_not_touch_smtp(self):
+        self.queue(1)
+        entry = EmailOutbox.query.one()
+        self.assertEqual(entry.status, 'pending')
+        self.assertIn('http://example.com', entry.html)
+        self.assertEqual(self.smtp.connections, 0)
+
+    def test_queued_email_joins_the_callers_transaction(self):
+        EmailService.queue_email(
+            to=['user@example.com'], subject='Hello', template='verify_email',
+            template_data={'email': 'user@example.com', 'verify_url': 'http://example.com'}
+        )
+        db.session.rollback()
+        self.assertEqual(EmailOutbox.query.count(), 0)
+
+    def test_batch_reuses_one_connection_per_worker(self):
+        self.queue(40)
+        stats = self.sender.run_once()
+
+        self.assertEqual(stats['sent'], 40)
+        self.assertEqual(len(self.smtp.messages), 40)
+        self.assertEqual(self.smtp.connections, 4)
+        db.session.expire_all()
+        self.assertEqual(EmailOutbox.query.filter_by(status='sent').count(), 40)
+
+    def test_transient_failure_is_retried_with_backoff(self):
+        self.queue(1)
+        self.smtp.fail_next = 1
+
+        stats = self.sender.run_once()
+        self.assertEqual(stats['retrying'], 1)
+        entry = EmailOutbox.query.one()
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn('451', entry.last_error)
+        self.assertGreater(entry.next_attempt_at, datetime.utcnow())
+
+        # Not due yet, so nothing is claimed
+        self.assertEqual(self.sender.run_once()['claimed'], 0)
+
+        self.make_due()
+        self.assertEqual(self.sender.run_once()['sent'], 1)
+        entry = EmailOutbox.query.one()
+        self.assertEqual((entry.status, entry.attempts), ('sent', 2))
+
+    def test_gives_up_after_max_attempts(self):
+        self.queue(1)
+        self.smtp.fail_next = 10
+        for _ in range(3):
+            self.make_due()
+            self.sender.run_once()
+        entry = EmailOutbox.query.one()
+        self.assertEqual((entry.status, entry.attempts), ('failed', 3))
+
+    def test_unreachable_server_keeps_messages_queued(self):
+        self.queue(3)
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+        stats = self.sender.run_once()
+        self.assertEqual(stats['retrying'], 3)
+        self.assertEqual(EmailOutbox.query.filter_by(status='pending').count(), 3)
+
+    def test_server_closing_on_accept_does_not_reconnect_forever(self):
+        self.queue(3)
+        self.smtp.close_on_accept = True
+
+        worker = threading.Thread(target=lambda: setattr(self, 'stats', self.sender.run_once()))
+        worker.start()
+        worker.join(timeout=10)
+        self.assertFalse(worker.is_alive())
+
+        self.assertEqual(self.stats['retrying'], 3)
+        self.assertLessEqual(self.smtp.connections, self.sender.workers)
+        db.session.expire_all()
+        self.assertTrue(all(entry.last_error for entry in EmailOutbox.query.all()))
+
+    def test_bulk_email_renders_once_and_reuses_connections(self):
+        recipients = [f'user{i}@example.com' for i in range(120)]
+        stats = EmailService.send_bulk_email(
+            recipients, 'Announcement', 'verify_email',
+            template_data={'verify_url': 'http://example.com'},
+            batch_size=50,
+            recipient_data={'user0@example.com': {'email': 'vip'}}
+        )
+
+        self.assertEqual((stats['sent'], stats['failed']), (120, 0))
+        self.assertEqual(stats['renders'], 2)
+        self.assertEqual([b['size'] for b in stats['batches']], [50, 50, 20])
+        self.assertEqual(self.smtp.connections, 3)
+        self.assertEqual(len(self.smtp.messages), 120)
+
+    def test_backoff_grows_exponentially(self):
+        self.sender.backoff_base = 10
+        for attempts, expected in ((1, 10), (2, 20), (3, 40)):
+            delay = self.sender.backoff(attempts).total_seconds()
+            self.assertTrue(expected * 0.8 <= delay <= expected * 1.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for the compiled email template registry."""
+import unittest
+from unittest import mock
+
+from support import AppTestCase
+
+from app.services.email_templates import get_registry, init_email_templates
+
+
+class EmailTemplateRegistryTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.registry = get_registry()
+
+    def loader_lookups(self):
+        """Record template file lookups made through the app's Jinja loader."""
+        loader = self.app.jinja_env.loader
+        return mock.patch.object(loader, 'get_source', wraps=loader.get_source)
+
+    def test_templates_are_compiled_on_first_render(self):
+        self.assertEqual(self.registry.stats()['compiled'], [])
+        with self.loader_lookups() as lookup:
+            self.registry.render('otp_code', {'code': '123456'})
+        # The HTML version extends base.html
+        self.assertEqual(sorted(call.args[1] for call in lookup.call_args_list),
+                         ['email/base.html', 'email/otp_code.html', 'email/otp_code.txt'])
+        self.assertEqual(self.registry.stats()['compiled'], ['email/otp_code.html', 'email/otp_code.txt'])
+        with self.loader_lookups() as lookup:
+            self.registry.render('otp_code', {'code': '123456'})
+        lookup.assert_not_called()
+
+    def test_preload_compiles_every_template(self):
+        self.app.config['EMAIL_TEMPLATES_PRELOAD'] = True
+        init_email_templates(self.app)
+        registry = get_registry()
+        self.assertIn('email/otp_code.html', registry.stats()['compiled'])
+        self.assertIn('email/otp_code.txt', registry.stats()['compiled'])
+        with self.loader_lookups() as lookup:
+            registry.render('otp_code', {'code': '123456'})
+        lookup.assert_not_called()
+
+    def test_render(self):
+        html, body = self.registry.render('otp_code', {'code': '482913'})
+        self.assertIn('482913', html)
+        self.assertIn('<html', html.lower())
+        self.assertTrue(body.startswith('Your Granula login code: 482913'))
+        self.assertEqual(self.registry.stats()['templates']['otp_code']['renders'], 1)
+
+    def test_missing_template_is_looked_up_once(self):
+        with self.loader_lookups() as lookup, mock.patch.object(self.app.logger, 'warning') as warning:
+            for _ in range(3):
+                self.assertEqual(self.registry.render('no_such_email', {}), (None, None))
+        self.assertEqual(sorted(call.args[1] for call in lookup.call_args_list),
+                         ['email/no_such_email.html', 'email/no_such_email.txt'])
+        self.assertEqual(warning.call_count, 2)
+        self.assertEqual(self.registry.stats()['missing'],
+                         ['email/no_such_email.html', 'email/no_such_email.txt'])
+        self.assertEqual(self.registry.stats()['templates']['no_such_email']['renders'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for free/busy lookups and schedule conflict detection."""
+import unittest
+from datetime import date, datetime, time
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.schedule import Schedule, ScheduleParticipant
+from app.services.freebusy import BusyIndex, find_conflicts
+
+DAY = date(2026, 11, 2)
+
+
+class FreeBusyTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice, self.bob, self.outsider = self.make_users(3)
+        self.make_team(self.alice, members=[self.bob])
+        db.session.commit()
+
+    def meeting(self, start, end, *attendees, day=DAY, **fields):
+        schedule = Schedule(title='Meeting', date=day, start_time=start, end_time=end,
+                            created_by=attendees[0].id, **fields)
+        db.session.add(schedule)
+        db.session.flush()
+        db.session.add_all(
+            ScheduleParticipant(schedule_id=schedule.id, user_id=user.id, response_status='accepted')
+            for user in attendees
+        )
+        db.session.commit()
+        return schedule
+
+    def test_busy_merges_overlapping_blocks(self):
+        self.meeting(time(9), time(10), self.alice)
+        self.meeting(time(9, 30), time(11), self.alice, self.bob)
+        self.meeting(time(14), time(15), self.alice)
+        index = BusyIndex.load([self.alice.id, self.bob.id], DAY, DAY)
+
+        at = lambda hour, minute=0: datetime.combine(DAY, time(hour, minute))  # noqa: E731
+        self.assertEqual(index.busy(self.alice.id), [(at(9), at(11)), (at(14), at(15))])
+        self.assertEqual(index.busy(self.bob.id), [(at(9, 30), at(11))])
+        self.assertEqual([i[0] for i in index.overlapping(self.alice.id, at(10, 30), at(14, 30))],
+                         [at(9, 30), at(14)])
+        self.assertEqual(index.overlapping(self.alice.id, at(11), at(14)), [])
+
+    def test_cancelled_and_declined_events_are_free(self):
+        self.meeting(time(9), time(10), self.alice, status='cancelled')
+        declined = self.meeting(time(11), time(12), self.alice)
+        ScheduleParticipant.query.filter_by(schedule_id=declined.id).update({'response_status': 'declined'})
+        db.session.commit()
+        self.assertEqual(BusyIndex.load([self.alice.id], DAY, DAY).busy(self.alice.id), [])
+
+    def test_recurring_series_conflicts(self):
+        self.meeting(time(9), time(9, 15), self.bob, day=date(2026, 10, 1),
+                     is_recurring=True, recurring_pattern='daily')
+        candidate = Schedule(title='New', date=DAY, start_time=time(9, 10), end_time=time(10))
+        conflicts = find_conflicts(candidate, [self.alice.id, self.bob.id])
+        self.assertEqual([(c['user_id'], c['start']) for c in conflicts], [(self.bob.id, '2026-11-02T09:00:00')])
+
+    def test_freebusy_endpoint(self):
+        self.meeting(time(9), time(10), self.bob)
+        self.meeting(time(9, 30), time(10, 30), self.bob)
+        url = f'/api/schedules/freebusy?start_date={DAY}&end_date={DAY}'
+
+        response = self.get(f'{url}&user_ids={self.alice.id},{self.bob.id}', self.alice.id)
+        self.assertEqual(response.status_code, 200)
+        users = {user['user_id']: user['busy'] for user in response.get_json()['users']}
+        self.assertEqual(users, {
+            self.alice.id: [],
+            self.bob.id: [{'start': f'{DAY}T09:00:00', 'end': f'{DAY}T10:30:00'}],
+        })
+
+        response = self.get(f'{url}&user_ids={self.outsider.id}', self.alice.id)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.get_json()['user_ids'], [self.outsider.id])
+
+        self.assertEqual(self.get(f'{url}&user_ids=x', self.alice.id).status_code, 400)
+
+    def create(self, **fields):
+        body = {'title': 'Sync', 'date': DAY.isoformat(), 'start_time': '09:30', 'end_time': '10:30', **fields}
+        return self.post('/api/schedules', self.alice.id, json=body)
+
+    def test_create_reports_or_rejects_conflicts(self):
+        self.meeting(time(9), time(10), self.bob)
+        participants = [{'user_id': self.bob.id}]
+
+        response = self.create(participants=participants, reject_conflicts=True)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Schedule.query.count(), 1)
+
+        response = self.create(participants=participants)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([c['user_id'] for c in response.get_json()['conflicts']], [self.bob.id])
+
+    def test_create_accepts_numeric_string_ids_and_rejects_bad_ones(self):
+        response = self.create(participants=[{'user_id': str(self.bob.id)}])
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(self.bob.id, [p['user_id'] for p in response.get_json()['schedule']['participants']])
+
+        self.assertEqual(self.create(participants=[{'user_id': 'bob'}]).status_code, 400)
+        self.assertEqual(self.create(participants=[{'user_id': [1]}]).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
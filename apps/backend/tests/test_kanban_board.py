@@ -0,0 +1,52 @@
+"""Tests for the Kanban board endpoints."""
+import unittest
+from datetime import datetime, timedelta
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.task import Task
+
+
+class ProjectKanbanBoardTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner, = self.make_users(1)
+        self.project = self.make_project(self.make_team(self.owner))
+        db.session.commit()
+        self.url = f'/api/kanban/project/{self.project.id}/board'
+
+    def add_tasks(self, count):
+        now = datetime.utcnow()
+        statuses = ('pending', 'in_progress', 'completed', 'cancelled')
+        db.session.add_all(
+            Task(title=f'Task {i}', project_id=self.project.id, created_by=self.owner.id,
+                 status=statuses[i % 4], due_date=now - timedelta(days=1))
+            for i in range(count)
+        )
+        db.session.commit()
+
+    def test_columns_and_statistics(self):
+        self.add_tasks(8)
+        body = self.get(self.url, self.owner.id).get_json()
+        self.assertEqual({column['id']: len(column['tasks']) for column in body['columns']}, {
+            'pending': 2, 'in_progress': 2, 'pending_approval': 0, 'completed': 2, 'cancelled': 2,
+        })
+        self.assertEqual(body['statistics'], {
+            'total': 8, 'completed': 2, 'in_progress': 2, 'overdue': 6, 'completion_rate': 25.0,
+        })
+        self.assertEqual(body['project']['task_count'], 8)
+
+    def test_project_task_count_comes_from_the_counters(self):
+        self.add_tasks(3)
+        owner_id = self.owner.id
+        with self.count_queries() as statements:
+            response = self.get(self.url, owner_id)
+        self.assertEqual(response.get_json()['project']['task_count'], 3)
+        # Access check, cards, counters
+        self.assertEqual(len(statements), 3, statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
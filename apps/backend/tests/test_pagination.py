@@ -0,0 +1,87 @@
+"""Tests for keyset cursor pagination and the cursor mode of listing endpoints."""
+import unittest
+from datetime import datetime, timedelta
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.task import Task
+from app.services.pagination import (
+    MAX_PER_PAGE, InvalidCursor, decode_cursor, encode_cursor, keyset_paginate
+)
+
+
+class CursorTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        moment = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        self.assertEqual(decode_cursor(encode_cursor(moment, 42)), (moment, 42))
+
+    def test_invalid_cursors_raise(self):
+        for cursor in ('not-base64!', 'e30', encode_cursor(datetime(2026, 1, 1), 1)[:-3], 'WyJ4IiwxXQ'):
+            with self.assertRaises(InvalidCursor, msg=cursor):
+                decode_cursor(cursor)
+
+
+class KeysetPaginateTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        owner, = self.make_users(1)
+        self.user_id = owner.id
+        project = self.make_project(self.make_team(owner))
+        start = datetime(2026, 1, 1)
+        # Pairs of tasks share a timestamp, so pages must break ties on id
+        db.session.add_all(
+            Task(title=f'Task {i}', project_id=project.id, created_by=owner.id,
+                 created_at=start + timedelta(minutes=i // 2))
+            for i in range(25)
+        )
+        db.session.commit()
+
+    def walk(self, per_page):
+        ids, cursor = [], ''
+        while True:
+            page = keyset_paginate(Task.query, Task.created_at, Task.id, cursor, per_page)
+            ids.extend(task.id for task in page.items)
+            if not page.has_next:
+                return ids
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_newest_first(self):
+        expected = [task.id for task in Task.query.order_by(Task.created_at.desc(), Task.id.desc())]
+        for per_page in (1, 7, 25, 100):
+            self.assertEqual(self.walk(per_page), expected)
+
+    def test_per_page_is_clamped(self):
+        for per_page, size in ((0, 1), (-5, 1), (MAX_PER_PAGE + 50, 25)):
+            page = keyset_paginate(Task.query, Task.created_at, Task.id, '', per_page)
+            self.assertEqual((len(page.items), page.per_page), (size, max(1, min(per_page, MAX_PER_PAGE))))
+
+    def test_total_only_when_requested(self):
+        self.assertIsNone(keyset_paginate(Task.query, Task.created_at, Task.id, '', 5).total)
+        page = keyset_paginate(Task.query, Task.created_at, Task.id, '', 5, include_total=True)
+        self.assertEqual(page.total, 25)
+
+    def test_task_listing_cursor_mode(self):
+        response = self.get('/api/tasks/?cursor=&per_page=10&include_total=true', self.user_id)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual((len(body['tasks']), body['total'], body['has_next']), (10, 25, True))
+
+        response = self.get(f"/api/tasks/?cursor={body['next_cursor']}&per_page=20", self.user_id)
+        body = response.get_json()
+        self.assertEqual((len(body['tasks']), body['has_next'], body['next_cursor']), (15, False, None))
+        self.assertNotIn('total', body)
+
+    def test_task_listing_zero_per_page_and_bad_cursor(self):
+        response = self.get('/api/tasks/?cursor=&per_page=0', self.user_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['tasks']), 1)
+
+        response = self.get('/api/tasks/?cursor=garbage', self.user_id)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""Tests for the streamed project task CSV export."""
+import csv
+import io
+import unittest
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.task import Task
+
+
+class ProjectExportTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner, self.member, self.outsider = self.make_users(3)
+        self.project = self.make_project(self.make_team(self.owner, [self.member]))
+        db.session.add_all([
+            Task(title='Write, then review', project_id=self.project.id, created_by=self.owner.id,
+                 assigned_to=self.member.id, status='in_progress'),
+            Task(title='Ship', project_id=self.project.id, created_by=self.owner.id),
+        ])
+        db.session.commit()
+        self.url = f'/api/projects/{self.project.id}/tasks/export'
+
+    def test_member_downloads_csv(self):
+        response = self.get(self.url, self.member.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual([row['title'] for row in rows], ['Write, then review', 'Ship'])
+        self.assertEqual((rows[0]['assignee'], rows[1]['assignee']), (self.member.email, ''))
+
+    def test_outsider_and_unknown_project_get_404(self):
+        self.assertEqual(self.get(self.url, self.outsider.id).status_code, 404)
+        self.assertEqual(self.get('/api/projects/999/tasks/export', self.owner.id).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Tests for the ``ProjectTaskStats`` counters and their mapper event hooks."""
+import unittest
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.project_task_stats import PRIORITY_BUCKETS, STATUS_BUCKETS, ProjectTaskStats
+from app.models.task import Task
+
+
+class ProjectTaskStatsTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner, = self.make_users(1)
+        team = self.make_team(self.owner)
+        self.project = self.make_project(team, 'First')
+        self.other = self.make_project(team, 'Second')
+        db.session.commit()
+
+    def add_task(self, project=None, **fields):
+        task = Task(title='Task', project_id=(project or self.project).id, created_by=self.owner.id, **fields)
+        db.session.add(task)
+        db.session.commit()
+        return task
+
+    def counters(self, project=None):
+        db.session.expire_all()
+        stats = ProjectTaskStats.for_project((project or self.project).id)
+        return {'total': stats.total, **stats.by_status(), **stats.by_priority()}
+
+    def recount(self, project=None):
+        tasks = Task.query.filter_by(project_id=(project or self.project).id)
+        counts = {'total': tasks.count()}
+        counts.update({status: tasks.filter_by(status=status).count() for status in STATUS_BUCKETS})
+        counts.update({priority: tasks.filter_by(priority=priority).count() for priority in PRIORITY_BUCKETS})
+        return counts
+
+    def assertInSync(self):
+        for project in (self.project, self.other):
+            self.assertEqual(self.counters(project), self.recount(project), project.name)
+
+    def test_new_project_starts_at_zero(self):
+        self.assertEqual(set(self.counters().values()), {0})
+
+    def test_insert(self):
+        self.add_task(status='in_progress', priority='high')
+        self.add_task()
+        counters = self.counters()
+        self.assertEqual((counters['total'], counters['in_progress'], counters['pending']), (2, 1, 1))
+        self.assertEqual((counters['high'], counters['medium']), (1, 1))
+        self.assertInSync()
+
+    def test_status_and_priority_update(self):
+        task = self.add_task()
+        task.status = 'completed'
+        db.session.commit()
+        task.priority = 'low'
+        task.status = 'cancelled'
+        db.session.commit()
+        counters = self.counters()
+        self.assertEqual((counters['pending'], counters['completed'], counters['cancelled']), (0, 0, 1))
+        self.assertEqual((counters['medium'], counters['low']), (0, 1))
+        self.assertInSync()
+
+    def test_update_of_an_expired_task(self):
+        task = self.add_task(status='in_progress')
+        db.session.expire(task)
+        task.status = 'completed'
+        db.session.commit()
+        counters = self.counters()
+        self.assertEqual((counters['in_progress'], counters['completed']), (0, 1))
+
+    def test_delete(self):
+        task = self.add_task(priority='high')
+        self.add_task()
+        db.session.delete(task)
+        db.session.commit()
+        self.assertEqual(self.counters()['high'], 0)
+        self.assertInSync()
+
+    def test_move_between_projects(self):
+        task = self.add_task(status='completed', priority='low')
+        task.project_id = self.other.id
+        task.status = 'pending'
+        db.session.commit()
+        self.assertEqual(self.counters()['total'], 0)
+        counters = self.counters(self.other)
+        self.assertEqual((counters['total'], counters['pending'], counters['low']), (1, 1, 1))
+        self.assertInSync()
+
+    def test_missing_counter_row_is_rebuilt(self):
+        self.add_task()
+        ProjectTaskStats.query.filter_by(project_id=self.project.id).delete()
+        db.session.commit()
+        self.add_task(status='completed')
+        self.assertEqual(self.counters()['total'], 2)
+        self.assertInSync()
+
+    def test_reconcile_command_matches_a_recount(self):
+        for status in STATUS_BUCKETS:
+            self.add_task(status=status, priority='high')
+            self.add_task(self.other, status=status)
+        # Writes that bypass the ORM leave the counters stale
+        Task.query.filter_by(project_id=self.project.id, status='pending').update({'status': 'completed'})
+        Task.query.filter_by(project_id=self.other.id, status='cancelled').delete()
+        db.session.commit()
+        self.assertNotEqual(self.counters(), self.recount())
+
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['reconcile-task-stats', '--project-id', str(self.project.id)])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.counters(), self.recount())
+        self.assertNotEqual(self.counters(self.other), self.recount(self.other))
+
+        result = runner.invoke(args=['reconcile-task-stats'])
+        self.assertIn('all projects', result.output)
+        self.assertInSync()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Check that the hot list and analytics queries are planned on their indexes.
+
+Runs against in-memory SQLite by default. Set TEST_DATABASE_URL to a
+PostgreSQL database to check the Postgres planner as well (the schema is
+created and dropped by the test, so use a throwaway database).
+"""
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.schedule import Schedule, ScheduleParticipant  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.task_comment import TaskComment  # noqa: E402
+from app.models.team import TeamMember  # noqa: E402
+
+
+class QueryIndexTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.create_all()
+        cls.dialect = db.engine.dialect.name
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def explain(self, query) -> str:
+        """Return the query plan for an ORM query as a single string."""
+        compiled = query.statement.compile(
+            dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}
+        )
+        connection = db.session.connection()
+        if self.dialect == 'sqlite':
+            rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}')
+            return '\n'.join(str(row[-1]) for row in rows)
+        # Tables are empty here, so stop Postgres preferring a sequential scan
+        connection.execute(text('SET LOCAL enable_seqscan = off'))
+        rows = connection.exec_driver_sql(f'EXPLAIN {compiled}')
+        return '\n'.join(row[0] for row in rows)
+
+    def assertUsesIndex(self, query, *index_names):
+        plan = self.explain(query)
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f'expected one of {index_names} in plan:\n{plan}'
+        )
+
+    def test_project_board_uses_project_status_index(self):
+        query = Task.query.filter(Task.project_id == 1, Task.status == 'pending')
+        self.assertUsesIndex(query, 'idx_task_project_status')
+
+    def test_personal_open_tasks_use_assignee_index(self):
+        query = Task.query.filter(
+            Task.assigned_to == 1,
+            Task.status.in_(['pending', 'in_progress']),
+            Task.due_date < datetime.utcnow()
+        )
+        self.assertUsesIndex(query, 'idx_task_assignee_status_due')
+
+    def test_completion_analytics_use_project_completed_index(self):
+        query = db.session.query(Task.id).filter(
+            Task.project_id == 1,
+            Task.completed_at >= datetime(2025, 1, 1)
+        )
+        self.assertUsesIndex(query, 'idx_task_project_completed')
+
+    def test_created_by_filter_uses_index(self):
+        query = Task.query.filter(Task.created_by == 1)
+        self.assertUsesIndex(query, 'idx_task_created_by')
+
+    def test_membership_lookup_uses_user_index(self):
+        query = TeamMember.query.filter_by(user_id=1)
+        self.assertUsesIndex(query, 'idx_team_member_user')
+
+    def test_task_comments_use_task_created_index(self):
+        query = TaskComment.query.filter_by(task_id=1).order_by(TaskComment.created_at.desc())
+        self.assertUsesIndex(query, 'idx_comment_task_created')
+
+    def test_schedule_participation_uses_user_index(self):
+        query = ScheduleParticipant.query.filter_by(user_id=1)
+        self.assertUsesIndex(query, 'idx_schedule_participant_user')
+
+    def test_schedule_window_uses_date_index(self):
+        query = Schedule.query.filter(
+            Schedule.date >= datetime(2026, 1, 1).date(),
+            Schedule.date <= datetime(2026, 1, 31).date()
+        )
+        self.assertUsesIndex(query, 'idx_schedule_date_start')
+
+
+if __name__ == '__main__':
+    unittest.main()
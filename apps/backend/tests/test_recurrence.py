@@ -0,0 +1,185 @@
+"""Tests for recurrence rules and the upcoming occurrences index."""
+import os
+import sys
+import unittest
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.recurring_task import RecurringTask  # noqa: E402
+from app.models.schedule import Schedule  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.upcoming_occurrence import UpcomingOccurrence  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.recurrence import RecurrenceRule  # noqa: E402
+from app.services.recurring_generation import generate_due_tasks  # noqa: E402
+from app.services.schedule_expansion import iter_occurrences  # noqa: E402
+
+
+def take(rule, n):
+    return list(islice(rule.occurrences(), n))
+
+
+class RecurrenceRuleTestCase(unittest.TestCase):
+
+    def test_monthly_steps_calendar_months_and_clamps_short_months(self):
+        rule = RecurrenceRule('monthly', datetime(2026, 1, 31, 9, 30))
+        self.assertEqual(take(rule, 4), [
+            datetime(2026, 1, 31, 9, 30), datetime(2026, 2, 28, 9, 30),
+            datetime(2026, 3, 31, 9, 30), datetime(2026, 4, 30, 9, 30),
+        ])
+
+    def test_monthly_day_of_month_and_interval(self):
+        rule = RecurrenceRule('monthly', datetime(2026, 1, 5), interval=2, day_of_month=15)
+        self.assertEqual(take(rule, 3), [
+            datetime(2026, 1, 5), datetime(2026, 1, 15), datetime(2026, 3, 15),
+        ])
+
+    def test_weekly_weekdays_with_interval(self):
+        # Wednesday start, Mondays and Fridays every other week
+        rule = RecurrenceRule('weekly', datetime(2026, 10, 14, 8), interval=2, weekdays=[1, 5])
+        self.assertEqual(take(rule, 4), [
+            datetime(2026, 10, 14, 8), datetime(2026, 10, 16, 8),
+            datetime(2026, 10, 26, 8), datetime(2026, 10, 30, 8),
+        ])
+
+    def test_yearly_leap_day(self):
+        rule = RecurrenceRule('yearly', datetime(2024, 2, 29))
+        self.assertEqual(take(rule, 3), [datetime(2024, 2, 29), datetime(2025, 2, 28), datetime(2026, 2, 28)])
+
+    def test_yearly_day_and_month_outlast_a_clamped_start(self):
+        rule = RecurrenceRule('yearly', datetime(2025, 2, 28), day_of_month=29, month=2)
+        self.assertEqual(take(rule, 4), [
+            datetime(2025, 2, 28), datetime(2026, 2, 28), datetime(2027, 2, 28), datetime(2028, 2, 29),
+        ])
+
+    def test_until_and_next_after(self):
+        rule = RecurrenceRule('daily', datetime(2026, 1, 1), interval=3, until=datetime(2026, 1, 10))
+        self.assertEqual(list(rule.occurrences()), [
+            datetime(2026, 1, 1), datetime(2026, 1, 4), datetime(2026, 1, 7), datetime(2026, 1, 10),
+        ])
+        self.assertEqual(rule.next_after(datetime(2026, 1, 4)), datetime(2026, 1, 7))
+        self.assertIsNone(rule.next_after(datetime(2026, 1, 10)))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            RecurrenceRule('weekly', datetime(2026, 1, 1), weekdays=[8])
+        with self.assertRaises(ValueError):
+            RecurrenceRule('daily', datetime(2026, 1, 1), interval=0)
+
+    def test_schedule_occurrences_merge_in_calendar_order(self):
+        weekly = Schedule(id=1, date=date(2026, 1, 5), start_time=time(10), is_recurring=True,
+                          recurring_pattern='weekly')
+        monthly = Schedule(id=2, date=date(2025, 12, 31), start_time=time(9), is_recurring=True,
+                           recurring_pattern='monthly')
+        single = Schedule(id=3, date=date(2026, 2, 2), start_time=time(8), is_recurring=False)
+        occurrences = [
+            (day, schedule.id)
+            for day, schedule in iter_occurrences([weekly, monthly, single], date(2026, 1, 20), date(2026, 2, 9))
+        ]
+        self.assertEqual(occurrences, [
+            (date(2026, 1, 26), 1), (date(2026, 1, 31), 2), (date(2026, 2, 2), 3),
+            (date(2026, 2, 2), 1), (date(2026, 2, 9), 1),
+        ])
+
+
+class UpcomingOccurrenceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.user = User(email='recurring@example.com', password_hash='x')
+        db.session.add(self.user)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def indexed(self, template):
+        return [row.due_date for row in UpcomingOccurrence.query.filter_by(
+            recurring_task_id=template.id
+        ).order_by(UpcomingOccurrence.due_date)]
+
+    def test_index_follows_template_changes(self):
+        start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+        template = RecurringTask(title='Standup', recurrence_type='weekly', recurrence_interval=1,
+                                 recurrence_days=[], created_by=self.user.id, next_due_date=start)
+        db.session.add(template)
+        db.session.commit()
+        # Default 30 day horizon
+        self.assertEqual(self.indexed(template), [start + timedelta(weeks=i) for i in range(5)])
+
+        template.recurrence_type = 'daily'
+        db.session.commit()
+        self.assertEqual(len(self.indexed(template)), 30)
+
+        template.is_active = False
+        db.session.commit()
+        self.assertEqual(self.indexed(template), [])
+
+    def test_generation_reads_and_consumes_the_index(self):
+        now = datetime.utcnow().replace(microsecond=0)
+        template = RecurringTask(title='Report', recurrence_type='daily', recurrence_interval=1,
+                                 created_by=self.user.id, next_due_date=now - timedelta(days=4))
+        db.session.add(template)
+        db.session.commit()
+
+        stats = generate_due_tasks(now=now)
+        self.assertEqual(stats['created'], 5)
+        self.assertEqual(Task.query.filter_by(recurring_task_id=template.id).count(), 5)
+        db.session.refresh(template)
+        self.assertEqual(template.next_due_date, now + timedelta(days=1))
+        self.assertEqual(self.indexed(template)[0], now + timedelta(days=1))
+
+        self.assertEqual(generate_due_tasks(now=now)['created'], 0)
+
+    def generated(self, template):
+        return [task.due_date for task in Task.query.filter_by(
+            recurring_task_id=template.id
+        ).order_by(Task.due_date)]
+
+    def test_yearly_leap_day_series_returns_to_february_29(self):
+        template = RecurringTask(title='Leap', recurrence_type='yearly', recurrence_interval=1,
+                                 created_by=self.user.id, next_due_date=datetime(2024, 2, 29, 9))
+        db.session.add(template)
+        db.session.commit()
+
+        generate_due_tasks(now=datetime(2025, 3, 1))
+        db.session.refresh(template)
+        self.assertEqual(template.next_due_date, datetime(2026, 2, 28, 9))
+        generate_due_tasks(now=datetime(2028, 3, 1))
+        self.assertEqual(self.generated(template), [
+            datetime(2024, 2, 29, 9), datetime(2025, 2, 28, 9), datetime(2026, 2, 28, 9),
+            datetime(2027, 2, 28, 9), datetime(2028, 2, 29, 9),
+        ])
+        db.session.refresh(template)
+        self.assertEqual(template.next_due_date, datetime(2029, 2, 28, 9))
+        self.assertEqual(template.calculate_next_due_date(datetime(2031, 2, 28, 9)), datetime(2032, 2, 29, 9))
+
+    def test_monthly_series_from_the_31st_returns_to_long_months(self):
+        template = RecurringTask(title='Invoices', recurrence_type='monthly', recurrence_interval=1,
+                                 created_by=self.user.id, next_due_date=datetime(2026, 1, 31))
+        db.session.add(template)
+        db.session.commit()
+        self.assertIsNone(template.recurrence_day_of_month)
+
+        generate_due_tasks(now=datetime(2026, 2, 28))
+        db.session.refresh(template)
+        self.assertEqual(template.next_due_date, datetime(2026, 3, 31))
+        generate_due_tasks(now=datetime(2026, 5, 1))
+        self.assertEqual(self.generated(template), [
+            datetime(2026, 1, 31), datetime(2026, 2, 28), datetime(2026, 3, 31), datetime(2026, 4, 30),
+        ])
+        db.session.refresh(template)
+        self.assertEqual(template.next_due_date, datetime(2026, 5, 31))
+
+
+if __name__ == '__main__':
+    unittest.main()
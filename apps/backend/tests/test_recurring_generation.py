@@ -0,0 +1,104 @@
+"""Tests for chunked recurring task generation and the one-task-per-occurrence index."""
+import unittest
+from datetime import datetime, timedelta
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.recurring_task import RecurringTask
+from app.models.task import Task
+from app.services.recurring_generation import _insert_new, generate_due_tasks
+
+
+class RecurringGenerationTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner, = self.make_users(1)
+        self.project = self.make_project(self.make_team(self.owner))
+        self.now = datetime.utcnow().replace(microsecond=0)
+        db.session.commit()
+
+    def add_templates(self, count, days_back=3):
+        templates = [
+            RecurringTask(title=f'Daily {i}', recurrence_type='daily', recurrence_interval=1,
+                          project_id=self.project.id, created_by=self.owner.id,
+                          next_due_date=self.now - timedelta(days=days_back))
+            for i in range(count)
+        ]
+        db.session.add_all(templates)
+        db.session.commit()
+        return [template.id for template in templates]
+
+    def occurrences(self, template_id):
+        tasks = Task.query.filter_by(recurring_task_id=template_id).order_by(Task.due_date)
+        return [task.due_date for task in tasks]
+
+    def test_chunked_generation_back_fills_every_template(self):
+        template_ids = self.add_templates(5)
+        task_ids = []
+        stats = generate_due_tasks(now=self.now, chunk_size=2, task_ids=task_ids)
+
+        self.assertEqual(stats, {'templates': 5, 'created': 20, 'deactivated': 0})
+        self.assertEqual(len(set(task_ids)), 20)
+        expected = [self.now - timedelta(days=days) for days in (3, 2, 1, 0)]
+        for template_id in template_ids:
+            self.assertEqual(self.occurrences(template_id), expected)
+            template = db.session.get(RecurringTask, template_id)
+            self.assertEqual(template.next_due_date, self.now + timedelta(days=1))
+        # The bulk insert rebuilds the project's counters
+        db.session.expire_all()
+        self.assertEqual(ProjectTaskStats.for_project(self.project.id).pending, 20)
+
+    def test_repeated_run_does_not_duplicate(self):
+        template_id, = self.add_templates(1)
+        generate_due_tasks(now=self.now)
+        # Rewind the template as an interrupted run would leave it
+        db.session.get(RecurringTask, template_id).next_due_date = self.now - timedelta(days=3)
+        db.session.commit()
+
+        self.assertEqual(generate_due_tasks(now=self.now)['created'], 0)
+        self.assertEqual(len(self.occurrences(template_id)), 4)
+
+    def test_insert_skips_existing_occurrences(self):
+        template_id, = self.add_templates(1)
+        row = {'title': 'Daily', 'status': 'pending', 'priority': 'medium', 'project_id': self.project.id,
+               'created_by': self.owner.id, 'recurring_task_id': template_id, 'requires_approval': False,
+               'due_date': self.now, 'created_at': self.now, 'updated_at': self.now}
+        self.assertEqual(len(_insert_new([row])), 1)
+        self.assertEqual(len(_insert_new([row, {**row, 'due_date': self.now + timedelta(days=1)}])), 1)
+        self.assertEqual(len(self.occurrences(template_id)), 2)
+
+    def test_moving_a_task_onto_another_occurrence_conflicts(self):
+        template_id, = self.add_templates(1)
+        generate_due_tasks(now=self.now)
+        first, second = Task.query.filter_by(recurring_task_id=template_id).order_by(Task.due_date)[:2]
+
+        response = self.put(f'/api/tasks/{first.id}', self.owner.id,
+                            json={'due_date': second.due_date.isoformat()})
+        self.assertEqual(response.status_code, 409)
+        response = self.post('/api/tasks/bulk', self.owner.id, json={'operations': [
+            {'op': 'update', 'id': first.id, 'due_date': second.due_date.isoformat()}
+        ]})
+        self.assertEqual(response.status_code, 409)
+
+        response = self.put(f'/api/tasks/{first.id}', self.owner.id, json={'title': 'Renamed'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_generate_endpoint_returns_created_tasks(self):
+        admin, = self.make_users(1, prefix='admin')
+        admin.email = 'admin@granula.com'
+        self.add_templates(2, days_back=1)
+
+        self.assertEqual(self.post('/api/recurring-tasks/generate', self.owner.id).status_code, 403)
+        response = self.post('/api/recurring-tasks/generate', admin.id)
+        body = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['statistics']['created'], 4)
+        self.assertEqual(len(body['tasks']), 4)
+        self.assertEqual({task['creator']['id'] for task in body['tasks']}, {self.owner.id})
+
+
+if __name__ == '__main__':
+    unittest.main()
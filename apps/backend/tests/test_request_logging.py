@@ -0,0 +1,62 @@
+"""Tests for sampled access logging."""
+import logging
+import unittest
+
+from flask import Response
+from support import AppTestCase
+
+from app.request_logging import logger
+
+
+class _ListHandler(logging.Handler):
+    """Collect each access record with whatever ``snapshot`` returns at that moment."""
+
+    def __init__(self, snapshot):
+        super().__init__()
+        self.snapshot = snapshot
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.request, self.snapshot()))
+
+
+class RequestLoggingTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        logging.disable(logging.NOTSET)
+        # Capture records here instead of the stdout queue listener
+        self.produced = []
+        self.handler = _ListHandler(lambda: list(self.produced))
+        handlers = logger.handlers[:]
+        logger.handlers[:] = [self.handler]
+        self.addCleanup(logger.handlers.__setitem__, slice(None), handlers)
+
+        def rows():
+            for i in range(3):
+                self.produced.append(i)
+                yield f'{i}\n'
+
+        self.app.add_url_rule('/__stream', 'stream', lambda: Response(rows(), mimetype='text/csv'))
+        self.app.add_url_rule('/__json', 'json', lambda: {'ok': True})
+
+    def test_record_fields(self):
+        response = self.client.get('/__json?token=secret', headers={'Authorization': 'Bearer secret'})
+        (entry, _), = self.handler.records
+        self.assertEqual(entry['method'], 'GET')
+        self.assertEqual(entry['path'], '/__json')
+        self.assertEqual((entry['status'], entry['bytes']), (200, len(response.data)))
+        self.assertNotIn('secret', repr(entry))
+
+    def test_streamed_response_is_not_buffered(self):
+        response = self.client.get('/__stream')
+        (entry, produced), = self.handler.records
+        # Logged before the body was produced, without a length
+        self.assertEqual(produced, [])
+        self.assertIsNone(entry['bytes'])
+        self.assertEqual(response.get_data(as_text=True), '0\n1\n2\n')
+        self.assertEqual(self.produced, [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for ``@cached_response`` and its commit-time invalidation."""
+import unittest
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.team import TeamMember
+from app.services.response_cache import cache_stats
+
+
+class ResponseCacheTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['RESPONSE_CACHE_TTL'] = 60
+        self.owner, self.member, self.newcomer, self.stranger = self.make_users(4)
+        self.team = self.make_team(self.owner, [self.member])
+        self.project = self.make_project(self.team)
+        self.other_team = self.make_team(self.stranger, name='Other')
+        self.other_project = self.make_project(self.other_team, 'Other')
+        self.task = Task(title='Task', project_id=self.project.id, created_by=self.owner.id)
+        db.session.add(self.task)
+        db.session.commit()
+        self.url = f'/api/kanban/project/{self.project.id}/board'
+
+    def board(self, user_id=None):
+        response = self.get(self.url, user_id or self.owner.id)
+        self.assertEqual(response.status_code, 200)
+        return response.headers['X-Cache']
+
+    def assertInvalidatedBy(self, change):
+        """The board is a hit, then a miss after ``change`` commits."""
+        self.board()
+        self.assertEqual(self.board(), 'HIT')
+        change()
+        db.session.commit()
+        self.assertEqual(self.board(), 'MISS')
+        self.assertEqual(self.board(), 'HIT')
+
+    def test_hit_returns_the_cached_body(self):
+        first = self.get(self.url, self.owner.id)
+        second = self.get(self.url, self.owner.id)
+        self.assertEqual((first.headers['X-Cache'], second.headers['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.mimetype, 'application/json')
+        self.assertGreaterEqual(cache_stats()['kanban.get_project_kanban_board']['hits'], 1)
+
+    def test_entries_are_per_user(self):
+        self.board()
+        self.assertEqual(self.board(self.member.id), 'MISS')
+
+    def test_task_commit_invalidates(self):
+        self.assertInvalidatedBy(lambda: setattr(db.session.get(Task, self.task.id), 'status', 'completed'))
+
+    def test_new_task_invalidates(self):
+        self.assertInvalidatedBy(lambda: db.session.add(
+            Task(title='New', project_id=self.project.id, created_by=self.member.id)
+        ))
+
+    def test_comment_commit_invalidates(self):
+        self.assertInvalidatedBy(lambda: db.session.add(
+            TaskComment(content='Hi', task_id=self.task.id, user_id=self.member.id)
+        ))
+
+    def test_team_member_commit_invalidates(self):
+        self.assertInvalidatedBy(lambda: db.session.add(
+            TeamMember(team_id=self.team.id, user_id=self.newcomer.id)
+        ))
+
+    def test_project_commit_invalidates(self):
+        self.assertInvalidatedBy(lambda: setattr(db.session.get(Project, self.project.id), 'name', 'Renamed'))
+
+    def test_unrelated_and_rolled_back_changes_keep_the_entry(self):
+        self.board()
+        db.session.add(Task(title='Elsewhere', project_id=self.other_project.id, created_by=self.stranger.id))
+        db.session.commit()
+        self.assertEqual(self.board(), 'HIT')
+
+        db.session.add(Task(title='Discarded', project_id=self.project.id, created_by=self.owner.id))
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(self.board(), 'HIT')
+
+    def test_disabled_without_ttl(self):
+        self.app.config['RESPONSE_CACHE_TTL'] = 0
+        for _ in range(2):
+            self.assertIsNone(self.get(self.url, self.owner.id).headers.get('X-Cache'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Query-count tests for the batched list serializers."""
+import unittest
+
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.task import Task
+from app.services.serializers import serialize_tasks
+
+
+class SerializeTasksTestCase(AppTestCase):
+
+    def seed(self, count):
+        """``count`` tasks, each with its own assignee and creator."""
+        assignees = self.make_users(count, prefix=f'assignee{count}-')
+        creators = self.make_users(count, prefix=f'creator{count}-')
+        owner = creators[0]
+        project = self.make_project(self.make_team(owner, assignees + creators[1:], name=f'Team {count}'))
+        db.session.add_all(
+            Task(title=f'Task {i}', project_id=project.id, assigned_to=assignee.id, created_by=creator.id)
+            for i, (assignee, creator) in enumerate(zip(assignees, creators))
+        )
+        db.session.commit()
+        return owner.id, project.id
+
+    def test_users_are_loaded_in_one_query(self):
+        for count in (3, 30):
+            _, project_id = self.seed(count)
+            tasks = Task.query.filter_by(project_id=project_id).all()
+            with self.count_queries() as statements:
+                data = serialize_tasks(tasks)
+            self.assertEqual(len(statements), 1, statements)
+            self.assertEqual(len({task['assignee']['id'] for task in data}), count)
+            self.assertEqual(len({task['creator']['id'] for task in data}), count)
+
+    def test_task_listing_query_count_is_constant(self):
+        for count in (3, 30):
+            user_id, project_id = self.seed(count)
+            with self.count_queries() as statements:
+                response = self.get(f'/api/tasks/?project_id={project_id}&per_page=100', user_id)
+            self.assertEqual(len(response.get_json()['tasks']), count)
+            # Memberships, total count, the page and its users
+            self.assertEqual(len(statements), 4, statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
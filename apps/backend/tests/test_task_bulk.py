@@ -0,0 +1,167 @@
+"""Tests for ``POST /api/tasks/bulk``."""
+import unittest
+from unittest import mock
+
+from sqlalchemy.exc import IntegrityError
+from support import AppTestCase
+
+from app.extensions import db
+from app.models.department import Department
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.task import Task
+
+
+class TaskBulkTestCase(AppTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner, self.member, self.outsider = self.make_users(3)
+        self.team = self.make_team(self.owner, [self.member])
+        self.project = self.make_project(self.team)
+        self.other_project = self.make_project(self.make_team(self.outsider, name='Other'), 'Other')
+        db.session.commit()
+
+    def bulk(self, operations, atomic=False, user_id=None):
+        return self.post('/api/tasks/bulk', user_id or self.owner.id,
+                         json={'operations': operations, 'atomic': atomic})
+
+    def create_tasks(self, count, **fields):
+        response = self.bulk([
+            {'op': 'create', 'project_id': self.project.id, 'title': f'Task {i}', **fields}
+            for i in range(count)
+        ])
+        return [result['id'] for result in response.get_json()['results']]
+
+    def stats(self, project_id=None):
+        db.session.expire_all()
+        return ProjectTaskStats.for_project(project_id or self.project.id)
+
+    def test_create(self):
+        response = self.bulk([
+            {'op': 'create', 'project_id': self.project.id, 'title': ' Write ', 'priority': 'high',
+             'assigned_to': self.member.id, 'due_date': '2026-11-01T09:00:00'},
+            {'op': 'create', 'project_id': self.project.id, 'title': 'Done', 'status': 'completed'},
+        ])
+        body = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((body['applied'], body['summary']), (True, {'ok': 2, 'error': 0, 'skipped': 0}))
+
+        first, second = (db.session.get(Task, result['id']) for result in body['results'])
+        self.assertEqual((first.title, first.priority, first.assigned_to, first.created_by),
+                         ('Write', 'high', self.member.id, self.owner.id))
+        self.assertIsNotNone(second.completed_at)
+
+    def test_update_status_assign_and_delete(self):
+        first, second, third = self.create_tasks(3)
+        response = self.bulk([
+            {'op': 'update', 'id': first, 'title': 'Renamed', 'priority': 'low'},
+            {'op': 'status', 'id': second, 'status': 'completed'},
+            {'op': 'assign', 'id': second, 'assigned_to': self.member.id},
+            {'op': 'delete', 'id': third},
+        ])
+        self.assertEqual(response.get_json()['summary'], {'ok': 4, 'error': 0, 'skipped': 0})
+
+        db.session.expire_all()
+        self.assertEqual((db.session.get(Task, first).title, db.session.get(Task, first).priority),
+                         ('Renamed', 'low'))
+        task = db.session.get(Task, second)
+        self.assertEqual((task.status, task.assigned_to), ('completed', self.member.id))
+        self.assertIsNotNone(task.completed_at)
+        self.assertIsNone(db.session.get(Task, third))
+
+    def test_invalid_operations_are_reported_per_item(self):
+        task_id, = self.create_tasks(1)
+        response = self.bulk([
+            {'op': 'update', 'id': [task_id], 'title': 'x'},
+            {'op': 'delete', 'id': {'id': task_id}},
+            {'op': 'create', 'project_id': [self.project.id], 'title': 'x'},
+            {'op': 'assign', 'id': task_id, 'assigned_to': [self.member.id]},
+            {'op': 'status', 'id': True, 'status': 'completed'},
+            {'op': 'archive', 'id': task_id},
+            {'op': 'status', 'id': task_id, 'status': 'done'},
+            {'op': 'create', 'project_id': self.other_project.id, 'title': 'x'},
+            {'op': 'assign', 'id': task_id, 'assigned_to': self.outsider.id},
+            {'op': 'update', 'id': task_id + 100, 'title': 'x'},
+            {'op': 'update', 'id': task_id, 'title': 'Kept'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['summary'], {'ok': 1, 'error': 10, 'skipped': 0})
+        self.assertEqual([result['error'] for result in body['results'][:-1]], [
+            'id must be an integer',
+            'id must be an integer',
+            'project_id must be an integer',
+            'assigned_to must be an integer',
+            'id must be an integer',
+            'op must be one of create, update, status, assign, delete',
+            'Status must be one of pending, in_progress, completed, cancelled',
+            'Access denied to this project',
+            'User is not a team member',
+            'Task not found',
+        ])
+        self.assertEqual([result['index'] for result in body['results']], list(range(11)))
+        self.assertEqual(db.session.get(Task, task_id).title, 'Kept')
+
+    def test_departments_must_belong_to_the_task_team(self):
+        department = Department(name='Design', team_id=self.team.id)
+        foreign = Department(name='Sales', team_id=self.other_project.team_id)
+        db.session.add_all([department, foreign])
+        db.session.commit()
+        task_id, = self.create_tasks(1)
+
+        response = self.bulk([
+            {'op': 'create', 'project_id': self.project.id, 'title': 'x', 'department_id': 999},
+            {'op': 'create', 'project_id': self.project.id, 'title': 'x', 'department_id': foreign.id},
+            {'op': 'update', 'id': task_id, 'department_id': 999},
+            {'op': 'update', 'id': task_id, 'department_id': department.id},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result.get('error') for result in response.get_json()['results']],
+                         ['Department not found'] * 3 + [None])
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Task, task_id).department_id, department.id)
+
+    def test_only_duplicate_occurrences_conflict(self):
+        other = IntegrityError('INSERT INTO tasks', {}, Exception('FOREIGN KEY constraint failed'))
+        with mock.patch('app.blueprints.tasks.routes.apply_task_operations', side_effect=other):
+            response = self.bulk([{'op': 'delete', 'id': 1}])
+        self.assertEqual(response.status_code, 500)
+
+    def test_atomic_applies_nothing_on_error(self):
+        task_id, = self.create_tasks(1)
+        response = self.bulk([
+            {'op': 'update', 'id': task_id, 'title': 'Changed'},
+            {'op': 'delete', 'id': 'abc'},
+        ], atomic=True)
+        body = response.get_json()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((body['applied'], body['summary']), (False, {'ok': 0, 'error': 1, 'skipped': 1}))
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Task, task_id).title, 'Task 0')
+
+    def test_outsider_cannot_touch_tasks(self):
+        task_id, = self.create_tasks(1)
+        response = self.bulk([{'op': 'delete', 'id': task_id}], user_id=self.outsider.id)
+        self.assertEqual(response.get_json()['results'][0]['error'], 'Task not found')
+        self.assertIsNotNone(db.session.get(Task, task_id))
+
+    def test_counters_are_rebuilt(self):
+        ids = self.create_tasks(4, priority='high')
+        stats = self.stats()
+        self.assertEqual((stats.total, stats.pending, stats.high), (4, 4, 4))
+
+        self.bulk([
+            {'op': 'status', 'id': ids[0], 'status': 'completed'},
+            {'op': 'update', 'id': ids[1], 'priority': 'low', 'status': 'in_progress'},
+            {'op': 'delete', 'id': ids[2]},
+        ])
+        stats = self.stats()
+        self.assertEqual(
+            (stats.total, stats.pending, stats.in_progress, stats.completed, stats.high, stats.low),
+            (3, 1, 1, 1, 2, 1)
+        )
+        self.assertEqual(stats.total, Task.query.filter_by(project_id=self.project.id).count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,4 +16,4 @@ flask db upgrade
 
 # Start the application
 echo "🌟 Starting Granula backend..."
-exec gunicorn --bind 0.0.0.0:$PORT --workers 4 --timeout 120 run:app
\ No newline at end of file
+exec gunicorn -c gunicorn.conf.py run:app
\ No newline at end of file